@@ -0,0 +1,447 @@
+import shlex
+import shutil
+import threading
+import uuid
+
+from pathlib import Path, PurePosixPath
+from typing import Callable
+
+from git_tests.config import (
+    Inventory,
+    SingleGitServerConfig,
+    get_worker_id,
+)
+from git_tests.helpers.commands.add_command import AddCommand
+from git_tests.helpers.commands.checkout_command import CheckoutCommand
+from git_tests.helpers.commands.clone_command import CloneCommand, get_repo_url
+from git_tests.helpers.commands.command_protocol import CommandProtocol
+from git_tests.helpers.commands.commit_command import CommitCommand
+from git_tests.helpers.commands.init_command import InitCommand
+from git_tests.helpers.commands.log_command import LogCommand
+from git_tests.helpers.commands.push_command import PushCommand
+from git_tests.helpers.commands.status_command import StatusCommand
+from git_tests.helpers.workflow_steps import WorkflowSteps
+from git_tests.tools.benchmark_runner import BenchmarkCase
+from git_tests.tools.executors.local_executor import (
+    LocalExecutor,
+    LocalPexpectExecutor,
+)
+from git_tests.tools.executors.ssh_executor import (
+    SshConnectionPool,
+    SshExecutor,
+    SshHostData,
+)
+from git_tests.tools.fixture_repo_cache import FixtureRepositoryCache
+from git_tests.tools.repo_generator import (
+    RepositoryGenerator,
+    RepositoryGeneratorParameters,
+)
+
+
+BENCHMARK_REPOSITORY_SIZES: dict[str, RepositoryGeneratorParameters] = {
+    "small": RepositoryGeneratorParameters(
+        file_count=100, tree_depth=2, commit_count=10
+    ),
+    "medium": RepositoryGeneratorParameters(
+        file_count=2000, tree_depth=3, commit_count=100, branch_count=5
+    ),
+    "large": RepositoryGeneratorParameters(
+        file_count=20000,
+        tree_depth=4,
+        dirs_per_level=8,
+        commit_count=500,
+        branch_count=20,
+    ),
+}
+
+# Command variants with their benchmark cases, see BenchmarkCases
+BENCHMARKED_VARIANTS: list[tuple[type[CommandProtocol], str]] = [
+    (InitCommand, "basic"),
+    (InitCommand, "bare"),
+    (CloneCommand, "askpass"),
+    (CloneCommand, "basic"),
+    (CheckoutCommand, "branch"),
+    (AddCommand, "basic"),
+    (CommitCommand, "basic"),
+    (StatusCommand, "basic"),
+    (StatusCommand, "porcelain"),
+    (LogCommand, "basic"),
+    (LogCommand, "porcelain"),
+    (PushCommand, "askpass"),
+    (PushCommand, "basic"),
+]
+
+# Commands which don't use any repository, benchmarked once, with "empty" size
+SIZE_INDEPENDENT_COMMANDS: set[type[CommandProtocol]] = {InitCommand}
+
+
+class BenchmarkEnvironment:
+    """Repositories of benchmark sizes (BENCHMARK_REPOSITORY_SIZES).
+
+    Server repositories are generated once, named by the fixture cache key
+    (bench_<key>.git) and kept on the server, so later sessions and other
+    pytest-xdist workers reuse them. They are published with an atomic rename.
+
+    Working copies are made from a template of every size: the repository from
+    FixtureRepositoryCache, with origin pointing to the server repository
+    of the same size (same parameters, so the same commits) and git user configured.
+    """
+
+    def __init__(
+        self,
+        work_dir: Path,
+        fixture_repository_cache: FixtureRepositoryCache,
+        copy_repository: Callable[[Path, Path], None],
+        ssh_connection_pool: SshConnectionPool,
+    ) -> None:
+        """Constructor method for BenchmarkEnvironment.
+
+        Args:
+            work_dir: directory for templates of working copies
+            fixture_repository_cache: cache of generated repositories
+            copy_repository: copies working repository (source, destination)
+            ssh_connection_pool: pool of Ssh connections to the git server
+        """
+        self.__work_dir = work_dir
+        self.__fixture_repository_cache = fixture_repository_cache
+        self.__copy_repository = copy_repository
+        self.__ssh_connection_pool = ssh_connection_pool
+        self.server_config = Inventory().get(SingleGitServerConfig().host_name)
+        self.__host_data = SshHostData(
+            host=self.server_config.ansible_host,
+            user=self.server_config.ansible_user,
+            password=self.server_config.ansible_password,
+            port=self.server_config.ansible_port,
+        )
+        self.__server_repositories: dict[str, SingleGitServerConfig] = {}
+        self.__templates: dict[str, Path] = {}
+        self.__lock = threading.RLock()
+
+    @staticmethod
+    def get_parameters(size: str) -> RepositoryGeneratorParameters:
+        """Returns generator parameters of the size.
+
+        Args:
+            size: name of the size, key of BENCHMARK_REPOSITORY_SIZES
+        """
+        if size not in BENCHMARK_REPOSITORY_SIZES:
+            raise ValueError(
+                f"Unknown benchmark size {size}, "
+                f"expected one of {sorted(BENCHMARK_REPOSITORY_SIZES)}"
+            )
+        return BENCHMARK_REPOSITORY_SIZES[size]
+
+    def server_repository(self, size: str) -> SingleGitServerConfig:
+        """Returns configuration of the server repository of the size,
+        generating the repository if it doesn't exist.
+
+        Args:
+            size: name of the size
+        """
+        with self.__lock:
+            if size in self.__server_repositories:
+                return self.__server_repositories[size]
+
+            parameters = self.get_parameters(size)
+            key = self.__fixture_repository_cache.get_key(parameters)
+            config = SingleGitServerConfig(test_repo_name=f"bench_{key[:16]}.git")
+            repo_path = PurePosixPath(config.repos_path, config.test_repo_name)
+            with SshExecutor(
+                host_data=self.__host_data, pool=self.__ssh_connection_pool
+            ) as ssh_executor:
+                exists = ssh_executor.execute(f"test -d {shlex.quote(str(repo_path))}")
+                if exists.recv_exit_status() != 0:
+                    self.__generate_server_repository(
+                        ssh_executor, parameters, repo_path
+                    )
+            self.__server_repositories[size] = config
+            return config
+
+    def working_copy(self, size: str, destination: Path) -> Path:
+        """Creates working repository of the size.
+
+        Args:
+            size: name of the size
+            destination: path of the working repository, must not exist
+
+        Returns:
+            destination path
+        """
+        with self.__lock:
+            if size not in self.__templates:
+                self.__templates[size] = self.__create_template(size)
+        self.__copy_repository(self.__templates[size], destination)
+        return destination
+
+    def delete_server_branches(self, size: str, prefix: str) -> None:
+        """Deletes branches with the name prefix from the server repository of the size.
+
+        Args:
+            size: name of the size
+            prefix: prefix of branch names, e.g. "bench_push_"
+        """
+        config = self.server_repository(size)
+        git_dir = shlex.quote(
+            f"--git-dir={PurePosixPath(config.repos_path, config.test_repo_name)}"
+        )
+        with SshExecutor(
+            host_data=self.__host_data, pool=self.__ssh_connection_pool
+        ) as ssh_executor:
+            ssh_executor.execute(
+                f"git {git_dir} for-each-ref --format='delete %(refname)' "
+                f"{shlex.quote(f'refs/heads/{prefix}*')} | git {git_dir} update-ref --stdin"
+            ).recv_exit_status()
+
+    def cleanup(self) -> None:
+        """Deletes templates of working copies."""
+        with self.__lock:
+            self.__templates.clear()
+            shutil.rmtree(Path(self.__work_dir, "templates"), ignore_errors=True)
+
+    def __create_template(self, size: str) -> Path:
+        """Creates template working repository of the size."""
+        template = Path(self.__work_dir, "templates", size, "repository")
+        if template.parent.exists():
+            shutil.rmtree(template.parent)
+        template.parent.mkdir(parents=True)
+        self.__fixture_repository_cache.checkout(self.get_parameters(size), template)
+
+        result = LocalExecutor().execute(
+            [
+                "git",
+                "-C",
+                str(template),
+                "remote",
+                "set-url",
+                "origin",
+                get_repo_url(self.server_config, self.server_repository(size)),
+            ]
+        )
+        if result.rc != 0:
+            raise RuntimeError(f"Origin configuration failed: {result.stderr}")
+        WorkflowSteps.configure_user().apply(template)
+        return template
+
+    @staticmethod
+    def __generate_server_repository(
+        ssh_executor: SshExecutor,
+        parameters: RepositoryGeneratorParameters,
+        repo_path: PurePosixPath,
+    ) -> None:
+        """Generates repository in a temporary path and renames it to repo_path.
+        If another process published it in the meantime, the temporary one is deleted.
+        """
+        tmp_path = repo_path.with_name(f".{repo_path.name}.{uuid.uuid4().hex}.tmp")
+        quoted_tmp_path = shlex.quote(str(tmp_path))
+        result = RepositoryGenerator(parameters).generate_remote(ssh_executor, tmp_path)
+        if not result.successful:
+            ssh_executor.execute(f"rm -rf {quoted_tmp_path}").recv_exit_status()
+            raise RuntimeError(f"Server repository generation failed: {result.stderr}")
+        ssh_executor.execute(
+            f"mv -T {quoted_tmp_path} {shlex.quote(str(repo_path))} 2>/dev/null "
+            f"|| rm -rf {quoted_tmp_path}"
+        ).recv_exit_status()
+
+
+class BenchmarkCases:
+    """Factory of BenchmarkCases for BENCHMARKED_VARIANTS.
+
+    Every case prepares its own state per iteration: a new working copy
+    for commands which change the repository, one shared working copy
+    for read-only commands (status, log).
+    """
+
+    def __init__(self, environment: BenchmarkEnvironment) -> None:
+        """Constructor method for BenchmarkCases.
+
+        Args:
+            environment: repositories of benchmark sizes
+        """
+        self.__environment = environment
+        self.__local_executor = LocalExecutor()
+        self.__local_pexpect_executor = LocalPexpectExecutor()
+
+    def get(
+        self, command: type[CommandProtocol], variant: str, size: str
+    ) -> BenchmarkCase:
+        """Returns benchmark case of the Command variant.
+
+        Args:
+            command: Command class, e.g. StatusCommand
+            variant: command variant
+            size: name of the repository size, "empty" for SIZE_INDEPENDENT_COMMANDS
+        """
+        return self.__get_mapped_cases()[command](variant, size)
+
+    def __get_mapped_cases(self) -> dict[type[CommandProtocol], Callable]:
+        """Returns Command classes and their case factories mapped."""
+        cases = {
+            InitCommand: self.__get_init_case,
+            CloneCommand: self.__get_clone_case,
+            CheckoutCommand: self.__get_checkout_case,
+            AddCommand: self.__get_add_case,
+            CommitCommand: self.__get_commit_case,
+            StatusCommand: self.__get_read_only_case(StatusCommand),
+            LogCommand: self.__get_read_only_case(LogCommand),
+            PushCommand: self.__get_push_case,
+        }
+        return cases
+
+    def __get_init_case(self, variant: str, size: str) -> BenchmarkCase:
+        """Case: "git init" of a new repository."""
+
+        def prepare(iteration_dir: Path) -> CommandProtocol:
+            return InitCommand(
+                variant=variant,
+                command_data={"git_repo_path": Path(iteration_dir, "repository")},
+                executor=self.__local_executor,
+            )
+
+        return BenchmarkCase(
+            command=InitCommand, variant=variant, size=size, prepare=prepare
+        )
+
+    def __get_clone_case(self, variant: str, size: str) -> BenchmarkCase:
+        """Case: "git clone" of the server repository."""
+
+        def prepare(iteration_dir: Path) -> CommandProtocol:
+            return CloneCommand(
+                variant=variant,
+                command_data={
+                    "server_config": self.__environment.server_config,
+                    "single_git_server_config": self.__environment.server_repository(
+                        size
+                    ),
+                    "cloned_repo_path": Path(iteration_dir, "repository"),
+                },
+                executor=self.__get_executor(variant),
+            )
+
+        return BenchmarkCase(
+            command=CloneCommand, variant=variant, size=size, prepare=prepare
+        )
+
+    def __get_checkout_case(self, variant: str, size: str) -> BenchmarkCase:
+        """Case: "git checkout -b <branch>" in a working copy."""
+
+        def prepare(iteration_dir: Path) -> CommandProtocol:
+            return CheckoutCommand(
+                variant=variant,
+                command_data={
+                    "branch_name": "bench_branch",
+                    "cloned_repo_path": self.__get_working_copy(size, iteration_dir),
+                },
+                executor=self.__local_executor,
+            )
+
+        return BenchmarkCase(
+            command=CheckoutCommand, variant=variant, size=size, prepare=prepare
+        )
+
+    def __get_add_case(self, variant: str, size: str) -> BenchmarkCase:
+        """Case: "git add <file>" of a new file in a working copy."""
+
+        def prepare(iteration_dir: Path) -> CommandProtocol:
+            repo_path = self.__get_working_copy(size, iteration_dir)
+            WorkflowSteps.create_file("bench_file").apply(repo_path)
+            return AddCommand(
+                variant=variant,
+                command_data={
+                    "new_file_path": Path(repo_path, "bench_file"),
+                    "cloned_repo_path": repo_path,
+                },
+                executor=self.__local_executor,
+            )
+
+        return BenchmarkCase(
+            command=AddCommand, variant=variant, size=size, prepare=prepare
+        )
+
+    def __get_commit_case(self, variant: str, size: str) -> BenchmarkCase:
+        """Case: "git commit -m <message>" of a staged new file in a working copy."""
+
+        def prepare(iteration_dir: Path) -> CommandProtocol:
+            repo_path = self.__get_working_copy(size, iteration_dir)
+            WorkflowSteps.create_file("bench_file").apply(repo_path)
+            WorkflowSteps.add_file("bench_file").apply(repo_path)
+            return CommitCommand(
+                variant=variant,
+                command_data={
+                    "commit_message": "Benchmark commit",
+                    "cloned_repo_path": repo_path,
+                },
+                executor=self.__local_executor,
+            )
+
+        return BenchmarkCase(
+            command=CommitCommand, variant=variant, size=size, prepare=prepare
+        )
+
+    def __get_read_only_case(self, command: type[CommandProtocol]) -> Callable:
+        """Returns factory of cases of a read-only Command, run in one working copy."""
+
+        def get_case(variant: str, size: str) -> BenchmarkCase:
+            def prepare(iteration_dir: Path) -> CommandProtocol:
+                return command(
+                    variant=variant,
+                    command_data={
+                        "cloned_repo_path": self.__get_working_copy(size, iteration_dir)
+                    },
+                    executor=self.__local_executor,
+                )
+
+            return BenchmarkCase(
+                command=command,
+                variant=variant,
+                size=size,
+                prepare=prepare,
+                read_only=True,
+            )
+
+        return get_case
+
+    def __get_push_case(self, variant: str, size: str) -> BenchmarkCase:
+        """Case: "git push origin <branch>" of one new commit on a new branch.
+        Pushed branches are deleted from the server after the last iteration.
+        """
+        branch_prefix = f"bench_push_{get_worker_id()}_"
+
+        def prepare(iteration_dir: Path) -> CommandProtocol:
+            repo_path = self.__get_working_copy(size, iteration_dir)
+            branch_name = f"{branch_prefix}{uuid.uuid4().hex[:12]}"
+            for step in (
+                WorkflowSteps.checkout_branch(branch_name),
+                WorkflowSteps.create_file("bench_file"),
+                WorkflowSteps.add_file("bench_file"),
+                WorkflowSteps.commit("Benchmark commit"),
+            ):
+                step.apply(repo_path)
+            return PushCommand(
+                variant=variant,
+                command_data={
+                    "new_branch_name": branch_name,
+                    "server_config": self.__environment.server_config,
+                    "cloned_repo_path": repo_path,
+                },
+                executor=self.__get_executor(variant),
+            )
+
+        return BenchmarkCase(
+            command=PushCommand,
+            variant=variant,
+            size=size,
+            prepare=prepare,
+            teardown=lambda: self.__environment.delete_server_branches(
+                size, branch_prefix
+            ),
+        )
+
+    def __get_working_copy(self, size: str, iteration_dir: Path) -> Path:
+        """Returns new working copy of the size in the iteration directory."""
+        return self.__environment.working_copy(size, Path(iteration_dir, "repository"))
+
+    def __get_executor(self, variant: str) -> LocalExecutor | LocalPexpectExecutor:
+        """Returns executor of clone and push variants: pexpect for "basic"."""
+        if variant == "basic":
+            return self.__local_pexpect_executor
+        return self.__local_executor
@@ -0,0 +1,87 @@
+"""Performance-regression gate: compares two benchmark runs statistically.
+
+Compares results written by the benchmark suite (see "Running the benchmarks"),
+e.g. of two git versions or of two revisions of this harness, per Command variant
+and repository size. Exits with 1 if any of them regressed, failed in the candidate
+run or is missing from it (unless --allow-missing is given), and when no case
+was compared at all, so it can gate a CI job; 2 on invalid input.
+
+Usage:
+    python -m git_tests.benchmarks.compare \\
+        --baseline TMP_BENCHMARKS/baseline*.json \\
+        --candidate TMP_BENCHMARKS/benchmark_results*.json \\
+        --threshold 0.05 --alpha 0.01 --method mannwhitney
+"""
+import argparse
+import sys
+
+from pathlib import Path
+
+from git_tests.tools.benchmark_comparison import (
+    BenchmarkComparator,
+    load_benchmark_reports,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        nargs="+",
+        required=True,
+        help="result files of the reference run, e.g. one per xdist worker",
+    )
+    parser.add_argument(
+        "--candidate",
+        type=Path,
+        nargs="+",
+        required=True,
+        help="result files of the compared run",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.05,
+        help="smallest relative slowdown of the median reported, e.g. 0.05 for 5%%",
+    )
+    parser.add_argument("--alpha", type=float, default=0.01, help="significance level")
+    parser.add_argument(
+        "--method", choices=["mannwhitney", "bootstrap"], default="mannwhitney"
+    )
+    parser.add_argument("--metric", choices=["wall", "cpu"], default="wall")
+    parser.add_argument(
+        "--allow-missing",
+        action="store_true",
+        help="pass the gate when baseline cases are missing in the candidate run",
+    )
+    options = parser.parse_args()
+
+    try:
+        baseline = load_benchmark_reports(options.baseline)
+        candidate = load_benchmark_reports(options.candidate)
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        print(f"Cannot load benchmark results: {error}", file=sys.stderr)
+        return 2
+
+    comparator = BenchmarkComparator(
+        metric=options.metric,
+        method=options.method,
+        threshold=options.threshold,
+        alpha=options.alpha,
+        allow_missing=options.allow_missing,
+    )
+    result = comparator.compare(baseline, candidate)
+    print("\n".join(result.summary()))
+    if not result.compared:
+        print("No cases were compared", file=sys.stderr)
+    print(
+        f"{len(result.regressions)} regressions "
+        f"(threshold {options.threshold:.0%}, alpha {options.alpha}, "
+        f"{options.method}, {options.metric} time)"
+    )
+    return result.exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import dataclasses
+import shutil
+from pathlib import Path
+
+import pytest
+
+from git_tests.benchmarks.benchmark_cases import (
+    BENCHMARK_REPOSITORY_SIZES,
+    BenchmarkCases,
+    BenchmarkEnvironment,
+)
+from git_tests.config import BenchmarkConfig, PathsConfig, get_worker_id
+from git_tests.tools.benchmark_runner import (
+    BenchmarkReport,
+    BenchmarkRunner,
+    get_benchmark_metadata,
+)
+from git_tests.tools.executors.ssh_executor import SshConnectionPool
+from git_tests.tools.fixture_repo_cache import FixtureRepositoryCache
+from git_tests.tools.repo_template_cache import RepositoryTemplateCache
+
+
+benchmark_report_key = pytest.StashKey[BenchmarkReport]()
+
+
+@pytest.fixture(scope="session")
+def benchmark_runner() -> BenchmarkRunner:
+    """Runner with warmup and calibration settings from BenchmarkConfig."""
+    benchmark_config = BenchmarkConfig()
+    return BenchmarkRunner(
+        work_dir=Path(benchmark_config.work_dir, "iterations"),
+        warmup=benchmark_config.warmup,
+        min_iterations=benchmark_config.min_iterations,
+        max_iterations=benchmark_config.max_iterations,
+        target_seconds=benchmark_config.target_seconds,
+    )
+
+
+@pytest.fixture(scope="session")
+def benchmark_cases(
+    fixture_repository_cache: FixtureRepositoryCache,
+    repository_template_cache: RepositoryTemplateCache,
+    ssh_connection_pool: SshConnectionPool,
+) -> BenchmarkCases:
+    """Benchmark cases on repositories of BenchmarkConfig sizes.
+    Working copies are copied with the strategy of repository_template_cache.
+    """
+    benchmark_config = BenchmarkConfig()
+    environment = BenchmarkEnvironment(
+        work_dir=benchmark_config.work_dir,
+        fixture_repository_cache=fixture_repository_cache,
+        copy_repository=repository_template_cache.copy,
+        ssh_connection_pool=ssh_connection_pool,
+    )
+    yield BenchmarkCases(environment)
+    environment.cleanup()
+    shutil.rmtree(benchmark_config.work_dir, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def benchmark_report(
+    request: pytest.FixtureRequest, benchmark_runner: BenchmarkRunner
+) -> BenchmarkReport:
+    """Results of all benchmarks of the session.
+    Written as JSON to BenchmarkConfig.worker_results_file after the last benchmark.
+    """
+    benchmark_config = BenchmarkConfig()
+    report = BenchmarkReport(
+        metadata=get_benchmark_metadata(
+            base_dir=PathsConfig().base_dir,
+            runner=benchmark_runner,
+            worker_id=get_worker_id(),
+            sizes={
+                size: dataclasses.asdict(BENCHMARK_REPOSITORY_SIZES[size])
+                for size in benchmark_config.sizes
+                if size in BENCHMARK_REPOSITORY_SIZES
+            },
+        )
+    )
+    request.config.stash[benchmark_report_key] = report
+    yield report
+    report.write(benchmark_config.worker_results_file)
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    """Reports benchmark results table and the JSON report path."""
+    report = config.stash.get(benchmark_report_key, None)
+    if report is None or not report.results:
+        return
+    terminalreporter.section("benchmarks")
+    for line in report.summary():
+        terminalreporter.write_line(line)
+    terminalreporter.write_line(
+        f"Results written to {BenchmarkConfig().worker_results_file}"
+    )
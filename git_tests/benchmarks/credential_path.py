@@ -0,0 +1,65 @@
+"""Credential path benchmark: pexpect password prompt vs SSH_ASKPASS helper.
+
+Clones the test repository from the git server with both CloneCommand variants.
+Needs the configured environment (git server from the inventory).
+
+Usage:
+    python -m git_tests.benchmarks.credential_path --rounds 10
+"""
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+
+from pathlib import Path
+
+from git_tests.config import Inventory, SingleGitServerConfig
+from git_tests.helpers.commands.clone_command import CloneCommand
+from git_tests.tools.executors.local_executor import (
+    LocalExecutor,
+    LocalPexpectExecutor,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10)
+    options = parser.parse_args()
+
+    single_git_server_config = SingleGitServerConfig()
+    server_config = Inventory().get(single_git_server_config.host_name)
+    executors = {"basic": LocalPexpectExecutor(), "askpass": LocalExecutor()}
+
+    samples = {variant: [] for variant in executors}
+    for _ in range(options.rounds):
+        for variant, executor in executors.items():
+            base_dir = Path(tempfile.mkdtemp(prefix="git_tests_credentials_"))
+            try:
+                start = time.perf_counter()
+                result = CloneCommand(
+                    variant=variant,
+                    command_data={
+                        "server_config": server_config,
+                        "single_git_server_config": single_git_server_config,
+                        "cloned_repo_path": Path(base_dir, "clone"),
+                    },
+                    executor=executor,
+                ).run()
+                samples[variant].append(time.perf_counter() - start)
+            finally:
+                shutil.rmtree(base_dir, ignore_errors=True)
+            if result.rc != 0:
+                raise RuntimeError(f"Clone failed for {variant}: {result}")
+
+    print(f"rounds: {options.rounds}")
+    print(f"{'variant':<10}{'median [ms]':>14}{'min [ms]':>12}{'max [ms]':>12}")
+    for variant, values in samples.items():
+        print(
+            f"{variant:<10}{statistics.median(values) * 1000:>14.2f}"
+            f"{min(values) * 1000:>12.2f}{max(values) * 1000:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
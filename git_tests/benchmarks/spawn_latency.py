@@ -0,0 +1,115 @@
+"""Spawn latency benchmark: shell string vs argv execution in LocalExecutor.
+
+Runs the whole workflow (clone -> checkout -> add -> commit -> push)
+against a local bare repository, so no git server is needed.
+
+Usage:
+    python -m git_tests.benchmarks.spawn_latency --rounds 20
+"""
+import argparse
+import shlex
+import shutil
+import statistics
+import tempfile
+import time
+
+from pathlib import Path
+
+from git_tests.tools.executors.local_executor import (
+    LocalExecutor,
+    POSIX_SPAWN_SUPPORTED,
+)
+
+
+def get_workflow_steps(
+    origin_path: Path, repo_path: Path
+) -> list[tuple[str, list[str], Path | None]]:
+    """Workflow steps as (name, git arguments, working directory)."""
+    steps = [
+        ("clone", ["git", "clone", str(origin_path), str(repo_path)], None),
+        ("checkout", ["git", "checkout", "-b", "new_branch_01"], repo_path),
+        ("add", ["git", "add", "new_file01"], repo_path),
+        (
+            "config_user",
+            ["git", "config", "--local", "user.name", "gituser"],
+            repo_path,
+        ),
+        (
+            "config_email",
+            ["git", "config", "--local", "user.email", "email@example.com"],
+            repo_path,
+        ),
+        ("commit", ["git", "commit", "-m", "Test commit message 01"], repo_path),
+        ("push", ["git", "push", "origin", "new_branch_01"], repo_path),
+    ]
+    return steps
+
+
+def run_workflow(
+    executor: LocalExecutor, base_dir: Path, mode: str
+) -> dict[str, float]:
+    """Runs the workflow once and returns wall time of every step in seconds.
+
+    Args:
+        executor: executor to run commands with
+        base_dir: empty directory for the origin and the clone
+        mode: "shell" - string commands with cwd, "argv" - argument lists with git -C
+    """
+    origin_path = Path(base_dir, "origin.git")
+    repo_path = Path(base_dir, "clone")
+    executor.execute(["git", "init", "--bare", str(origin_path)])
+
+    timings = {}
+    for name, arguments, cwd in get_workflow_steps(origin_path, repo_path):
+        if name == "add":
+            Path(repo_path, "new_file01").touch()
+
+        if mode == "shell":
+            command, command_cwd = shlex.join(arguments), cwd
+        else:
+            command, command_cwd = arguments, None
+            if cwd is not None:
+                command = [arguments[0], "-C", str(cwd), *arguments[1:]]
+
+        start = time.perf_counter()
+        result = executor.execute(command, cwd=command_cwd)
+        timings[name] = time.perf_counter() - start
+        if result.rc != 0:
+            raise RuntimeError(f"Step {name} failed in {mode} mode: {result.stderr}")
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    options = parser.parse_args()
+
+    executor = LocalExecutor()
+    samples = {"shell": [], "argv": []}
+    for _ in range(options.rounds):
+        # interleaved, so both modes see the same system noise
+        for mode in samples:
+            base_dir = Path(tempfile.mkdtemp(prefix="git_tests_spawn_"))
+            try:
+                samples[mode].append(run_workflow(executor, base_dir, mode))
+            finally:
+                shutil.rmtree(base_dir, ignore_errors=True)
+
+    print(f"posix_spawn supported: {POSIX_SPAWN_SUPPORTED}, rounds: {options.rounds}")
+    print(f"{'step':<14}{'shell [ms]':>12}{'argv [ms]':>12}{'saved':>10}")
+    for name in list(samples["shell"][0]) + ["total"]:
+        medians = {}
+        for mode, rounds in samples.items():
+            values = [
+                sum(timings.values()) if name == "total" else timings[name]
+                for timings in rounds
+            ]
+            medians[mode] = statistics.median(values) * 1000
+        saved = 1 - medians["argv"] / medians["shell"]
+        print(
+            f"{name:<14}{medians['shell']:>12.2f}{medians['argv']:>12.2f}{saved:>10.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import pytest
+from grappa import should
+
+from git_tests.benchmarks.benchmark_cases import (
+    BENCHMARKED_VARIANTS,
+    SIZE_INDEPENDENT_COMMANDS,
+)
+from git_tests.config import BenchmarkConfig
+
+
+def get_benchmark_params() -> list:
+    """Returns pytest params of every benchmarked Command variant and size."""
+    params = []
+    for command, variant in BENCHMARKED_VARIANTS:
+        sizes = (
+            ("empty",)
+            if command in SIZE_INDEPENDENT_COMMANDS
+            else BenchmarkConfig().sizes
+        )
+        for size in sizes:
+            params.append(
+                pytest.param(
+                    command, variant, size, id=f"{command.__name__}.{variant}[{size}]"
+                )
+            )
+    return params
+
+
+@pytest.mark.benchmark
+class TestBenchmarks:
+    """Performance of every Command variant, on repositories of several sizes.
+    Not a part of the functional suite, run with: pytest git_tests/benchmarks
+    """
+
+    @pytest.mark.parametrize(("command", "variant", "size"), get_benchmark_params())
+    def test_benchmark(
+        self,
+        command,
+        variant,
+        size,
+        benchmark_cases,
+        benchmark_runner,
+        benchmark_report,
+    ):
+        """
+        Given:
+            - repository of the size: working copy, or the server repository
+        When:
+            - executing the Command variant repeatedly, after warmup and calibration
+        Then:
+            - every iteration ends with success
+            - wall and CPU time statistics are added to the benchmark report
+        """
+        result = benchmark_runner.run(benchmark_cases.get(command, variant, size))
+        benchmark_report.results.append(result)
+        result.failures | should.be.empty
@@ -5,10 +5,27 @@ from dataclasses import dataclass, field
 from pathlib import Path
 
 
+def get_worker_id() -> str:
+    """Returns pytest-xdist worker id (e.g. "gw0"),
+    or "master" if tests are not distributed.
+    """
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def get_worker_number() -> int:
+    """Returns pytest-xdist worker number (e.g. 0 for "gw0"), 0 for "master"."""
+    worker_id = get_worker_id()
+    return 0 if worker_id == "master" else int(worker_id.removeprefix("gw"))
+
+
 @dataclass(frozen=True)
 class PathsConfig:
     """Paths configuration.
     Should contain Paths to static files and directories in the project.
+
+    Temporary test directories should be created in workspace_dir,
+    which is separate for every pytest-xdist worker. Its root is base_dir,
+    or GIT_TESTS_WORKSPACE if set (e.g. by GitVersionMatrix, one per git version).
     """
 
     tests_dir: Path = Path(os.path.dirname(__file__)).resolve()
@@ -20,6 +37,22 @@ class PathsConfig:
     playbook_tests_env_config: Path = Path(playbooks_dir, "tests_env_config.yaml")
 
     ansible_inventory_file: Path = Path(base_dir, "inventory.yaml")
+    env_fingerprint_file: Path = Path(base_dir, ".git_tests_env_fingerprint")
+    provisioning_lock_file: Path = Path(base_dir, ".git_tests_provisioning.lock")
+    ansible_artifacts_dir: Path = Path(base_dir, "TMP_ANSIBLE_ARTIFACTS")
+    fixture_repo_cache_dir: Path = Path(base_dir, "TMP_FIXTURE_REPOS")
+    fixture_repo_cache_max_size: int = (
+        int(os.environ.get("GIT_TESTS_FIXTURE_CACHE_MAX_MB", "2048")) * 1024**2
+    )
+    git_builds_dir: Path = Path(base_dir, "TMP_GIT_BUILDS")
+    git_matrix_dir: Path = Path(base_dir, "TMP_GIT_MATRIX")
+
+    workspace_root: Path = Path(os.environ.get("GIT_TESTS_WORKSPACE", base_dir))
+    workspace_dir: Path = (
+        workspace_root
+        if get_worker_id() == "master"
+        else Path(workspace_root, "TMP_WORKERS", get_worker_id())
+    )
 
 
 @dataclass
@@ -32,6 +65,7 @@ class InventoryHost:
     ansible_host: str
     ansible_user: str
     ansible_password: str
+    ansible_port: int = 22
 
     _full_data: field(init=False, repr=False, kw_only=True) = False
 
@@ -66,9 +100,11 @@ class Inventory:
                         ansible_host=host_data.get("ansible_host"),
                         ansible_user=host_data.get("ansible_user"),
                         ansible_password=host_data.get("ansible_password"),
+                        ansible_port=host_data.get("ansible_port", 22),
                     )
                     if inventory_host.all_data_collected():
                         self.hosts.append(inventory_host)
+            self.__apply_local_git_server()
 
     def get(self, name: str) -> InventoryHost:
         """Returns host by its name."""
@@ -80,6 +116,16 @@ class Inventory:
             raise ValueError(f"Not found Host with name: {name}.")
         return host_to_return
 
+    def __apply_local_git_server(self) -> None:
+        """Points git server host to the local stand-in server, if it is enabled."""
+        local_git_server_config = LocalGitServerConfig()
+        if not local_git_server_config.enabled:
+            return
+        for host in self.hosts:
+            if host.name == SingleGitServerConfig().host_name:
+                host.ansible_host = local_git_server_config.host
+                host.ansible_port = local_git_server_config.port
+
 
 @dataclass
 class SingleGitServerConfig:
@@ -88,9 +134,107 @@ class SingleGitServerConfig:
     Args:
         host_name: typically, container name
         repos_path: main repository directory on the host, configured by the playbook
-        test_repo_name: test repository name on the host, configured by the playbook
+        provisioned_repo_name: test repository name on the host, configured by the playbook
+        test_repo_name: test repository used by this process; the provisioned one,
+            or the one created for the pytest-xdist worker (e.g. testrepo_gw0.git)
     """
 
     host_name: str = "git-server-custom"
     repos_path: Path = Path("/git-repos")
-    test_repo_name: str = "testrepo.git"
+    provisioned_repo_name: str = "testrepo.git"
+    test_repo_name: str = (
+        "testrepo.git"
+        if get_worker_id() == "master"
+        else f"testrepo_{get_worker_id()}.git"
+    )
+
+    @property
+    def worker_repo(self) -> bool:
+        """Checks if test repository is created for the pytest-xdist worker,
+        instead of the provisioned one.
+        """
+        return self.test_repo_name != self.provisioned_repo_name
+
+
+@dataclass(frozen=True)
+class BenchmarkConfig:
+    """Configuration of the benchmark mode: pytest git_tests/benchmarks
+    Every value can be set by its environment variable.
+
+    Args:
+        sizes: names of repository sizes to benchmark (see BENCHMARK_REPOSITORY_SIZES),
+            GIT_TESTS_BENCHMARK_SIZES, comma separated
+        results_file: JSON report, GIT_TESTS_BENCHMARK_RESULTS;
+            pytest-xdist workers write their own reports, with worker id in the name
+        warmup: not recorded iterations of every case, GIT_TESTS_BENCHMARK_WARMUP
+        min_iterations: GIT_TESTS_BENCHMARK_MIN_ITERATIONS
+        max_iterations: GIT_TESTS_BENCHMARK_MAX_ITERATIONS
+        target_seconds: intended measured time of every case,
+            GIT_TESTS_BENCHMARK_TARGET_SECONDS
+        work_dir: directory for states of iterations
+    """
+
+    sizes: tuple[str, ...] = tuple(
+        os.environ.get("GIT_TESTS_BENCHMARK_SIZES", "small,medium").split(",")
+    )
+    results_file: Path = Path(
+        os.environ.get(
+            "GIT_TESTS_BENCHMARK_RESULTS",
+            Path(PathsConfig.base_dir, "TMP_BENCHMARKS", "benchmark_results.json"),
+        )
+    )
+    warmup: int = int(os.environ.get("GIT_TESTS_BENCHMARK_WARMUP", "1"))
+    min_iterations: int = int(os.environ.get("GIT_TESTS_BENCHMARK_MIN_ITERATIONS", "5"))
+    max_iterations: int = int(
+        os.environ.get("GIT_TESTS_BENCHMARK_MAX_ITERATIONS", "50")
+    )
+    target_seconds: float = float(
+        os.environ.get("GIT_TESTS_BENCHMARK_TARGET_SECONDS", "2")
+    )
+    work_dir: Path = Path(PathsConfig.workspace_dir, "TMP_BENCHMARK_WORK")
+
+    @property
+    def worker_results_file(self) -> Path:
+        """Results file of this process, e.g. benchmark_results_gw0.json for gw0."""
+        if get_worker_id() == "master":
+            return self.results_file
+        return self.results_file.with_name(
+            f"{self.results_file.stem}_{get_worker_id()}{self.results_file.suffix}"
+        )
+
+
+@dataclass(frozen=True)
+class LocalGitServerConfig:
+    """Configuration for the in-process stand-in of the git server.
+    Enabled by setting GIT_TESTS_LOCAL_SERVER_PORT environment variable,
+    e.g. GIT_TESTS_LOCAL_SERVER_PORT=2222 pytest
+
+    When enabled, git server host from the inventory is replaced by this one,
+    and SingleGitServerConfig.repos_path is mapped to repos_dir.
+    Every pytest-xdist worker starts its own stand-in, on the next port
+    (gw0 on the given port, gw1 on the given port + 1, ...), with its own directories.
+
+    Args:
+        port: port to listen on, None if stand-in server is disabled
+        host: address to listen on
+        repos_dir: local directory which holds the server repositories
+        host_key_path: server host key, generated on first use
+    """
+
+    port: int | None = (
+        int(os.environ["GIT_TESTS_LOCAL_SERVER_PORT"]) + get_worker_number()
+        if os.environ.get("GIT_TESTS_LOCAL_SERVER_PORT")
+        else None
+    )
+    host: str = "127.0.0.1"
+    repos_dir: Path = Path(
+        PathsConfig.workspace_dir, "TMP_LOCAL_GIT_SERVER", "git-repos"
+    )
+    host_key_path: Path = Path(
+        PathsConfig.workspace_dir, "TMP_LOCAL_GIT_SERVER", "host_key"
+    )
+
+    @property
+    def enabled(self) -> bool:
+        """Checks if stand-in server should be used instead of the git server."""
+        return self.port is not None
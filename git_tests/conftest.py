@@ -1,10 +1,47 @@
+import contextlib
+import fcntl
+import os
+import shlex
+import shutil
+from pathlib import Path
+
 import pytest
-from .config import PathsConfig
-from .tools.executors.ansible_executor import AnsibleExecutor
+from .config import (
+    PathsConfig,
+    Inventory,
+    LocalGitServerConfig,
+    SingleGitServerConfig,
+)
+from .helpers.commands.clone_command import CloneCommand
+from .tools.executors.ansible_executor import (
+    AnsibleExecutor,
+    get_slowest_tasks_summary,
+)
+from .tools.executors.ansible_scheduler import (
+    AnsibleDagScheduler,
+    ProvisioningGraph,
+    ProvisioningNode,
+    ProvisioningResult,
+)
+from .tools.executors.local_executor import LocalExecutionResult, LocalExecutor
+from .tools.env_fingerprint import EnvironmentFingerprintCollector
+from .tools.fixture_repo_cache import FixtureRepositoryCache
+from .tools.executors.ssh_executor import SshConnectionPool, SshExecutor, SshHostData
+from .tools.local_git_server import LocalGitSshServer
+from .tools.repo_template_cache import RepositoryTemplateCache
+from .tools.workflow_state_tree import WorkflowStateTree
+
+
+provisioning_result_key = pytest.StashKey[ProvisioningResult]()
+repository_template_cache_key = pytest.StashKey[RepositoryTemplateCache]()
+workflow_state_tree_key = pytest.StashKey[WorkflowStateTree]()
+fixture_repository_cache_key = pytest.StashKey[FixtureRepositoryCache]()
 
 
 @pytest.fixture(scope="session", autouse=True)
-def run_initial_env_configuration() -> None:
+def run_initial_env_configuration(
+    request: pytest.FixtureRequest, ssh_connection_pool: SshConnectionPool
+) -> None:
     """Runs once, before any tests.
 
     Runs Ansible Playbooks:
@@ -12,39 +49,410 @@ def run_initial_env_configuration() -> None:
         - GIT installation (test container, git server container)
         - server configuration (git server container)
 
-    Must be executed in that order.
+    Playbooks are played per host, as a dependency graph (see get_provisioning_graph),
+    so work on the test container and on the git server is done in parallel.
+    Timings and the critical path are reported after the session.
+
+    Provisioning is skipped if the environment fingerprint, stored on both hosts
+    after the last provisioning, still matches. If only the server repository
+    has changed, just the server configuration is executed.
+    GIT_TESTS_FORCE_PROVISIONING=1 environment variable forces all Playbooks.
+
+    With pytest-xdist, provisioning is done by the first worker only,
+    the others wait for it. Then every worker creates its own test repository
+    on the server (SingleGitServerConfig.test_repo_name), deleted after the session.
+
+    If LocalGitServerConfig is enabled, starts the local stand-in
+    of the git server instead, and no playbooks are run.
     """
-    paths_config = PathsConfig()
-    ansible_executor = AnsibleExecutor()
+    local_git_server_config = LocalGitServerConfig()
+    if local_git_server_config.enabled:
+        with prepare_local_git_server(local_git_server_config):
+            yield
+        return
 
-    configure_test_env(paths_config=paths_config, ansible_executor=ansible_executor)
-    install_git(paths_config=paths_config, ansible_executor=ansible_executor)
-    configure_server_env(paths_config=paths_config, ansible_executor=ansible_executor)
+    paths_config = PathsConfig()
+    with provisioning_lock(paths_config.provisioning_lock_file) as provisioned:
+        if not provisioned:
+            provision_environment(
+                request=request,
+                paths_config=paths_config,
+                ssh_connection_pool=ssh_connection_pool,
+            )
+    with worker_repository(ssh_connection_pool=ssh_connection_pool):
+        yield
 
 
-def configure_test_env(
-    paths_config: PathsConfig, ansible_executor: AnsibleExecutor
+def provision_environment(
+    request: pytest.FixtureRequest,
+    paths_config: PathsConfig,
+    ssh_connection_pool: SshConnectionPool,
 ) -> None:
-    result = ansible_executor.execute(
-        inventory=paths_config.ansible_inventory_file,
-        playbook=paths_config.playbook_tests_env_config,
+    """Runs provisioning Playbooks, if the environment fingerprint has changed."""
+    fingerprint_collector = get_fingerprint_collector(
+        paths_config=paths_config, ssh_connection_pool=ssh_connection_pool
     )
-    assert result.status == "successful"
 
+    provisioning_plan = "full"
+    if not os.environ.get("GIT_TESTS_FORCE_PROVISIONING"):
+        provisioning_plan = fingerprint_collector.get_provisioning_plan()
 
-def configure_server_env(
-    paths_config: PathsConfig, ansible_executor: AnsibleExecutor
-) -> None:
-    result = ansible_executor.execute(
-        inventory=paths_config.ansible_inventory_file,
-        playbook=paths_config.playbook_server_config,
+    provisioning_graph = get_provisioning_graph(paths_config=paths_config)
+    if provisioning_plan == "server":
+        provisioning_graph = provisioning_graph.subgraph(
+            [f"server_config@{SingleGitServerConfig().host_name}"]
+        )
+    if provisioning_plan in ("full", "server"):
+        scheduler = AnsibleDagScheduler(
+            ansible_executor=AnsibleExecutor(
+                artifacts_dir=paths_config.ansible_artifacts_dir
+            )
+        )
+        result = scheduler.execute(
+            graph=provisioning_graph, inventory=paths_config.ansible_inventory_file
+        )
+        request.config.stash[provisioning_result_key] = result
+        assert result.successful, "\n".join(result.summary())
+        fingerprint_collector.store()
+
+
+@contextlib.contextmanager
+def provisioning_lock(lock_file: Path) -> bool:
+    """Exclusive lock for provisioning, shared by pytest-xdist workers.
+
+    Lock file holds id of the test run which provisioned the environment last,
+    so only the first worker of the run provisions it.
+
+    Yields:
+        True if environment is already provisioned in this test run
+    """
+    test_run_id = os.environ.get("PYTEST_XDIST_TESTRUNUID", "")
+    with open(lock_file, "a+") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            lock.seek(0)
+            provisioned = bool(test_run_id) and lock.read() == test_run_id
+            yield provisioned
+            lock.seek(0)
+            lock.truncate()
+            lock.write(test_run_id)
+            lock.flush()
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+@contextlib.contextmanager
+def worker_repository(ssh_connection_pool: SshConnectionPool) -> None:
+    """Creates bare test repository of the pytest-xdist worker on the server,
+    the same way as server_config.yaml playbook, and deletes it at the end.
+
+    If tests are not distributed, the provisioned repository is used instead,
+    and it is recreated empty at the end, so the pushes of the session
+    don't change the environment fingerprint and provisioning can be skipped
+    in the next session.
+    """
+    single_git_server_config = SingleGitServerConfig()
+    server_config = Inventory().get(single_git_server_config.host_name)
+    host_data = SshHostData(
+        host=server_config.ansible_host,
+        user=server_config.ansible_user,
+        password=server_config.ansible_password,
+        port=server_config.ansible_port,
     )
-    assert result.status == "successful"
+    repo_path = shlex.quote(
+        str(
+            Path(
+                single_git_server_config.repos_path,
+                single_git_server_config.test_repo_name,
+            )
+        )
+    )
+    init_command = f"rm -rf {repo_path} && git init --quiet --bare {repo_path}"
+    if single_git_server_config.worker_repo:
+        with SshExecutor(host_data=host_data, pool=ssh_connection_pool) as ssh_executor:
+            result = ssh_executor.execute(init_command)
+            assert result.recv_exit_status() == 0, result.read(channel="stderr")
+
+    yield
+
+    with SshExecutor(host_data=host_data, pool=ssh_connection_pool) as ssh_executor:
+        if single_git_server_config.worker_repo:
+            ssh_executor.execute(f"rm -rf {repo_path}").recv_exit_status()
+        else:
+            ssh_executor.execute(init_command).recv_exit_status()
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    """Reports provisioning timings, its critical path and the slowest Ansible tasks,
+    if provisioning was run. Artifacts of every Playbook run are in
+    PathsConfig.ansible_artifacts_dir.
+    Reports time saved by the repository template cache and built workflow states,
+    and counters of the fixture repository cache, if they were used.
+    """
+    fixture_cache = config.stash.get(fixture_repository_cache_key, None)
+    if fixture_cache is not None and fixture_cache.summary():
+        terminalreporter.section("fixture repository cache")
+        for line in fixture_cache.summary():
+            terminalreporter.write_line(line)
 
+    cache = config.stash.get(repository_template_cache_key, None)
+    tree = config.stash.get(workflow_state_tree_key, None)
+    summary = (cache.summary() if cache else []) + (tree.summary() if tree else [])
+    if summary:
+        terminalreporter.section("repository template cache")
+        for line in summary:
+            terminalreporter.write_line(line)
 
-def install_git(paths_config: PathsConfig, ansible_executor: AnsibleExecutor) -> None:
-    result = ansible_executor.execute(
-        inventory=paths_config.ansible_inventory_file,
-        playbook=paths_config.playbook_install_git,
+    result = config.stash.get(provisioning_result_key, None)
+    if result is None:
+        return
+    terminalreporter.section("environment provisioning")
+    for line in result.summary():
+        terminalreporter.write_line(line)
+
+    task_timings = [
+        timing
+        for node_result in result.nodes.values()
+        if node_result.executor_result is not None
+        for timing in node_result.executor_result.task_timings
+    ]
+    terminalreporter.write_line("Slowest tasks:")
+    for line in get_slowest_tasks_summary(task_timings):
+        terminalreporter.write_line(f"  {line}")
+
+
+@pytest.fixture(scope="session")
+def ssh_connection_pool() -> SshConnectionPool:
+    """Pool of authenticated Ssh transports, shared by the whole session.
+    Closes all transports after the last test.
+    """
+    pool = SshConnectionPool()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def repository_template_cache(
+    request: pytest.FixtureRequest,
+) -> RepositoryTemplateCache:
+    """Template clone of the server test repository, shared by the whole session.
+    Test classes get their working copies from it, instead of cloning over Ssh.
+    Must be invalidated by tests which change the server repository.
+    """
+    paths_config = PathsConfig()
+    single_git_server_config = SingleGitServerConfig()
+    server_config = Inventory().get(single_git_server_config.host_name)
+    template_parent_dir = Path(paths_config.workspace_dir, "TMP_REPO_TEMPLATE")
+
+    def clone_template(destination: Path) -> LocalExecutionResult:
+        return CloneCommand(
+            variant="askpass",
+            command_data={
+                "server_config": server_config,
+                "single_git_server_config": single_git_server_config,
+                "cloned_repo_path": destination,
+            },
+            executor=LocalExecutor(),
+        ).run()
+
+    if template_parent_dir.exists():
+        shutil.rmtree(template_parent_dir)
+    cache = RepositoryTemplateCache(
+        template_dir=Path(template_parent_dir, single_git_server_config.test_repo_name),
+        clone_template=clone_template,
+    )
+    request.config.stash[repository_template_cache_key] = cache
+    yield cache
+    shutil.rmtree(template_parent_dir, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def workflow_state_tree(
+    request: pytest.FixtureRequest, repository_template_cache: RepositoryTemplateCache
+) -> WorkflowStateTree:
+    """Tree of working repository states, shared by the whole session.
+    Test classes fork the state they need (see WorkflowSteps),
+    instead of replaying git commands in their setup.
+    Root state is the template clone from repository_template_cache.
+    Must be invalidated by tests which change the server repository.
+    """
+    snapshots_dir = Path(PathsConfig().workspace_dir, "TMP_WORKFLOW_STATES")
+    if snapshots_dir.exists():
+        shutil.rmtree(snapshots_dir)
+    tree = WorkflowStateTree(
+        snapshots_dir=snapshots_dir,
+        create_root=lambda path: repository_template_cache.checkout(path, record=False),
+        copy_repository=repository_template_cache.copy,
+        record_fork=repository_template_cache.record_timing,
+    )
+    request.config.stash[workflow_state_tree_key] = tree
+    yield tree
+    tree.invalidate()
+
+
+@pytest.fixture(scope="session")
+def fixture_repository_cache(request: pytest.FixtureRequest) -> FixtureRepositoryCache:
+    """On-disk cache of generated repositories (see RepositoryGenerator),
+    shared by sessions and pytest-xdist workers:
+        fixture_repository_cache.checkout(RepositoryGeneratorParameters(...), path)
+    Kept between sessions, up to GIT_TESTS_FIXTURE_CACHE_MAX_MB megabytes.
+    """
+    paths_config = PathsConfig()
+    cache = FixtureRepositoryCache(
+        cache_dir=paths_config.fixture_repo_cache_dir,
+        max_size=paths_config.fixture_repo_cache_max_size,
+    )
+    request.config.stash[fixture_repository_cache_key] = cache
+    return cache
+
+
+@pytest.fixture
+def local_ssh_host_data() -> SshHostData:
+    """Connection data of a local stand-in server (LocalGitSshServer)
+    on a free port, running for one test, with no mapped paths.
+    """
+    with LocalGitSshServer(
+        user="tester",
+        password="tester_password",
+        path_map={},
+        host_key_path=LocalGitServerConfig.host_key_path,
+    ) as local_git_server:
+        yield SshHostData(
+            host="127.0.0.1",
+            user=local_git_server.user,
+            password=local_git_server.password,
+            port=local_git_server.port,
+        )
+
+
+@pytest.fixture
+def committed_repository(tmp_path: Path) -> Path:
+    """Local repository in a temporary directory, on master branch,
+    with one committed file: d/f, commit message "initial".
+    """
+    repo_path = Path(tmp_path, "repo")
+    Path(repo_path, "d").mkdir(parents=True)
+    Path(repo_path, "d", "f").write_text("initial\n")
+    local_executor = LocalExecutor()
+    for command in (
+        ["git", "init", "-q", "-b", "master", str(repo_path)],
+        ["git", "-C", str(repo_path), "config", "user.name", "tester"],
+        ["git", "-C", str(repo_path), "config", "user.email", "tester@local"],
+        ["git", "-C", str(repo_path), "add", "d/f"],
+        ["git", "-C", str(repo_path), "commit", "-q", "-m", "initial"],
+    ):
+        result = local_executor.execute(command)
+        assert result.rc == 0, result.stderr
+    return repo_path
+
+
+def get_fingerprint_collector(
+    paths_config: PathsConfig, ssh_connection_pool: SshConnectionPool
+) -> EnvironmentFingerprintCollector:
+    """Creates fingerprint collector for the git server from the inventory."""
+    single_git_server_config = SingleGitServerConfig()
+    server_config = Inventory().get(single_git_server_config.host_name)
+    return EnvironmentFingerprintCollector(
+        playbooks=[
+            paths_config.playbook_tests_env_config,
+            paths_config.playbook_install_git,
+            paths_config.playbook_server_config,
+        ],
+        inventory_file=paths_config.ansible_inventory_file,
+        local_fingerprint_file=paths_config.env_fingerprint_file,
+        host_data=SshHostData(
+            host=server_config.ansible_host,
+            user=server_config.ansible_user,
+            password=server_config.ansible_password,
+            port=server_config.ansible_port,
+        ),
+        server_repo_path=Path(
+            single_git_server_config.repos_path,
+            single_git_server_config.provisioned_repo_name,
+        ),
+        ssh_connection_pool=ssh_connection_pool,
+    )
+
+
+def get_provisioning_graph(paths_config: PathsConfig) -> ProvisioningGraph:
+    """Provisioning as a dependency graph of Playbook and host pairs.
+
+    On the test container, sshpass and git installation both use apt,
+    so they run one after another. Git server is independent of the test container,
+    but its repositories can be configured only after git is installed.
+    """
+    server_host = SingleGitServerConfig().host_name
+    return ProvisioningGraph(
+        [
+            ProvisioningNode(
+                name="tests_env_config@localhost",
+                playbook=paths_config.playbook_tests_env_config,
+                host="localhost",
+            ),
+            ProvisioningNode(
+                name="install_git@localhost",
+                playbook=paths_config.playbook_install_git,
+                host="localhost",
+                depends_on=("tests_env_config@localhost",),
+            ),
+            ProvisioningNode(
+                name=f"install_git@{server_host}",
+                playbook=paths_config.playbook_install_git,
+                host=server_host,
+            ),
+            ProvisioningNode(
+                name=f"server_config@{server_host}",
+                playbook=paths_config.playbook_server_config,
+                host=server_host,
+                depends_on=(f"install_git@{server_host}",),
+            ),
+        ]
+    )
+
+
+@contextlib.contextmanager
+def prepare_local_git_server(
+    local_git_server_config: LocalGitServerConfig,
+) -> LocalGitSshServer:
+    """Prepares repositories the same way as server_config.yaml playbook
+    and runs the stand-in server until the end of the context.
+
+    GIT_SSH_COMMAND is set for the context only, the previous value is restored after.
+    """
+    single_git_server_config = SingleGitServerConfig()
+    server_config = Inventory().get(single_git_server_config.host_name)
+
+    repos_dir = local_git_server_config.repos_dir
+    if repos_dir.exists():
+        shutil.rmtree(repos_dir)
+    repos_dir.mkdir(parents=True)
+    result = LocalExecutor().execute(
+        [
+            "git",
+            "init",
+            "--bare",
+            str(repos_dir / single_git_server_config.test_repo_name),
+        ]
     )
-    assert result.status == "successful"
+    assert result.rc == 0
+
+    previous_ssh_command = os.environ.get("GIT_SSH_COMMAND")
+    # host key of the stand-in is not trusted by the system, and it may change
+    os.environ[
+        "GIT_SSH_COMMAND"
+    ] = "ssh -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null"
+    try:
+        with LocalGitSshServer(
+            user=server_config.ansible_user,
+            password=server_config.ansible_password,
+            path_map={str(single_git_server_config.repos_path): repos_dir},
+            host=local_git_server_config.host,
+            port=local_git_server_config.port,
+            host_key_path=local_git_server_config.host_key_path,
+        ) as local_git_server:
+            yield local_git_server
+    finally:
+        if previous_ssh_command is None:
+            os.environ.pop("GIT_SSH_COMMAND", None)
+        else:
+            os.environ["GIT_SSH_COMMAND"] = previous_ssh_command
@@ -38,7 +38,12 @@ class AddCommand(CommandProtocol):
     def __get_basic_variant(self) -> dict[str, Any]:
         """Variant: basic for "git add"."""
         variant = {
-            "command": f"git add {self.__command_data.get('new_file_path').name}",
-            "cwd": self.__command_data.get("cloned_repo_path"),
+            "command": [
+                "git",
+                "-C",
+                str(self.__command_data.get("cloned_repo_path")),
+                "add",
+                self.__command_data.get("new_file_path").name,
+            ],
         }
         return variant
@@ -38,7 +38,13 @@ class CheckoutCommand(CommandProtocol):
     def __get_branch_variant(self) -> dict[str, Any]:
         """Variant: branch for "git checkout"."""
         variant = {
-            "command": f"git checkout -b {self.__command_data.get('branch_name')}",
-            "cwd": self.__command_data.get("cloned_repo_path"),
+            "command": [
+                "git",
+                "-C",
+                str(self.__command_data.get("cloned_repo_path")),
+                "checkout",
+                "-b",
+                self.__command_data.get("branch_name"),
+            ],
         }
         return variant
@@ -3,8 +3,10 @@ from typing import Any, Literal, Callable
 from git_tests.helpers.commands.command_protocol import CommandProtocol
 from git_tests.tools.executors.local_executor import (
     LocalExecutionResult,
+    LocalExecutor,
     LocalPexpectExecutor,
 )
+from git_tests.tools.ssh_askpass import get_askpass_env
 
 
 class CloneCommand(CommandProtocol):
@@ -12,16 +14,17 @@ class CloneCommand(CommandProtocol):
 
     def __init__(
         self,
-        variant: Literal["basic"],
+        variant: Literal["basic", "askpass"],
         command_data: dict[
             Literal["server_config", "single_git_server_config", "cloned_repo_path"],
             Any,
         ],
-        executor: LocalPexpectExecutor,
+        executor: LocalPexpectExecutor | LocalExecutor,
     ) -> None:
         """Constructor method for CloneCommand.
 
-        executor: Executor instance to use for running the command
+        executor: Executor instance to use for running the command,
+                  LocalPexpectExecutor for "basic", LocalExecutor for "askpass" variant
         command_data: data needed for command execution
         variant: command variant to execute
         """
@@ -38,17 +41,17 @@ class CloneCommand(CommandProtocol):
 
     def __get_mapped_variants(self) -> dict[str, Callable]:
         """Returns variant names and their callable methods mapped."""
-        variants = {"basic": self.__get_basic_variant}
+        variants = {
+            "basic": self.__get_basic_variant,
+            "askpass": self.__get_askpass_variant,
+        }
         return variants
 
     def __get_basic_variant(self) -> dict[str, Any]:
         """Variant: basic for "git clone"."""
         variant = {
             "command": (
-                f"git clone ssh://{self.__command_data.get('server_config').ansible_user}@"
-                f"{self.__command_data.get('server_config').ansible_host}"
-                f"{str(self.__command_data.get('single_git_server_config').repos_path)}/"
-                f"{self.__command_data.get('single_git_server_config').test_repo_name} "
+                f"git clone {self.__get_repo_url()} "
                 f"{str(self.__command_data.get('cloned_repo_path'))}"
             ),
             "expect": [
@@ -59,3 +62,45 @@ class CloneCommand(CommandProtocol):
             ],
         }
         return variant
+
+    def __get_askpass_variant(self) -> dict[str, Any]:
+        """Variant: askpass for "git clone".
+        Password is given by SSH_ASKPASS helper, without pty and prompt handling.
+        """
+        variant = {
+            "command": [
+                "git",
+                "clone",
+                self.__get_repo_url(),
+                str(self.__command_data.get("cloned_repo_path")),
+            ],
+            "env": get_askpass_env(
+                password=self.__command_data.get("server_config").ansible_password
+            ),
+        }
+        return variant
+
+    def __get_repo_url(self) -> str:
+        """Returns ssh url of the test repository."""
+        return get_repo_url(
+            server_config=self.__command_data.get("server_config"),
+            single_git_server_config=self.__command_data.get(
+                "single_git_server_config"
+            ),
+        )
+
+
+def get_repo_url(server_config: Any, single_git_server_config: Any) -> str:
+    """Returns ssh url of the test repository.
+
+    Args:
+        server_config: git server host from the inventory (InventoryHost)
+        single_git_server_config: server repositories configuration (SingleGitServerConfig)
+    """
+    port = f":{server_config.ansible_port}" if server_config.ansible_port != 22 else ""
+    repo_url = (
+        f"ssh://{server_config.ansible_user}@{server_config.ansible_host}{port}"
+        f"{str(single_git_server_config.repos_path)}/"
+        f"{single_git_server_config.test_repo_name}"
+    )
+    return repo_url
@@ -38,7 +38,13 @@ class CommitCommand(CommandProtocol):
     def __get_basic_variant(self) -> dict[str, Any]:
         """Variant: basic for "git commit"."""
         variant = {
-            "command": f"git commit -m \"{self.__command_data.get('commit_message')}\"",
-            "cwd": self.__command_data.get("cloned_repo_path"),
+            "command": [
+                "git",
+                "-C",
+                str(self.__command_data.get("cloned_repo_path")),
+                "commit",
+                "-m",
+                self.__command_data.get("commit_message"),
+            ],
         }
         return variant
@@ -0,0 +1,101 @@
+from dataclasses import dataclass, field
+from typing import Literal, Any, Callable
+
+from git_tests.helpers.commands.command_protocol import CommandProtocol
+from git_tests.tools.executors.local_batch_executor import (
+    LocalBatchExecutor,
+    LocalBatchResult,
+    LocalCommandRecorder,
+)
+from git_tests.tools.executors.local_executor import LocalExecutionResult
+
+
+@dataclass
+class CompositeExecutionResult(LocalExecutionResult):
+    """Result structure for CompositeCommand.
+
+    rc is the return code of the first failed sub-command, 0 if all succeeded.
+    stdout and stderr are joined outputs of all executed sub-commands.
+
+    Args:
+        results: results of every sub-command, in order; not executed ones
+            (after a failure, with stop_on_failure variant) have result None
+    """
+
+    results: list[LocalBatchResult] = field(default_factory=list)
+
+
+class CompositeCommand(CommandProtocol):
+    """Chains several Commands into one process launch.
+
+    Sub-commands are Commands created with LocalCommandRecorder executor:
+        CompositeCommand(
+            variant="stop_on_failure",
+            command_data={
+                "commands": [
+                    ConfigCommand(variant="user", ..., executor=LocalCommandRecorder()),
+                    ConfigCommand(variant="email", ..., executor=LocalCommandRecorder()),
+                ],
+                "cwd": cloned_repo_path,
+            },
+            executor=LocalBatchExecutor(),
+        ).run()
+    """
+
+    def __init__(
+        self,
+        variant: Literal["basic", "stop_on_failure"],
+        command_data: dict[Literal["commands", "cwd"], Any],
+        executor: LocalBatchExecutor,
+    ) -> None:
+        """Constructor method for CompositeCommand.
+
+        executor: Executor instance to use for running the command
+        command_data: data needed for command execution
+        variant: command variant to execute
+        """
+        self.__variant = variant
+        self.__command_data = command_data
+        self.__executor = executor
+
+    def run(self) -> CompositeExecutionResult:
+        """Runs all sub-commands with selected arguments."""
+        commands = [
+            command.run() for command in self.__command_data.get("commands", [])
+        ]
+        batch_results = self.__executor.execute_batch(
+            commands=commands,
+            cwd=self.__command_data.get("cwd"),
+            **self.__get_mapped_variants()[self.__variant](len(commands)),
+        )
+        executed = [
+            batch_result.result
+            for batch_result in batch_results
+            if batch_result.executed
+        ]
+        failed = [result for result in executed if result.rc != 0]
+        return CompositeExecutionResult(
+            args=[command.command for command in commands],
+            rc=failed[0].rc if failed else 0,
+            stdout="\n".join(result.stdout for result in executed),
+            stderr="\n".join(result.stderr for result in executed),
+            results=batch_results,
+        )
+
+    def __get_mapped_variants(self) -> dict[str, Callable]:
+        """Returns variant names and their callable methods mapped."""
+        variants = {
+            "basic": self.__get_basic_variant,
+            "stop_on_failure": self.__get_stop_on_failure_variant,
+        }
+        return variants
+
+    def __get_basic_variant(self, commands_count: int) -> dict[str, Any]:
+        """Variant: basic, all sub-commands are executed."""
+        variant = {"expected_rcs": None}
+        return variant
+
+    def __get_stop_on_failure_variant(self, commands_count: int) -> dict[str, Any]:
+        """Variant: stop_on_failure, sub-commands after the first failed one are skipped."""
+        variant = {"expected_rcs": [0] * commands_count}
+        return variant
@@ -38,15 +38,29 @@ class ConfigCommand(CommandProtocol):
     def __get_user_variant(self):
         """Variant: user for "git config"."""
         variant = {
-            "command": 'git config --local user.name "gituser"',
-            "cwd": self.__command_data.get("cloned_repo_path"),
+            "command": [
+                "git",
+                "-C",
+                str(self.__command_data.get("cloned_repo_path")),
+                "config",
+                "--local",
+                "user.name",
+                "gituser",
+            ],
         }
         return variant
 
     def __get_email_variant(self):
         """Variant: email for "git config"."""
         variant = {
-            "command": 'git config --local user.email "email@example.com"',
-            "cwd": self.__command_data.get("cloned_repo_path"),
+            "command": [
+                "git",
+                "-C",
+                str(self.__command_data.get("cloned_repo_path")),
+                "config",
+                "--local",
+                "user.email",
+                "email@example.com",
+            ],
         }
         return variant
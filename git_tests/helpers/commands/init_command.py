@@ -38,13 +38,18 @@ class InitCommand(CommandProtocol):
     def __get_basic_variant(self) -> dict[str, Any]:
         """Variant: basic for "git init"."""
         variant = {
-            "command": f"git init {str(self.__command_data.get('git_repo_path'))}"
+            "command": ["git", "init", str(self.__command_data.get("git_repo_path"))]
         }
         return variant
 
     def __get_bare_variant(self) -> dict[str, Any]:
         """Variant: bare for "git init"."""
         variant = {
-            "command": f"git init {str(self.__command_data.get('git_repo_path'))} --bare"
+            "command": [
+                "git",
+                "init",
+                str(self.__command_data.get("git_repo_path")),
+                "--bare",
+            ]
         }
         return variant
@@ -1,15 +1,26 @@
 from typing import Literal, Any, Callable
 
 from git_tests.helpers.commands.command_protocol import CommandProtocol
+from git_tests.helpers.porcelain import (
+    LOG_FORMAT,
+    ParsedExecutionResult,
+    parse_log,
+)
 from git_tests.tools.executors.local_executor import LocalExecutor, LocalExecutionResult
 
 
 class LogCommand(CommandProtocol):
-    """Wrapper for "git log" command."""
+    """Wrapper for "git log" command.
+
+    Porcelain variant returns ParsedExecutionResult, with typed output in "parsed"
+    (list[LogEntry]), if the executor returns LocalExecutionResult
+    (e.g. LocalExecutor, LocalStreamingExecutor);
+    AsyncLocalExecutor returns an awaitable of the unparsed result, stdout as bytes.
+    """
 
     def __init__(
         self,
-        variant: Literal["basic"],
+        variant: Literal["basic", "porcelain"],
         command_data: dict[Literal["cloned_repo_path"], Any],
         executor: LocalExecutor,
     ) -> None:
@@ -28,17 +39,49 @@ class LogCommand(CommandProtocol):
         result = self.__executor.execute(
             **self.__get_mapped_variants()[self.__variant]()
         )
+        parser = self.__get_mapped_parsers().get(self.__variant)
+        if parser and isinstance(result, LocalExecutionResult):
+            result = ParsedExecutionResult.from_result(result, parser)
         return result
 
     def __get_mapped_variants(self) -> dict[str, Callable]:
         """Returns variant names and their callable methods mapped."""
-        variants = {"basic": self.__get_basic_variant}
+        variants = {
+            "basic": self.__get_basic_variant,
+            "porcelain": self.__get_porcelain_variant,
+        }
         return variants
 
+    @staticmethod
+    def __get_mapped_parsers() -> dict[str, Callable[[bytes], Any]]:
+        """Returns variant names and parsers of their output mapped."""
+        parsers = {"porcelain": parse_log}
+        return parsers
+
     def __get_basic_variant(self) -> dict[str, Any]:
         """Variant: basic for "git log"."""
         variant = {
-            "command": f"git log --oneline",
-            "cwd": self.__command_data.get("cloned_repo_path"),
+            "command": [
+                "git",
+                "-C",
+                str(self.__command_data.get("cloned_repo_path")),
+                "log",
+                "--oneline",
+            ],
+        }
+        return variant
+
+    def __get_porcelain_variant(self) -> dict[str, Any]:
+        """Variant: machine-readable, NUL separated output of "git log"."""
+        variant = {
+            "command": [
+                "git",
+                "-C",
+                str(self.__command_data.get("cloned_repo_path")),
+                "log",
+                "-z",
+                f"--format={LOG_FORMAT}",
+            ],
+            "raw_output": True,
         }
         return variant
@@ -3,8 +3,10 @@ from typing import Literal, Any, Callable
 from git_tests.helpers.commands.command_protocol import CommandProtocol
 from git_tests.tools.executors.local_executor import (
     LocalExecutionResult,
+    LocalExecutor,
     LocalPexpectExecutor,
 )
+from git_tests.tools.ssh_askpass import get_askpass_env
 
 
 class PushCommand(CommandProtocol):
@@ -12,15 +14,16 @@ class PushCommand(CommandProtocol):
 
     def __init__(
         self,
-        variant: Literal["basic"],
+        variant: Literal["basic", "askpass"],
         command_data: dict[
             Literal["new_branch_name", "server_config", "cloned_repo_path"], Any
         ],
-        executor: LocalPexpectExecutor,
+        executor: LocalPexpectExecutor | LocalExecutor,
     ) -> None:
         """Constructor method for PushCommand.
 
-        executor: Executor instance to use for running the command
+        executor: Executor instance to use for running the command,
+                  LocalPexpectExecutor for "basic", LocalExecutor for "askpass" variant
         command_data: data needed for command execution
         variant: command variant to execute
         """
@@ -37,7 +40,10 @@ class PushCommand(CommandProtocol):
 
     def __get_mapped_variants(self) -> dict[str, Callable]:
         """Returns variant names and their callable methods mapped."""
-        variants = {"basic": self.__get_basic_variant}
+        variants = {
+            "basic": self.__get_basic_variant,
+            "askpass": self.__get_askpass_variant,
+        }
         return variants
 
     def __get_basic_variant(self) -> dict[str, Any]:
@@ -53,3 +59,22 @@ class PushCommand(CommandProtocol):
             "cwd": self.__command_data.get("cloned_repo_path"),
         }
         return variant
+
+    def __get_askpass_variant(self) -> dict[str, Any]:
+        """Variant: askpass for "git push".
+        Password is given by SSH_ASKPASS helper, without pty and prompt handling.
+        """
+        variant = {
+            "command": [
+                "git",
+                "-C",
+                str(self.__command_data.get("cloned_repo_path")),
+                "push",
+                "origin",
+                self.__command_data.get("new_branch_name"),
+            ],
+            "env": get_askpass_env(
+                password=self.__command_data.get("server_config").ansible_password
+            ),
+        }
+        return variant
@@ -1,15 +1,25 @@
 from typing import Literal, Any, Callable
 
 from git_tests.helpers.commands.command_protocol import CommandProtocol
+from git_tests.helpers.porcelain import (
+    ParsedExecutionResult,
+    parse_status,
+)
 from git_tests.tools.executors.local_executor import LocalExecutor, LocalExecutionResult
 
 
 class StatusCommand(CommandProtocol):
-    """Wrapper for "git status" command."""
+    """Wrapper for "git status" command.
+
+    Porcelain variant returns ParsedExecutionResult, with typed output in "parsed"
+    (StatusReport), if the executor returns LocalExecutionResult
+    (e.g. LocalExecutor, LocalStreamingExecutor);
+    AsyncLocalExecutor returns an awaitable of the unparsed result, stdout as bytes.
+    """
 
     def __init__(
         self,
-        variant: Literal["basic"],
+        variant: Literal["basic", "porcelain"],
         command_data: dict[Literal["cloned_repo_path"], Any],
         executor: LocalExecutor,
     ) -> None:
@@ -28,17 +38,49 @@ class StatusCommand(CommandProtocol):
         result = self.__executor.execute(
             **self.__get_mapped_variants()[self.__variant]()
         )
+        parser = self.__get_mapped_parsers().get(self.__variant)
+        if parser and isinstance(result, LocalExecutionResult):
+            result = ParsedExecutionResult.from_result(result, parser)
         return result
 
     def __get_mapped_variants(self) -> dict[str, Callable]:
         """Returns variant names and their callable methods mapped."""
-        variants = {"basic": self.__get_basic_variant}
+        variants = {
+            "basic": self.__get_basic_variant,
+            "porcelain": self.__get_porcelain_variant,
+        }
         return variants
 
+    @staticmethod
+    def __get_mapped_parsers() -> dict[str, Callable[[bytes], Any]]:
+        """Returns variant names and parsers of their output mapped."""
+        parsers = {"porcelain": parse_status}
+        return parsers
+
     def __get_basic_variant(self) -> dict[str, Any]:
         """Variant: basic for "git status"."""
         variant = {
-            "command": "git status",
-            "cwd": self.__command_data.get("cloned_repo_path"),
+            "command": [
+                "git",
+                "-C",
+                str(self.__command_data.get("cloned_repo_path")),
+                "status",
+            ],
+        }
+        return variant
+
+    def __get_porcelain_variant(self) -> dict[str, Any]:
+        """Variant: machine-readable, NUL separated output of "git status"."""
+        variant = {
+            "command": [
+                "git",
+                "-C",
+                str(self.__command_data.get("cloned_repo_path")),
+                "status",
+                "--porcelain=v2",
+                "-z",
+                "--branch",
+            ],
+            "raw_output": True,
         }
         return variant
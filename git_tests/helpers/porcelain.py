@@ -0,0 +1,198 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from git_tests.tools.executors.local_executor import LocalExecutionResult
+
+
+LOG_FORMAT = "%H%x00%h%x00%an%x00%ae%x00%at%x00%s"
+LOG_FIELDS = 6
+
+
+@dataclass(frozen=True, slots=True)
+class LogEntry:
+    """One commit from "git log -z --format=<LOG_FORMAT>".
+
+    Args:
+        commit: full commit hash
+        short_commit: abbreviated commit hash
+        author_name: author name
+        author_email: author email
+        author_time: author date, as unix timestamp
+        subject: first line of the commit message
+    """
+
+    commit: str
+    short_commit: str
+    author_name: str
+    author_email: str
+    author_time: int
+    subject: str
+
+
+@dataclass(frozen=True, slots=True)
+class StatusEntry:
+    """One path from "git status --porcelain=v2 -z".
+
+    Args:
+        kind: entry type: "1" changed, "2" renamed or copied, "u" unmerged,
+            "?" untracked, "!" ignored
+        path: path relative to the repository root
+        xy: staged (X) and unstaged (Y) status, e.g. "A." for a new staged file;
+            empty for untracked and ignored paths
+        orig_path: path before the rename or copy, for "2" entries only
+    """
+
+    kind: str
+    path: str
+    xy: str = ""
+    orig_path: str | None = None
+
+
+@dataclass(slots=True)
+class StatusReport:
+    """Parsed output of "git status --porcelain=v2 -z --branch".
+
+    Args:
+        branch_oid: commit of HEAD, None for a branch without commits
+        branch_head: current branch name, None for detached HEAD
+        upstream: upstream branch name, None if not set
+        ahead: number of commits ahead of upstream
+        behind: number of commits behind upstream
+        entries: changed, untracked and ignored paths, in git order
+    """
+
+    branch_oid: str | None = None
+    branch_head: str | None = None
+    upstream: str | None = None
+    ahead: int = 0
+    behind: int = 0
+    entries: list[StatusEntry] = field(default_factory=list)
+
+    def with_kind(self, kind: str) -> list[StatusEntry]:
+        """Returns entries of the given type, e.g. "?" for untracked paths."""
+        return [entry for entry in self.entries if entry.kind == kind]
+
+
+@dataclass
+class ParsedExecutionResult(LocalExecutionResult):
+    """Result structure for porcelain Command variants.
+
+    stdout and stderr are kept as bytes, as returned by git.
+
+    Args:
+        parsed: typed output of the command, e.g. list[LogEntry] or StatusReport
+    """
+
+    parsed: Any = None
+
+    @classmethod
+    def from_result(
+        cls, result: LocalExecutionResult, parser: Callable[[bytes], Any]
+    ) -> "ParsedExecutionResult":
+        """Parses stdout of the result.
+
+        Args:
+            result: result of a command executed with raw_output
+            parser: function parsing stdout, e.g. parse_log
+        """
+        return cls(
+            args=result.args,
+            rc=result.rc,
+            stdout=result.stdout,
+            stderr=result.stderr,
+            stopped=result.stopped,
+            parsed=parser(result.stdout) if result.rc == 0 else None,
+        )
+
+
+def _decode(value: bytes) -> str:
+    """Decodes one field, keeping not UTF-8 paths round-trippable."""
+    return value.decode("utf-8", "surrogateescape")
+
+
+def parse_log(stdout: bytes) -> list[LogEntry]:
+    """Parses "git log -z --format=<LOG_FORMAT>" output in one pass.
+
+    Every field and every commit is terminated by NUL, so the output is split once
+    and every field is decoded once.
+
+    Args:
+        stdout: raw output of the command
+    """
+    fields = stdout.split(b"\0")
+    if fields and not fields[-1]:
+        fields.pop()
+    if len(fields) % LOG_FIELDS:
+        raise ValueError(f"Unexpected git log output, {len(fields)} fields")
+    return [
+        LogEntry(
+            commit=_decode(fields[index]),
+            short_commit=_decode(fields[index + 1]),
+            author_name=_decode(fields[index + 2]),
+            author_email=_decode(fields[index + 3]),
+            author_time=int(fields[index + 4]),
+            subject=_decode(fields[index + 5]),
+        )
+        for index in range(0, len(fields), LOG_FIELDS)
+    ]
+
+
+def parse_status(stdout: bytes) -> StatusReport:
+    """Parses "git status --porcelain=v2 -z --branch" output in one pass.
+
+    Records are terminated by NUL. Paths are the last field of a record, so they
+    may contain spaces; rename and copy records are followed by the original path.
+
+    Args:
+        stdout: raw output of the command
+    """
+    report = StatusReport()
+    records = iter(stdout.split(b"\0"))
+    for record in records:
+        if not record:
+            continue
+        kind = record[:1]
+        if kind == b"#":
+            _parse_status_header(report, _decode(record))
+        elif kind == b"1":
+            parts = record.split(b" ", 8)
+            report.entries.append(
+                StatusEntry(kind="1", path=_decode(parts[8]), xy=_decode(parts[1]))
+            )
+        elif kind == b"2":
+            parts = record.split(b" ", 9)
+            report.entries.append(
+                StatusEntry(
+                    kind="2",
+                    path=_decode(parts[9]),
+                    xy=_decode(parts[1]),
+                    orig_path=_decode(next(records)),
+                )
+            )
+        elif kind == b"u":
+            parts = record.split(b" ", 10)
+            report.entries.append(
+                StatusEntry(kind="u", path=_decode(parts[10]), xy=_decode(parts[1]))
+            )
+        elif kind in (b"?", b"!"):
+            report.entries.append(
+                StatusEntry(kind=_decode(kind), path=_decode(record[2:]))
+            )
+        else:
+            raise ValueError(f"Unexpected git status record: {record!r}")
+    return report
+
+
+def _parse_status_header(report: StatusReport, header: str) -> None:
+    """Fills branch information of the report from one "# branch.*" header."""
+    _, name, value = header.split(" ", 2)
+    if name == "branch.oid":
+        report.branch_oid = None if value == "(initial)" else value
+    elif name == "branch.head":
+        report.branch_head = None if value == "(detached)" else value
+    elif name == "branch.upstream":
+        report.upstream = value
+    elif name == "branch.ab":
+        ahead, behind = value.split(" ")
+        report.ahead = int(ahead)
+        report.behind = -int(behind)
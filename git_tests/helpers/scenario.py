@@ -0,0 +1,389 @@
+import re
+import time
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Type, TypeVar
+
+from git_tests.helpers.commands.command_protocol import CommandProtocol
+from git_tests.tools.executors.local_batch_executor import (
+    LocalBatchExecutor,
+    LocalCommandRecorder,
+    RecordedCommand,
+)
+from git_tests.tools.executors.local_executor import (
+    LocalExecutionResult,
+    LocalExecutor,
+)
+
+
+TypeScenario = TypeVar("TypeScenario", bound="Scenario")
+
+
+@dataclass
+class ScenarioStep:
+    """One step of the Scenario: Command with its expectations.
+
+    Args:
+        name: unique name of the step
+        command: Command class, e.g. StatusCommand
+        variant: command variant to execute
+        command_data: data needed for command execution
+        executor: executor for the command; None means LocalExecutor,
+            and such steps can be merged into one process launch
+        expect_rc: expected return code, None for any
+        stdout_contains: strings expected in stdout
+        stdout_matches: regular expression expected to be found in stdout
+        depends_on: names of steps which must pass first
+    """
+
+    name: str
+    command: Type[CommandProtocol]
+    variant: str
+    command_data: dict[str, Any]
+    executor: Any = None
+    expect_rc: int | None = 0
+    stdout_contains: tuple[str, ...] = ()
+    stdout_matches: str | None = None
+    depends_on: tuple[str, ...] = ()
+
+    @property
+    def local(self) -> bool:
+        """Checks if the step can be run by LocalBatchExecutor."""
+        return self.executor is None or isinstance(self.executor, LocalExecutor)
+
+    @property
+    def checks_output(self) -> bool:
+        """Checks if the step has expectations on stdout, which are verified
+        only after its batch ends, so no dependent step may be merged after it.
+        """
+        return bool(self.stdout_contains or self.stdout_matches)
+
+    def record(self) -> RecordedCommand:
+        """Returns command of the step, without running it."""
+        return self.command(
+            variant=self.variant,
+            command_data=self.command_data,
+            executor=LocalCommandRecorder(),
+        ).run()
+
+    def run(self) -> LocalExecutionResult:
+        """Runs command of the step with its executor."""
+        return self.command(
+            variant=self.variant,
+            command_data=self.command_data,
+            executor=self.executor or LocalExecutor(),
+        ).run()
+
+    def check(self, result: LocalExecutionResult) -> list[str]:
+        """Returns list of not met expectations."""
+        failures = []
+        if self.expect_rc is not None and result.rc != self.expect_rc:
+            failures.append(f"rc is {result.rc}, expected {self.expect_rc}")
+        for expected in self.stdout_contains:
+            if expected not in str(result.stdout):
+                failures.append(f"stdout does not contain {expected!r}")
+        if self.stdout_matches and not re.search(
+            self.stdout_matches, str(result.stdout)
+        ):
+            failures.append(f"stdout does not match {self.stdout_matches!r}")
+        return failures
+
+
+@dataclass
+class ScenarioStepResult:
+    """Result of one ScenarioStep.
+
+    Args:
+        name: name of the step
+        result: result of the command, None if the step was not executed
+        seconds: execution time of the command, None if not executed or not measured
+        batch: index of the plan batch the step was executed in
+        failures: not met expectations, or the reason why the step was not executed
+    """
+
+    name: str
+    result: LocalExecutionResult | None
+    seconds: float | None
+    batch: int
+    failures: list[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return self.result is not None and not self.failures
+
+
+@dataclass
+class ScenarioResult:
+    """Result of the whole Scenario.
+
+    Args:
+        name: name of the scenario
+        steps: results of all steps, by step name, in declaration order
+        duration: total duration, in seconds
+    """
+
+    name: str
+    steps: dict[str, ScenarioStepResult] = field(default_factory=dict)
+    duration: float = 0.0
+
+    @property
+    def passed(self) -> bool:
+        return all(step.passed for step in self.steps.values())
+
+    @property
+    def failures(self) -> dict[str, list[str]]:
+        """Not met expectations of every failed step."""
+        return {
+            name: step.failures for name, step in self.steps.items() if step.failures
+        }
+
+    def summary(self) -> list[str]:
+        """Human-readable lines: every step with its batch, time and status."""
+        lines = [f"Scenario {self.name}: {self.duration:.3f}s"]
+        for name, step in self.steps.items():
+            seconds = "-" if step.seconds is None else f"{step.seconds:.3f}s"
+            status = "passed" if step.passed else "; ".join(step.failures)
+            lines.append(f"  [{step.batch}] {name}: {seconds}, {status}")
+        return lines
+
+
+@dataclass
+class ScenarioBatch:
+    """Steps executed together, in one process launch if they are local.
+
+    Args:
+        steps: steps in execution order
+        depends_on: indexes of batches which must pass first
+    """
+
+    steps: list[ScenarioStep]
+    depends_on: set[int] = field(default_factory=set)
+
+    @property
+    def local(self) -> bool:
+        return all(step.local for step in self.steps)
+
+
+class ScenarioPlan:
+    """Compiled Scenario: dependency graph of ScenarioBatches."""
+
+    def __init__(self, name: str, batches: list[ScenarioBatch]) -> None:
+        """Constructor method for ScenarioPlan.
+
+        Args:
+            name: name of the scenario
+            batches: batches, each depending on earlier ones only
+        """
+        self.name = name
+        self.batches = batches
+        self.__batch_executor = LocalBatchExecutor()
+
+    def describe(self) -> list[str]:
+        """Human-readable lines: batches with their steps and dependencies."""
+        return [
+            f"[{index}] {'local' if batch.local else 'single'}: "
+            f"{', '.join(step.name for step in batch.steps)}"
+            + (f" (after {sorted(batch.depends_on)})" if batch.depends_on else "")
+            for index, batch in enumerate(self.batches)
+        ]
+
+    def run(self, max_workers: int = 4) -> ScenarioResult:
+        """Runs all batches, independent ones concurrently.
+        Batches depending on a failed one are not executed.
+
+        Args:
+            max_workers: maximum number of batches executed at once
+        """
+        result = ScenarioResult(name=self.name)
+        batch_results: dict[int, list[ScenarioStepResult]] = {}
+        waiting = set(range(len(self.batches)))
+        running: dict[Future, int] = {}
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while waiting or running:
+                for index in sorted(waiting):
+                    batch = self.batches[index]
+                    if not batch.depends_on.issubset(batch_results):
+                        continue
+                    waiting.remove(index)
+                    if all(
+                        step_result.passed
+                        for dependency in batch.depends_on
+                        for step_result in batch_results[dependency]
+                    ):
+                        running[pool.submit(self.__run_batch, index)] = index
+                    else:
+                        batch_results[index] = [
+                            ScenarioStepResult(
+                                name=step.name,
+                                result=None,
+                                seconds=None,
+                                batch=index,
+                                failures=["not executed, dependency failed"],
+                            )
+                            for step in batch.steps
+                        ]
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch_results[running.pop(future)] = future.result()
+
+        step_results = {
+            step_result.name: step_result
+            for index in sorted(batch_results)
+            for step_result in batch_results[index]
+        }
+        for batch in self.batches:
+            for step in batch.steps:
+                result.steps[step.name] = step_results[step.name]
+        result.duration = time.perf_counter() - started
+        return result
+
+    def __run_batch(self, index: int) -> list[ScenarioStepResult]:
+        """Runs one batch: local steps in one process, other step with its executor."""
+        batch = self.batches[index]
+        if not batch.local:
+            step = batch.steps[0]
+            start = time.perf_counter()
+            step_result = step.run()
+            return [
+                ScenarioStepResult(
+                    name=step.name,
+                    result=step_result,
+                    seconds=time.perf_counter() - start,
+                    batch=index,
+                    failures=step.check(step_result),
+                )
+            ]
+
+        batch_results = self.__batch_executor.execute_batch(
+            [step.record() for step in batch.steps],
+            expected_rcs=[step.expect_rc for step in batch.steps],
+        )
+        results = []
+        for step, batch_result in zip(batch.steps, batch_results):
+            if batch_result.executed:
+                failures = step.check(batch_result.result)
+            else:
+                failures = ["not executed, previous step failed"]
+            results.append(
+                ScenarioStepResult(
+                    name=step.name,
+                    result=batch_result.result,
+                    seconds=batch_result.seconds,
+                    batch=index,
+                    failures=failures,
+                )
+            )
+        return results
+
+
+class Scenario:
+    """Declarative scenario of git commands, built step by step:
+        result = (
+            Scenario("commit verification")
+            .step("status", StatusCommand, variant="basic", command_data={...},
+                  stdout_contains=["nothing to commit"])
+            .step("log", LogCommand, variant="basic", command_data={...},
+                  stdout_matches=r"[a-zA-Z0-9]{7} message")
+            .compile()
+            .run()
+        )
+
+    By default, step depends on the previous one. Steps with depends_on=()
+    are independent and run concurrently with others.
+    Consecutive local steps of a chain are merged into one process launch.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Constructor method for Scenario.
+
+        Args:
+            name: name of the scenario, used in reports
+        """
+        self.name = name
+        self.steps: list[ScenarioStep] = []
+
+    def step(
+        self,
+        name: str,
+        command: Type[CommandProtocol],
+        variant: str,
+        command_data: dict[str, Any],
+        executor: Any = None,
+        expect_rc: int | None = 0,
+        stdout_contains: list[str] | tuple[str, ...] = (),
+        stdout_matches: str | None = None,
+        depends_on: list[str] | tuple[str, ...] | None = None,
+    ) -> TypeScenario:
+        """Adds step to the scenario. See ScenarioStep for arguments.
+        depends_on=None means dependency on the previous step.
+
+        Returns:
+            the same Scenario, for chaining
+        """
+        if any(step.name == name for step in self.steps):
+            raise ValueError(f"Step {name} already exists")
+        if depends_on is None:
+            depends_on = (self.steps[-1].name,) if self.steps else ()
+        unknown = set(depends_on) - {step.name for step in self.steps}
+        if unknown:
+            raise ValueError(f"Step {name} depends on unknown steps {unknown}")
+
+        self.steps.append(
+            ScenarioStep(
+                name=name,
+                command=command,
+                variant=variant,
+                command_data=command_data,
+                executor=executor,
+                expect_rc=expect_rc,
+                stdout_contains=tuple(stdout_contains),
+                stdout_matches=stdout_matches,
+                depends_on=tuple(depends_on),
+            )
+        )
+        return self
+
+    def compile(self) -> ScenarioPlan:
+        """Compiles steps into the ScenarioPlan.
+
+        Local step is appended to the batch of its only dependency,
+        if that dependency is the last step of a local batch, both use the same env
+        and the dependency has no stdout expectations (the batch stops early only
+        on an unexpected rc). Every other step starts a new batch.
+        """
+        batches: list[ScenarioBatch] = []
+        batch_of_step: dict[str, int] = {}
+        recorded_env: dict[str, Any] = {}
+
+        for step in self.steps:
+            if step.local:
+                recorded_env[step.name] = step.record().env
+
+            if len(step.depends_on) == 1 and step.local:
+                dependency = step.depends_on[0]
+                batch_index = batch_of_step[dependency]
+                batch = batches[batch_index]
+                if (
+                    batch.local
+                    and batch.steps[-1].name == dependency
+                    and not batch.steps[-1].checks_output
+                    and recorded_env[dependency] == recorded_env[step.name]
+                ):
+                    batch.steps.append(step)
+                    batch_of_step[step.name] = batch_index
+                    continue
+
+            batches.append(
+                ScenarioBatch(
+                    steps=[step],
+                    depends_on={batch_of_step[name] for name in step.depends_on},
+                )
+            )
+            batch_of_step[step.name] = len(batches) - 1
+        return ScenarioPlan(name=self.name, batches=batches)
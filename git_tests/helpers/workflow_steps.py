@@ -0,0 +1,136 @@
+from pathlib import Path
+
+from git_tests.helpers.commands.add_command import AddCommand
+from git_tests.helpers.commands.checkout_command import CheckoutCommand
+from git_tests.helpers.commands.commit_command import CommitCommand
+from git_tests.helpers.commands.composite_command import CompositeCommand
+from git_tests.helpers.commands.config_command import ConfigCommand
+from git_tests.tools.executors.local_batch_executor import (
+    LocalBatchExecutor,
+    LocalCommandRecorder,
+)
+from git_tests.tools.executors.local_executor import (
+    LocalExecutionResult,
+    LocalExecutor,
+)
+from git_tests.tools.workflow_state_tree import WorkflowStep
+
+
+class WorkflowSteps:
+    """Helper class with WorkflowSteps of the tested git workflow.
+    Test classes declare the state they need as a tuple of these steps.
+    """
+
+    local_executor = LocalExecutor()
+    local_batch_executor = LocalBatchExecutor()
+
+    @classmethod
+    def checkout_branch(cls, branch_name: str) -> WorkflowStep:
+        """Step: "git checkout -b <branch>".
+
+        Args:
+            branch_name: name of the new branch
+        """
+
+        def apply(repo_path: Path) -> None:
+            cls.__check(
+                CheckoutCommand(
+                    variant="branch",
+                    command_data={
+                        "branch_name": branch_name,
+                        "cloned_repo_path": repo_path,
+                    },
+                    executor=cls.local_executor,
+                ).run()
+            )
+
+        return WorkflowStep(key=f"checkout -b {branch_name}", apply=apply)
+
+    @classmethod
+    def create_file(cls, file_name: str) -> WorkflowStep:
+        """Step: new empty file in the working tree.
+
+        Args:
+            file_name: name of the file, relative to the repository
+        """
+
+        def apply(repo_path: Path) -> None:
+            Path(repo_path, file_name).touch()
+
+        return WorkflowStep(key=f"touch {file_name}", apply=apply)
+
+    @classmethod
+    def add_file(cls, file_name: str) -> WorkflowStep:
+        """Step: "git add <file>".
+
+        Args:
+            file_name: name of the file, relative to the repository
+        """
+
+        def apply(repo_path: Path) -> None:
+            cls.__check(
+                AddCommand(
+                    variant="basic",
+                    command_data={
+                        "new_file_path": Path(repo_path, file_name),
+                        "cloned_repo_path": repo_path,
+                    },
+                    executor=cls.local_executor,
+                ).run()
+            )
+
+        return WorkflowStep(key=f"add {file_name}", apply=apply)
+
+    @classmethod
+    def configure_user(cls) -> WorkflowStep:
+        """Step: user name and email in the local git config."""
+
+        def apply(repo_path: Path) -> None:
+            cls.__check(
+                CompositeCommand(
+                    variant="stop_on_failure",
+                    command_data={
+                        "commands": [
+                            ConfigCommand(
+                                variant=variant,
+                                command_data={"cloned_repo_path": repo_path},
+                                executor=LocalCommandRecorder(),
+                            )
+                            for variant in ("user", "email")
+                        ]
+                    },
+                    executor=cls.local_batch_executor,
+                ).run()
+            )
+
+        return WorkflowStep(key="config user.name user.email", apply=apply)
+
+    @classmethod
+    def commit(cls, commit_message: str) -> WorkflowStep:
+        """Step: "git commit -m <message>".
+
+        Args:
+            commit_message: message of the commit
+        """
+
+        def apply(repo_path: Path) -> None:
+            cls.__check(
+                CommitCommand(
+                    variant="basic",
+                    command_data={
+                        "commit_message": commit_message,
+                        "cloned_repo_path": repo_path,
+                    },
+                    executor=cls.local_executor,
+                ).run()
+            )
+
+        return WorkflowStep(key=f"commit -m {commit_message}", apply=apply)
+
+    @staticmethod
+    def __check(result: LocalExecutionResult) -> None:
+        """Raises if the command of a step failed."""
+        if result.rc != 0:
+            raise RuntimeError(
+                f"Workflow step failed: {result.args}\n{result.stdout}\n{result.stderr}"
+            )
@@ -0,0 +1,73 @@
+"""Multi-git-version matrix: runs the test suite or the benchmarks against several git versions.
+
+Sources are git binaries, installation prefixes or source tarballs already present
+locally; tarballs are built once and cached in TMP_GIT_BUILDS. Every version runs
+in parallel, in its own pytest process with isolated PATH, workspace and local
+stand-in of the git server. Prints version x test tables of outcomes and timings,
+writes them to TMP_GIT_MATRIX/matrix_results.json and exits with 1 if any run failed.
+
+Usage:
+    python -m git_tests.matrix /usr/bin/git /opt/git-2.30.0 git-2.43.0.tar.xz
+    python -m git_tests.matrix --mode benchmarks git-2.42.0.tar.xz git-2.43.0.tar.xz \\
+        -- -k StatusCommand
+"""
+import argparse
+import sys
+
+from pathlib import Path
+
+from git_tests.config import PathsConfig
+from git_tests.tools.git_version_matrix import GitBuildCache, GitVersionMatrix
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "sources",
+        type=Path,
+        nargs="+",
+        help="git binaries, installation prefixes or source tarballs",
+    )
+    parser.add_argument("--mode", choices=["tests", "benchmarks"], default="tests")
+    parser.add_argument(
+        "--parallel", type=int, default=None, help="versions run at the same time"
+    )
+    parser.add_argument("--base-port", type=int, default=2222)
+    parser.add_argument(
+        "--jobs", type=int, default=None, help="parallel make jobs of tarball builds"
+    )
+    arguments = sys.argv[1:]
+    pytest_args = []
+    if "--" in arguments:
+        # everything after "--" is passed to pytest
+        pytest_args = arguments[arguments.index("--") + 1 :]
+        arguments = arguments[: arguments.index("--")]
+    options = parser.parse_args(arguments)
+
+    paths_config = PathsConfig()
+    build_cache = GitBuildCache(paths_config.git_builds_dir, jobs=options.jobs)
+    try:
+        builds = [build_cache.prepare(source) for source in options.sources]
+    except (OSError, ValueError, RuntimeError) as error:
+        print(f"Cannot prepare git: {error}", file=sys.stderr)
+        return 2
+    for build in builds:
+        print(f"git {build.version}: {build.prefix} (from {build.source})")
+
+    matrix = GitVersionMatrix(
+        builds=builds,
+        base_dir=paths_config.base_dir,
+        work_dir=paths_config.git_matrix_dir,
+        mode=options.mode,
+        pytest_args=tuple(pytest_args),
+        parallel=options.parallel,
+        base_port=options.base_port,
+    )
+    result = matrix.run()
+    result.write(Path(paths_config.git_matrix_dir, "matrix_results.json"))
+    print("\n".join(result.summary()))
+    return 0 if result.successful else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,15 @@
-import re
 import shutil
 
 import pytest
 
 from pathlib import Path
-from re import Match
 
 from grappa import should
 
 from git_tests.config import PathsConfig, SingleGitServerConfig, Inventory
-from git_tests.tools.executors.local_executor import (
-    LocalExecutor,
-    LocalExecutionResult,
-    LocalPexpectExecutor,
-)
-from git_tests.helpers.commands.clone_command import CloneCommand
+from git_tests.tools.executors.local_executor import LocalExecutor
 from git_tests.helpers.commands.add_command import AddCommand
+from git_tests.helpers.porcelain import StatusEntry, StatusReport
 from git_tests.helpers.commands.status_command import StatusCommand
 
 
@@ -25,13 +19,12 @@ class TestAdd:
     """Verification of git add command."""
 
     local_executor = LocalExecutor()
-    local_pexpect_executor = LocalPexpectExecutor()
     paths_config = PathsConfig()
     inventory_config = Inventory()
     single_git_server_config = SingleGitServerConfig()
     server_config = inventory_config.get(single_git_server_config.host_name)
 
-    local_test_dir_path = Path(paths_config.base_dir, "TMP_TEST_ADD")
+    local_test_dir_path = Path(paths_config.workspace_dir, "TMP_TEST_ADD")
 
     cloned_repo_path = Path(
         local_test_dir_path, single_git_server_config.test_repo_name
@@ -54,17 +47,10 @@ class TestAdd:
         new_file_path.touch()
         new_file_path.is_file() | should.be.true
 
-        # TODO: may be unstable, need to find a better way, starting with cleaning the output
-        result_status = self._run_status()
-        status_info = re.search(
-            (
-                r".*(Untracked files:\\n\s+\("
-                r"use \"git add <file>...\" to include in "
-                rf"what will be committed\)\\n\\t{new_file_path.name})"
-            ),
-            result_status.stdout,
+        status_report = self._run_status()
+        status_report.entries | should.be.equal.to(
+            [StatusEntry(kind="?", path=new_file_path.name)]
         )
-        isinstance(status_info, Match) | should.be.true
 
         result_add = AddCommand(
             variant="basic",
@@ -76,47 +62,36 @@ class TestAdd:
         ).run()
         result_add.rc | should.be.equal.to(0)
 
-        result_status = self._run_status()
-        status_info = re.search(
-            (
-                r".*(Changes to be committed:\\n\s+"
-                r"\(use \"git rm --cached <file>...\" to unstage\)\\n\\t"
-                rf"new file:\s+{new_file_path.name})"
-            ),
-            result_status.stdout,
-        )
-        isinstance(status_info, Match) | should.be.true
+        status_report = self._run_status()
+        status_report.entries | should.have.length.of(1)
+        status_report.entries[0].kind | should.be.equal.to("1")
+        status_report.entries[0].xy | should.be.equal.to("A.")
+        status_report.entries[0].path | should.be.equal.to(new_file_path.name)
 
-    def _run_status(self) -> LocalExecutionResult:
-        """Runs "Git status" command."""
+    def _run_status(self) -> StatusReport:
+        """Runs "Git status" command, returns its parsed porcelain output."""
         result_status = StatusCommand(
-            variant="basic",
+            variant="porcelain",
             command_data={"cloned_repo_path": self.cloned_repo_path},
             executor=self.local_executor,
         ).run()
         result_status.rc | should.be.equal.to(0)
-        return result_status
+        return result_status.parsed
 
     @pytest.fixture(scope="class", autouse=True)
-    def handle_directory(self):
+    def handle_directory(self, workflow_state_tree):
         """Setup/Teardown fixture.
         Creates and deletes directory for the test.
-        Runs git clone command.
+        Gets fresh clone of the server repository from the workflow state tree.
         """
         if self.local_test_dir_path.exists():
             shutil.rmtree(self.local_test_dir_path)
-        self.local_test_dir_path.mkdir()
+        self.local_test_dir_path.mkdir(parents=True)
 
-        clone_command = CloneCommand(
-            variant="basic",
-            command_data={
-                "server_config": self.server_config,
-                "single_git_server_config": self.single_git_server_config,
-                "cloned_repo_path": self.cloned_repo_path,
-            },
-            executor=self.local_pexpect_executor,
-        ).run()
-        clone_command.rc | should.be.equal.to(0)
+        workflow_state_tree.fork(
+            (), self.cloned_repo_path, label=self.__class__.__name__
+        )
+        self.cloned_repo_path.is_dir() | should.be.true
 
         yield
 
@@ -0,0 +1,181 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from grappa import should
+
+from git_tests.tools.executors.ansible_executor import (
+    AnsibleExecutorProtocol,
+    AnsibleExecutorResult,
+    AnsibleResultStats,
+)
+from git_tests.tools.executors.ansible_scheduler import (
+    AnsibleDagScheduler,
+    ProvisioningGraph,
+    ProvisioningNode,
+)
+
+
+class FakeAnsibleExecutor(AnsibleExecutorProtocol):
+    """AnsibleExecutor stand-in: "plays" a Playbook by sleeping,
+    records played hosts and the highest number of Playbooks played at once.
+    """
+
+    def __init__(self, durations: dict[str, float], failing: set[str]) -> None:
+        """Constructor method for FakeAnsibleExecutor.
+
+        Args:
+            durations: seconds of every play, by host
+            failing: hosts whose play fails
+        """
+        self.__durations = durations
+        self.__failing = failing
+        self.__lock = threading.Lock()
+        self.__running = 0
+        self.max_running = 0
+        self.played: list[str] = []
+
+    def execute(
+        self, playbook: Path, inventory: Path, limit: str | None = None
+    ) -> AnsibleExecutorResult:
+        with self.__lock:
+            self.__running += 1
+            self.max_running = max(self.max_running, self.__running)
+            self.played.append(limit)
+        time.sleep(self.__durations.get(limit, 0.0))
+        with self.__lock:
+            self.__running -= 1
+        return AnsibleExecutorResult(
+            status="failed" if limit in self.__failing else "successful",
+            stats=AnsibleResultStats({}, {}, {}, {}, {}, {}, {}, {}),
+        )
+
+
+@pytest.mark.order(18)
+class TestAnsibleDagScheduler:
+    """Verification of ProvisioningGraph and its scheduling with AnsibleDagScheduler."""
+
+    inventory = Path("inventory.ini")
+
+    def test_graph_validation(self):
+        """
+        Given:
+            - nodes depending on each other in a cycle
+            - node depending on a not existing one
+        When:
+            - graphs are created from them
+        Then:
+            - both are rejected with ValueError
+        """
+        with pytest.raises(ValueError, match="Dependency cycle"):
+            ProvisioningGraph(
+                [
+                    self._get_node("a", depends_on=("c",)),
+                    self._get_node("b", depends_on=("a",)),
+                    self._get_node("c", depends_on=("b",)),
+                ]
+            )
+        with pytest.raises(ValueError, match="unknown"):
+            ProvisioningGraph([self._get_node("a", depends_on=("missing",))])
+
+    def test_subgraph_drops_dependencies_on_removed_nodes(self):
+        """
+        Given:
+            - chain of nodes: a -> b -> c
+        When:
+            - subgraph of b and c is created
+        Then:
+            - it has b without dependencies and c still depending on b
+        """
+        graph = ProvisioningGraph(
+            [
+                self._get_node("a"),
+                self._get_node("b", depends_on=("a",)),
+                self._get_node("c", depends_on=("b",)),
+            ]
+        )
+
+        subgraph = graph.subgraph(["b", "c"])
+
+        sorted(subgraph.nodes) | should.be.equal.to(["b", "c"])
+        subgraph.nodes["b"].depends_on | should.be.equal.to(())
+        subgraph.nodes["c"].depends_on | should.be.equal.to(("b",))
+
+    def test_parallel_nodes_and_critical_path(self):
+        """
+        Given:
+            - two independent nodes, a slow and a quick one, and a node depending on both
+        When:
+            - graph is played
+        Then:
+            - independent nodes are played at once, the dependent one after them
+            - critical path goes through the slow node
+        """
+        executor = FakeAnsibleExecutor(
+            durations={"slow": 0.3, "quick": 0.05, "last": 0.05}, failing=set()
+        )
+        graph = ProvisioningGraph(
+            [
+                self._get_node("slow"),
+                self._get_node("quick"),
+                self._get_node("last", depends_on=("quick", "slow")),
+            ]
+        )
+
+        result = AnsibleDagScheduler(ansible_executor=executor).execute(
+            graph=graph, inventory=self.inventory
+        )
+
+        result.successful | should.be.true
+        executor.max_running | should.be.equal.to(2)
+        executor.played[-1] | should.be.equal.to("last")
+        (result.nodes["last"].start >= result.nodes["slow"].end) | should.be.true
+        result.critical_path | should.be.equal.to(["slow", "last"])
+        result.summary()[-1] | should.be.equal.to("Critical path: slow -> last")
+
+    def test_dependents_of_failed_node_are_skipped(self):
+        """
+        Given:
+            - chain failing -> dependent -> transitive, and an independent node
+        When:
+            - graph is played and the first node of the chain fails
+        Then:
+            - dependent and transitive nodes are skipped, without being played
+            - the independent node is played with success
+        """
+        executor = FakeAnsibleExecutor(durations={}, failing={"failing"})
+        graph = ProvisioningGraph(
+            [
+                self._get_node("failing"),
+                self._get_node("dependent", depends_on=("failing",)),
+                self._get_node("transitive", depends_on=("dependent",)),
+                self._get_node("independent"),
+            ]
+        )
+
+        result = AnsibleDagScheduler(ansible_executor=executor).execute(
+            graph=graph, inventory=self.inventory
+        )
+
+        result.successful | should.be.false
+        {name: node.status for name, node in result.nodes.items()} | should.be.equal.to(
+            {
+                "failing": "failed",
+                "dependent": "skipped",
+                "transitive": "skipped",
+                "independent": "successful",
+            }
+        )
+        sorted(executor.played) | should.be.equal.to(["failing", "independent"])
+        result.nodes["dependent"].executor_result | should.be.none
+
+    @staticmethod
+    def _get_node(name: str, depends_on: tuple[str, ...] = ()) -> ProvisioningNode:
+        """Node with the host named the same as the node."""
+        return ProvisioningNode(
+            name=name,
+            playbook=Path(f"{name}.yaml"),
+            host=name,
+            depends_on=depends_on,
+        )
@@ -0,0 +1,120 @@
+import pytest
+from grappa import should
+
+from git_tests.tools.executors.ansible_executor import (
+    AnsibleTaskTiming,
+    AnsibleTaskTimingCollector,
+    get_slowest_tasks_summary,
+)
+
+
+@pytest.mark.order(17)
+class TestAnsibleTaskTimingCollector:
+    """Verification of task timings collected from Ansible Runner events."""
+
+    def test_start_and_outcome_pairing(self):
+        """
+        Given:
+            - events of one task on two hosts, interleaved,
+              and an outcome of a task which was never started
+        When:
+            - events are handled by the collector
+        Then:
+            - every host gets its own timing, from its start to its outcome
+            - outcome without start is ignored
+            - every event is kept for the artifacts
+        """
+        collector = AnsibleTaskTimingCollector()
+        events = [
+            self._get_event("runner_on_start", "task-1", "server", "00:00:01"),
+            self._get_event("runner_on_start", "task-1", "tests", "00:00:02"),
+            self._get_event("runner_on_ok", "task-1", "tests", "00:00:05"),
+            self._get_event("runner_on_failed", "task-1", "server", "00:00:09"),
+            self._get_event("runner_on_ok", "task-2", "server", "00:00:10"),
+        ]
+
+        [collector.handle_event(event) for event in events] | should.be.equal.to(
+            [True] * 5
+        )
+
+        [
+            (timing.host, timing.duration, timing.outcome)
+            for timing in collector.timings
+        ] | should.be.equal.to([("tests", 3.0, "ok"), ("server", 8.0, "failed")])
+        collector.timings[0].playbook | should.be.equal.to("install_git.yaml")
+        collector.timings[0].task | should.be.equal.to("task task-1")
+
+    @pytest.mark.parametrize(
+        "event_name, changed, outcome",
+        [
+            ("runner_on_ok", True, "changed"),
+            ("runner_on_ok", False, "ok"),
+            ("runner_on_skipped", False, "skipped"),
+            ("runner_on_unreachable", False, "unreachable"),
+        ],
+    )
+    def test_outcome(self, event_name: str, changed: bool, outcome: str):
+        """
+        Given:
+            - started task
+        When:
+            - its result event comes, with or without a change
+        Then:
+            - timing has the outcome of the event, ok with a change is "changed"
+        """
+        collector = AnsibleTaskTimingCollector()
+        collector.handle_event(
+            self._get_event("runner_on_start", "task-1", "server", "00:00:01")
+        )
+        collector.handle_event(
+            self._get_event(event_name, "task-1", "server", "00:00:02", changed)
+        )
+
+        [timing.outcome for timing in collector.timings] | should.be.equal.to([outcome])
+
+    def test_slowest_tasks_summary(self):
+        """
+        Given:
+            - timings of three tasks with different durations
+        When:
+            - summary of the two slowest is created
+        Then:
+            - it has the two slowest tasks, slowest first
+        """
+        timings = [
+            AnsibleTaskTiming(
+                playbook="server_config.yaml",
+                play="Server Configuration",
+                task=f"task {duration}",
+                host="server",
+                start=100.0,
+                end=100.0 + duration,
+                outcome="ok",
+            )
+            for duration in (1.5, 12.25, 3.0)
+        ]
+
+        get_slowest_tasks_summary(timings, limit=2) | should.be.equal.to(
+            [
+                "  12.25s  ok          server: server_config.yaml / task 12.25",
+                "   3.00s  ok          server: server_config.yaml / task 3.0",
+            ]
+        )
+
+    @staticmethod
+    def _get_event(
+        event_name: str, task_uuid: str, host: str, time: str, changed: bool = False
+    ) -> dict:
+        """Ansible Runner event, with fields used by the collector only."""
+        return {
+            "event": event_name,
+            "created": f"2024-01-01T{time}.000000",
+            "event_data": {
+                "task_uuid": task_uuid,
+                "host": host,
+                "playbook": "/playbooks/install_git.yaml",
+                "play": "Install Git",
+                "task": f"task {task_uuid}",
+                "res": {"changed": changed},
+            },
+        }
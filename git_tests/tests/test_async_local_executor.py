@@ -0,0 +1,96 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from grappa import should
+
+from git_tests.helpers.commands.log_command import LogCommand
+from git_tests.helpers.commands.status_command import StatusCommand
+from git_tests.tools.executors.async_local_executor import AsyncLocalExecutor
+
+
+class CountingAsyncLocalExecutor(AsyncLocalExecutor):
+    """AsyncLocalExecutor which records the highest number of running executions.
+    Every execution is held a little longer, so the limited ones surely overlap.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.running = 0
+        self.max_running = 0
+
+    async def execute(self, *args, **kwargs):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(0.05)
+            return await super().execute(*args, **kwargs)
+        finally:
+            self.running -= 1
+
+
+@pytest.mark.order(13)
+class TestAsyncLocalExecutor:
+    """Verification of concurrent Command execution with AsyncLocalExecutor."""
+
+    @pytest.mark.parametrize("limit", [None, 1, 3])
+    def test_run_all_respects_limit(self, committed_repository: Path, limit: int):
+        """
+        Given:
+            - local repository with one commit
+            - AsyncLocalExecutor with concurrency limit of 2
+        When:
+            - 8 StatusCommand and LogCommand runs are executed with run_all(),
+              with the default limit or the given one
+        Then:
+            - no more executions than the limit run at once, and the limit is reached
+            - results are in the order of the executions and all succeed
+        """
+        executor = CountingAsyncLocalExecutor(concurrency_limit=2)
+        command_data = {"cloned_repo_path": committed_repository}
+        commands = [
+            command_class(variant="basic", command_data=command_data, executor=executor)
+            for command_class in (StatusCommand, LogCommand) * 4
+        ]
+
+        results = executor.run_all([command.run() for command in commands], limit=limit)
+
+        executor.max_running | should.be.equal.to(limit or 2)
+        [result.rc for result in results] | should.be.equal.to([0] * 8)
+        [result.args[3] for result in results] | should.be.equal.to(
+            ["status", "log"] * 4
+        )
+        results[1].stdout | should.contain("initial")
+
+    def test_failed_command_result(self, committed_repository: Path):
+        """
+        Given:
+            - AsyncLocalExecutor
+        When:
+            - StatusCommand is run in a directory which is not a repository,
+              together with one in a repository
+        Then:
+            - failed command has its own non-zero rc and error, the other succeeds
+        """
+        executor = AsyncLocalExecutor()
+        not_repository = Path(committed_repository.parent, "not_repository")
+        not_repository.mkdir()
+
+        failed, succeeded = executor.run_all(
+            [
+                StatusCommand(
+                    variant="basic",
+                    command_data={"cloned_repo_path": not_repository},
+                    executor=executor,
+                ).run(),
+                StatusCommand(
+                    variant="basic",
+                    command_data={"cloned_repo_path": committed_repository},
+                    executor=executor,
+                ).run(),
+            ]
+        )
+
+        failed.rc | should.not_be.equal.to(0)
+        failed.stderr | should.contain("not a git repository")
+        succeeded.rc | should.be.equal.to(0)
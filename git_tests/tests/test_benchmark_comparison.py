@@ -0,0 +1,91 @@
+import pytest
+from grappa import should
+
+from git_tests.tools.benchmark_comparison import BenchmarkComparator, mann_whitney_u
+from git_tests.tools.benchmark_runner import BenchmarkReport, BenchmarkResult
+
+
+@pytest.mark.order(8)
+class TestBenchmarkComparison:
+    """Verification of the statistical regression gate of benchmark runs."""
+
+    comparator = BenchmarkComparator()
+
+    def test_mann_whitney_exact_tail(self):
+        """
+        Given:
+            - 5 baseline and 5 candidate samples, without ties
+        When:
+            - candidate samples are all greater, or interleaved with the baseline
+        Then:
+            - full separation has the exact one-sided p-value 1/252
+            - interleaved samples are far from significant
+        """
+        u_statistic, p_value = mann_whitney_u([1, 2, 3, 4, 5], [6, 7, 8, 9, 10])
+        u_statistic | should.be.equal.to(25)
+        p_value | should.be.equal.to(1 / 252)
+
+        _, p_value = mann_whitney_u([1, 3, 5, 7, 9], [2, 4, 6, 8, 10])
+        p_value | should.be.higher.than(0.3)
+
+    def test_regression_fails_gate(self):
+        """
+        Given:
+            - baseline and candidate runs of one case, candidate 30% slower
+        When:
+            - runs are compared
+        Then:
+            - case is a regression and the gate fails
+        """
+        result = self.comparator.compare(
+            self._get_report({"StatusCommand.basic": 1.0}),
+            self._get_report({"StatusCommand.basic": 1.3}),
+        )
+        result.comparisons[0].status | should.be.equal.to("regression")
+        result.exit_code | should.be.equal.to(1)
+
+    def test_missing_cases_fail_gate(self):
+        """
+        Given:
+            - baseline run with two cases, candidate run with one of them
+        When:
+            - runs are compared, with and without allow_missing
+        Then:
+            - missing case fails the gate, unless allowed
+            - candidate run without any baseline case always fails the gate
+        """
+        baseline = self._get_report(
+            {"StatusCommand.basic": 1.0, "LogCommand.basic": 1.0}
+        )
+        candidate = self._get_report({"StatusCommand.basic": 1.0})
+
+        result = self.comparator.compare(baseline, candidate)
+        [comparison.status for comparison in result.comparisons] | should.be.equal.to(
+            ["missing", "unchanged"]
+        )
+        result.exit_code | should.be.equal.to(1)
+
+        allowing_comparator = BenchmarkComparator(allow_missing=True)
+        allowing_comparator.compare(baseline, candidate).exit_code | should.be.equal.to(
+            0
+        )
+        allowing_comparator.compare(
+            baseline, self._get_report({})
+        ).exit_code | should.be.equal.to(1)
+
+    @staticmethod
+    def _get_report(scales: dict[str, float]) -> BenchmarkReport:
+        """Returns report with 20 samples of every case, around 10ms times its scale."""
+        return BenchmarkReport(
+            results=[
+                BenchmarkResult(
+                    name=name,
+                    size="small",
+                    warmup=1,
+                    iterations=20,
+                    wall_samples=[0.01 * scale * (1 + i / 1000) for i in range(20)],
+                    cpu_samples=[0.01 * scale * (1 + i / 1000) for i in range(20)],
+                )
+                for name, scale in scales.items()
+            ]
+        )
@@ -0,0 +1,109 @@
+from pathlib import Path
+
+import pytest
+from grappa import should
+
+from git_tests.tools.executors.caching_executor import CachingLocalExecutor
+from git_tests.tools.executors.local_executor import LocalExecutor
+
+
+@pytest.mark.order(7)
+class TestCachingLocalExecutor:
+    """Verification of the read-only git command cache."""
+
+    local_executor = LocalExecutor()
+
+    def test_status_is_not_cached(self, tmp_path: Path):
+        """
+        Given:
+            - local repository with a committed file, clean status
+        When:
+            - the tracked file is changed outside of git
+        Then:
+            - "git status" run by the caching executor shows the change
+        """
+        repo_path = self._create_repository(tmp_path)
+        executor = CachingLocalExecutor()
+        status_command = ["git", "-C", str(repo_path), "status", "--porcelain"]
+
+        executor.execute(status_command, raw_output=True).stdout | should.be.equal.to(
+            b""
+        )
+        Path(repo_path, "d", "f").write_text("changed\n")
+        executor.execute(status_command, raw_output=True).stdout | should.be.equal.to(
+            b" M d/f\n"
+        )
+        executor.hits | should.be.equal.to(0)
+
+    def test_log_is_invalidated_by_any_ref(self, tmp_path: Path):
+        """
+        Given:
+            - local repository with one commit, "git log --all" cached
+        When:
+            - a commit is made on another branch, by plain LocalExecutor
+        Then:
+            - repeated "git log --all" is a hit before the change
+              and shows the new commit after it
+        """
+        repo_path = self._create_repository(tmp_path)
+        executor = CachingLocalExecutor()
+        log_command = ["git", "-C", str(repo_path), "log", "--all", "--format=%s"]
+
+        executor.execute(log_command, raw_output=True).stdout | should.be.equal.to(
+            b"initial\n"
+        )
+        executor.execute(log_command, raw_output=True)
+        executor.hits | should.be.equal.to(1)
+
+        for command in (
+            ["git", "-C", str(repo_path), "branch", "other"],
+            ["git", "-C", str(repo_path), "switch", "-q", "other"],
+            ["git", "-C", str(repo_path), "commit", "-q", "--allow-empty", "-m", "x"],
+            ["git", "-C", str(repo_path), "switch", "-q", "-"],
+        ):
+            self.local_executor.execute(command).rc | should.be.equal.to(0)
+
+        result = executor.execute(log_command, raw_output=True)
+        set(result.stdout.splitlines()) | should.be.equal.to({b"initial", b"x"})
+        executor.hits | should.be.equal.to(1)
+
+    def test_reflog_is_invalidated_by_reset(self, tmp_path: Path):
+        """
+        Given:
+            - local repository with one commit, "git log -g" cached
+        When:
+            - "git reset --hard HEAD" is run by plain LocalExecutor,
+              which adds a reflog entry without moving any ref
+        Then:
+            - repeated "git log -g" shows the new reflog entry
+        """
+        repo_path = self._create_repository(tmp_path)
+        executor = CachingLocalExecutor()
+        reflog_command = ["git", "-C", str(repo_path), "log", "-g", "--format=%gs"]
+
+        executor.execute(reflog_command, raw_output=True).stdout | should.be.equal.to(
+            b"commit (initial): initial\n"
+        )
+        self.local_executor.execute(
+            ["git", "-C", str(repo_path), "reset", "-q", "--hard", "HEAD"]
+        ).rc | should.be.equal.to(0)
+
+        executor.execute(reflog_command, raw_output=True).stdout | should.be.equal.to(
+            b"reset: moving to HEAD\ncommit (initial): initial\n"
+        )
+        executor.hits | should.be.equal.to(0)
+
+    def _create_repository(self, base_dir: Path) -> Path:
+        """Creates repository with one committed file, d/f."""
+        repo_path = Path(base_dir, "repo")
+        Path(repo_path, "d").mkdir(parents=True)
+        Path(repo_path, "d", "f").write_text("initial\n")
+        for command in (
+            ["git", "init", "-q", str(repo_path)],
+            ["git", "-C", str(repo_path), "config", "user.name", "tester"],
+            ["git", "-C", str(repo_path), "config", "user.email", "tester@local"],
+            ["git", "-C", str(repo_path), "add", "d/f"],
+            ["git", "-C", str(repo_path), "commit", "-q", "-m", "initial"],
+        ):
+            self.local_executor.execute(command).rc | should.be.equal.to(0)
+        return repo_path
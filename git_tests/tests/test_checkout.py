@@ -5,10 +5,9 @@ import pytest
 from grappa import should
 
 from git_tests.config import PathsConfig, Inventory, SingleGitServerConfig
-from git_tests.helpers.commands.clone_command import CloneCommand
 from git_tests.helpers.commands.checkout_command import CheckoutCommand
 from git_tests.helpers.commands.status_command import StatusCommand
-from git_tests.tools.executors.local_executor import LocalExecutor, LocalPexpectExecutor
+from git_tests.tools.executors.local_executor import LocalExecutor
 
 
 @pytest.mark.order(4)
@@ -17,11 +16,10 @@ class TestCheckout:
     """Verification of git checkout command."""
 
     local_executor = LocalExecutor()
-    local_pexpect_executor = LocalPexpectExecutor()
     paths_config = PathsConfig()
     single_git_server_config = SingleGitServerConfig()
     inventory_config = Inventory()
-    local_test_dir_path = Path(paths_config.base_dir, "TMP_TEST_CHECKOUT")
+    local_test_dir_path = Path(paths_config.workspace_dir, "TMP_TEST_CHECKOUT")
     cloned_repo_path = Path(
         local_test_dir_path, single_git_server_config.test_repo_name
     )
@@ -41,12 +39,12 @@ class TestCheckout:
             - git status confirms branch change
         """
         status_result = StatusCommand(
-            variant="basic",
+            variant="porcelain",
             command_data={"cloned_repo_path": self.cloned_repo_path},
             executor=self.local_executor,
         ).run()
         status_result.rc | should.be.equal.to(0)
-        status_result.stdout | should.contain("On branch master")
+        status_result.parsed.branch_head | should.be.equal.to("master")
 
         checkout_result = CheckoutCommand(
             variant="branch",
@@ -62,33 +60,27 @@ class TestCheckout:
         ) | should.contain(self.new_branch_name)
 
         status_result = StatusCommand(
-            variant="basic",
+            variant="porcelain",
             command_data={"cloned_repo_path": self.cloned_repo_path},
             executor=self.local_executor,
         ).run()
         status_result.rc | should.be.equal.to(0)
-        status_result.stdout | should.contain(f"On branch {self.new_branch_name}")
+        status_result.parsed.branch_head | should.be.equal.to(self.new_branch_name)
 
     @pytest.fixture(scope="class", autouse=True)
-    def prepare_environment(self):
+    def prepare_environment(self, workflow_state_tree):
         """Setup/Teardown fixture.
         Creates and deletes directory for the test.
-        Runs git clone command.
+        Gets fresh clone of the server repository from the workflow state tree.
         """
         if self.local_test_dir_path.exists():
             shutil.rmtree(self.local_test_dir_path)
-        self.local_test_dir_path.mkdir()
+        self.local_test_dir_path.mkdir(parents=True)
 
-        clone_command = CloneCommand(
-            variant="basic",
-            command_data={
-                "server_config": self.server_config,
-                "single_git_server_config": self.single_git_server_config,
-                "cloned_repo_path": self.cloned_repo_path,
-            },
-            executor=self.local_pexpect_executor,
-        ).run()
-        clone_command.rc | should.be.equal.to(0)
+        workflow_state_tree.fork(
+            (), self.cloned_repo_path, label=self.__class__.__name__
+        )
+        self.cloned_repo_path.is_dir() | should.be.true
 
         yield
 
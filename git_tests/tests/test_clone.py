@@ -20,7 +20,7 @@ class TestClone:
     inventory_config = Inventory()
     single_git_server_config = SingleGitServerConfig()
 
-    local_test_dir_path = Path(paths_config.base_dir, "TMP_TEST_CLONE")
+    local_test_dir_path = Path(paths_config.workspace_dir, "TMP_TEST_CLONE")
     cloned_repo_path = Path(
         local_test_dir_path, single_git_server_config.test_repo_name
     )
@@ -92,7 +92,7 @@ class TestClone:
         """
         if self.local_test_dir_path.exists():
             shutil.rmtree(self.local_test_dir_path)
-        self.local_test_dir_path.mkdir()
+        self.local_test_dir_path.mkdir(parents=True)
 
         yield
 
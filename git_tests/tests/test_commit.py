@@ -1,4 +1,3 @@
-import re
 import shutil
 from pathlib import Path
 
@@ -6,14 +5,13 @@ import pytest
 from grappa import should
 
 from git_tests.config import PathsConfig, SingleGitServerConfig, Inventory
-from git_tests.helpers.commands.clone_command import CloneCommand
-
-from git_tests.helpers.commands.add_command import AddCommand
 from git_tests.helpers.commands.commit_command import CommitCommand
-from git_tests.helpers.commands.config_command import ConfigCommand
 from git_tests.helpers.commands.status_command import StatusCommand
 from git_tests.helpers.commands.log_command import LogCommand
-from git_tests.tools.executors.local_executor import LocalExecutor, LocalPexpectExecutor
+from git_tests.helpers.porcelain import parse_log, parse_status
+from git_tests.helpers.scenario import Scenario
+from git_tests.helpers.workflow_steps import WorkflowSteps
+from git_tests.tools.executors.local_executor import LocalExecutor
 
 
 @pytest.mark.order(5)
@@ -22,16 +20,20 @@ class TestCommit:
     """Verification of git commit command."""
 
     local_executor = LocalExecutor()
-    local_pexpect_executor = LocalPexpectExecutor()
     paths_config = PathsConfig()
     single_git_server_config = SingleGitServerConfig()
     inventory_config = Inventory()
-    local_test_dir_path = Path(paths_config.base_dir, "TMP_TEST_COMMIT")
+    local_test_dir_path = Path(paths_config.workspace_dir, "TMP_TEST_COMMIT")
     cloned_repo_path = Path(
         local_test_dir_path, single_git_server_config.test_repo_name
     )
     new_file_path = Path(cloned_repo_path, "new_file01")
     new_commit_message = "Test commit message 01"
+    workflow_state = (
+        WorkflowSteps.create_file(new_file_path.name),
+        WorkflowSteps.add_file(new_file_path.name),
+        WorkflowSteps.configure_user(),
+    )
     server_config = inventory_config.get(single_git_server_config.host_name)
 
     @pytest.mark.dependency()
@@ -71,82 +73,50 @@ class TestCommit:
             - git status command confirms that there are no files to commit
             - git log command confirms existence of the commit
         """
-        status_result = StatusCommand(
-            variant="basic",
-            command_data={"cloned_repo_path": self.cloned_repo_path},
-            executor=self.local_executor,
-        ).run()
-        status_result.rc | should.be.equal.to(0)
-        status_result.stdout | should.contain("nothing to commit, working tree clean")
+        scenario_result = (
+            Scenario("commit verification")
+            .step(
+                "status",
+                StatusCommand,
+                variant="porcelain",
+                command_data={"cloned_repo_path": self.cloned_repo_path},
+            )
+            .step(
+                "log",
+                LogCommand,
+                variant="porcelain",
+                command_data={"cloned_repo_path": self.cloned_repo_path},
+            )
+            .compile()
+            .run()
+        )
+        scenario_result.failures | should.be.empty
 
-        log_result = LogCommand(
-            variant="basic",
-            command_data={"cloned_repo_path": self.cloned_repo_path},
-            executor=self.local_executor,
-        ).run()
-        log_result.rc | should.be.equal.to(0)
+        status_report = parse_status(scenario_result.steps["status"].result.stdout)
+        status_report.entries | should.be.empty
 
-        output_match = re.search(
-            (r"[a-zA-Z0-9]{7} " rf"{self.new_commit_message}"), str(log_result.stdout)
-        )
-        isinstance(output_match, re.Match) | should.be.true
+        log_entries = parse_log(scenario_result.steps["log"].result.stdout)
+        log_entries | should.have.length.of(1)
+        log_entries[0].subject | should.be.equal.to(self.new_commit_message)
+        log_entries[0].short_commit | should.match(r"^[a-f0-9]{7,}$")
 
     @pytest.fixture(scope="class", autouse=True)
-    def prepare_environment(self):
+    def prepare_environment(self, workflow_state_tree):
         """Setup/Teardown fixture.
         Creates and deletes directory for the test.
-        Runs git clone command.
-        Creates file for commit.
-        Runs git add command.
-        Runs git config command.
+        Gets repository in the workflow_state from the workflow state tree:
+        cloned, with a new file added to staging and git user configured.
         """
         if self.local_test_dir_path.exists():
             shutil.rmtree(self.local_test_dir_path)
-        self.local_test_dir_path.mkdir()
-
-        clone_command = CloneCommand(
-            variant="basic",
-            command_data={
-                "server_config": self.server_config,
-                "single_git_server_config": self.single_git_server_config,
-                "cloned_repo_path": self.cloned_repo_path,
-            },
-            executor=self.local_pexpect_executor,
-        ).run()
-        clone_command.rc | should.be.equal.to(0)
+        self.local_test_dir_path.mkdir(parents=True)
 
-        self._create_file()
-
-        add_command_result = AddCommand(
-            variant="basic",
-            command_data={
-                "new_file_path": self.new_file_path,
-                "cloned_repo_path": self.cloned_repo_path,
-            },
-            executor=self.local_executor,
-        ).run()
-        add_command_result.rc | should.be.equal.to(0)
-
-        config_user_result = ConfigCommand(
-            variant="user",
-            command_data={"cloned_repo_path": self.cloned_repo_path},
-            executor=self.local_executor,
-        ).run()
-        config_user_result.rc | should.be.equal.to(0)
-
-        config_user_result = ConfigCommand(
-            variant="email",
-            command_data={"cloned_repo_path": self.cloned_repo_path},
-            executor=self.local_executor,
-        ).run()
-        config_user_result.rc | should.be.equal.to(0)
+        workflow_state_tree.fork(
+            self.workflow_state, self.cloned_repo_path, label=self.__class__.__name__
+        )
+        self.new_file_path.is_file() | should.be.true
 
         yield
 
         if self.local_test_dir_path.exists():
             shutil.rmtree(self.local_test_dir_path)
-
-    def _create_file(self):
-        new_file_path = Path(self.cloned_repo_path, "new_file01")
-        new_file_path.touch()
-        new_file_path.is_file() | should.be.true
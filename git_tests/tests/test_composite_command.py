@@ -0,0 +1,89 @@
+from pathlib import Path
+
+import pytest
+from grappa import should
+
+from git_tests.helpers.commands.composite_command import CompositeCommand
+from git_tests.helpers.commands.log_command import LogCommand
+from git_tests.helpers.commands.status_command import StatusCommand
+from git_tests.tools.executors.local_batch_executor import (
+    LocalBatchExecutor,
+    LocalCommandRecorder,
+)
+
+
+@pytest.mark.order(19)
+class TestCompositeCommand:
+    """Verification of CompositeCommand variants."""
+
+    def test_stop_on_failure(self, committed_repository: Path):
+        """
+        Given:
+            - status in a repository, status in a directory which is not one,
+              and log in the repository
+        When:
+            - they are run as "stop_on_failure" CompositeCommand
+        Then:
+            - sub-commands run up to the failing one, log is not executed
+            - rc and stderr are the ones of the failed sub-command
+        """
+        result = self._run_composite("stop_on_failure", committed_repository)
+
+        [batch.executed for batch in result.results] | should.be.equal.to(
+            [True, True, False]
+        )
+        result.results[1].result.rc | should.not_be.equal.to(0)
+        result.rc | should.be.equal.to(result.results[1].result.rc)
+        result.stderr | should.contain("not a git repository")
+        result.stdout | should.contain("On branch master")
+        result.stdout | should.do_not.contain("initial")
+
+    def test_basic_runs_everything(self, committed_repository: Path):
+        """
+        Given:
+            - the same sub-commands, with a failing one in the middle
+        When:
+            - they are run as "basic" CompositeCommand
+        Then:
+            - all sub-commands are executed, including log after the failure
+            - rc is still the one of the failed sub-command
+        """
+        result = self._run_composite("basic", committed_repository)
+
+        [batch.executed for batch in result.results] | should.be.equal.to(
+            [True, True, True]
+        )
+        [batch.result.rc == 0 for batch in result.results] | should.be.equal.to(
+            [True, False, True]
+        )
+        result.rc | should.be.equal.to(result.results[1].result.rc)
+        result.stdout | should.contain("initial")
+
+    @staticmethod
+    def _run_composite(variant: str, repo_path: Path):
+        """Runs status, failing status and log, as CompositeCommand of the variant."""
+        not_repository = Path(repo_path.parent, "not_repository")
+        not_repository.mkdir(exist_ok=True)
+        return CompositeCommand(
+            variant=variant,
+            command_data={
+                "commands": [
+                    StatusCommand(
+                        variant="basic",
+                        command_data={"cloned_repo_path": repo_path},
+                        executor=LocalCommandRecorder(),
+                    ),
+                    StatusCommand(
+                        variant="basic",
+                        command_data={"cloned_repo_path": not_repository},
+                        executor=LocalCommandRecorder(),
+                    ),
+                    LogCommand(
+                        variant="basic",
+                        command_data={"cloned_repo_path": repo_path},
+                        executor=LocalCommandRecorder(),
+                    ),
+                ],
+            },
+            executor=LocalBatchExecutor(),
+        ).run()
@@ -0,0 +1,113 @@
+from pathlib import Path
+
+import pytest
+from grappa import should
+
+from git_tests.tools import fixture_repo_cache
+from git_tests.tools.executors.local_executor import LocalExecutor
+from git_tests.tools.fixture_repo_cache import FixtureRepositoryCache
+from git_tests.tools.repo_generator import RepositoryGeneratorParameters
+
+
+@pytest.mark.order(21)
+class TestFixtureRepositoryCache:
+    """Verification of hits, misses and eviction of FixtureRepositoryCache."""
+
+    local_executor = LocalExecutor()
+    parameters = RepositoryGeneratorParameters(file_count=5, commit_count=2)
+    other_parameters = RepositoryGeneratorParameters(
+        file_count=5, commit_count=2, seed=1
+    )
+
+    def test_hit_and_miss(self, tmp_path: Path):
+        """
+        Given:
+            - empty cache
+        When:
+            - the same repository is checked out twice
+        Then:
+            - the first checkout generates and publishes the entry, the second reuses it
+            - both clones have the generated master commit
+        """
+        cache = FixtureRepositoryCache(Path(tmp_path, "cache"))
+
+        first = cache.checkout(self.parameters, Path(tmp_path, "first"))
+        second = cache.checkout(self.parameters, Path(tmp_path, "second"), bare=True)
+
+        (cache.misses, cache.hits, cache.evictions) | should.be.equal.to((1, 1, 0))
+        [entry.key for entry in cache.entries()] | should.be.equal.to(
+            [cache.get_key(self.parameters)]
+        )
+        list(Path(tmp_path, "cache", "tmp").glob("*")) | should.be.empty
+        self._rev_parse(first) | should.be.equal.to(self._rev_parse(second))
+        cache.summary()[0] | should.contain("1 hits, 1 misses")
+
+    def test_least_recently_used_entry_is_evicted(self, tmp_path: Path):
+        """
+        Given:
+            - cache too small for more than one entry, with one entry
+        When:
+            - another repository is checked out
+        Then:
+            - the older entry is evicted, the checked out one is kept
+        """
+        cache = FixtureRepositoryCache(Path(tmp_path, "cache"), max_size=1)
+        cache.checkout(self.parameters, Path(tmp_path, "first"))
+
+        cache.checkout(self.other_parameters, Path(tmp_path, "second"))
+
+        [entry.key for entry in cache.entries()] | should.be.equal.to(
+            [cache.get_key(self.other_parameters)]
+        )
+        cache.evictions | should.be.equal.to(1)
+
+    def test_kept_entry_is_not_evicted(self, tmp_path: Path):
+        """
+        Given:
+            - cache with two entries, above its max_size
+        When:
+            - cache is evicted, keeping the least recently used entry
+        Then:
+            - only the other entry is evicted
+        """
+        cache = FixtureRepositoryCache(Path(tmp_path, "cache"))
+        cache.checkout(self.parameters, Path(tmp_path, "first"))
+        cache.checkout(self.other_parameters, Path(tmp_path, "second"))
+        oldest, newest = [entry.key for entry in cache.entries()]
+        small_cache = FixtureRepositoryCache(Path(tmp_path, "cache"), max_size=1)
+
+        small_cache.evict(keep={oldest}) | should.be.equal.to([newest])
+        [entry.key for entry in small_cache.entries()] | should.be.equal.to([oldest])
+
+    def test_key_follows_stream_version(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """
+        Given:
+            - cached repository
+        When:
+            - FAST_IMPORT_STREAM_VERSION is increased and the repository checked out
+        Then:
+            - key changes, so the repository is generated again instead of reused
+        """
+        cache = FixtureRepositoryCache(Path(tmp_path, "cache"))
+        cache.checkout(self.parameters, Path(tmp_path, "first"))
+        old_key = cache.get_key(self.parameters)
+
+        monkeypatch.setattr(
+            fixture_repo_cache,
+            "FAST_IMPORT_STREAM_VERSION",
+            fixture_repo_cache.FAST_IMPORT_STREAM_VERSION + 1,
+        )
+        cache.checkout(self.parameters, Path(tmp_path, "second"))
+
+        cache.get_key(self.parameters) | should.not_be.equal.to(old_key)
+        (cache.misses, cache.hits) | should.be.equal.to((2, 0))
+
+    def _rev_parse(self, repo_path: Path) -> str:
+        """Returns commit hash of master in the repository."""
+        result = self.local_executor.execute(
+            ["git", "-C", str(repo_path), "rev-parse", "master"], raw_output=True
+        )
+        result.rc | should.be.equal.to(0)
+        return result.stdout.decode().strip()
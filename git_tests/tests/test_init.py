@@ -16,7 +16,7 @@ class TestInit:
     """Verification of git init command."""
 
     paths_config = PathsConfig()
-    local_test_dir_path = Path(paths_config.base_dir, "TMP_TEST_INIT")
+    local_test_dir_path = Path(paths_config.workspace_dir, "TMP_TEST_INIT")
     git_repo_path_working = Path(local_test_dir_path, "testrepo_working")
     git_repo_path_bare = Path(local_test_dir_path, "testrepo_bare")
 
@@ -125,7 +125,7 @@ class TestInit:
         """
         if self.local_test_dir_path.exists():
             shutil.rmtree(self.local_test_dir_path)
-        self.local_test_dir_path.mkdir()
+        self.local_test_dir_path.mkdir(parents=True)
 
         yield
 
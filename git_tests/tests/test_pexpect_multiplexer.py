@@ -0,0 +1,98 @@
+import signal
+from pathlib import Path
+
+import pexpect
+import pytest
+from grappa import should
+
+from git_tests.tools.executors.pexpect_multiplexer import (
+    LocalPexpectMultiplexer,
+    PexpectSession,
+)
+
+
+@pytest.mark.order(14)
+class TestLocalPexpectMultiplexer:
+    """Verification of concurrent interactive sessions of LocalPexpectMultiplexer."""
+
+    prompting_command = 'sh -c \'printf "name: "; read name; echo "hello $name"\''
+
+    @pytest.mark.parametrize("max_sessions", [1, 3])
+    def test_prompts_are_answered(self, max_sessions: int):
+        """
+        Given:
+            - three sessions, each asks for a name and greets it
+        When:
+            - sessions are run with the given number of children at once
+        Then:
+            - every session gets its own answer and ends with success,
+              results are in the order of the sessions
+        """
+        sessions = [
+            PexpectSession(command=self.prompting_command, expect=[("name: ", name)])
+            for name in ("alice", "bob", "carol")
+        ]
+
+        results = LocalPexpectMultiplexer(max_sessions=max_sessions).execute_many(
+            sessions
+        )
+
+        [result.rc for result in results] | should.be.equal.to([0, 0, 0])
+        [result.stopped for result in results] | should.be.equal.to([False] * 3)
+        for result, name in zip(results, ("alice", "bob", "carol")):
+            result.stdout | should.contain(f"hello {name}")
+
+    def test_timed_out_session_is_stopped(self):
+        """
+        Given:
+            - session which never ends, with short timeout, and a quick one
+        When:
+            - sessions are run together
+        Then:
+            - the long session is killed, with stopped flag and rc -SIGKILL
+            - the quick session is not affected
+        """
+        stopped, finished = LocalPexpectMultiplexer().execute_many(
+            [
+                PexpectSession(command="sleep 30", timeout=0.5),
+                PexpectSession(command="echo done"),
+            ]
+        )
+
+        stopped.stopped | should.be.true
+        stopped.rc | should.be.equal.to(-signal.SIGKILL)
+        finished.stopped | should.be.false
+        finished.rc | should.be.equal.to(0)
+
+    def test_spawn_failure_kills_running_sessions(self):
+        """
+        Given:
+            - long session, followed by a session with not existing command
+        When:
+            - sessions are run together
+        Then:
+            - spawn error is raised
+            - the already spawned long session is not left running
+        """
+        sessions = [
+            PexpectSession(command="sleep 30.5"),
+            PexpectSession(command="/not/existing/command"),
+        ]
+
+        with pytest.raises(pexpect.ExceptionPexpect):
+            LocalPexpectMultiplexer().execute_many(sessions)
+
+        self._get_processes(["sleep", "30.5"]) | should.be.empty
+
+    @staticmethod
+    def _get_processes(argv: list[str]) -> list[Path]:
+        """Returns /proc entries of running processes with exactly the given arguments."""
+        expected = "\0".join(argv).encode() + b"\0"
+        processes = []
+        for cmdline in Path("/proc").glob("[0-9]*/cmdline"):
+            try:
+                if cmdline.read_bytes() == expected:
+                    processes.append(cmdline.parent)
+            except OSError:
+                pass
+        return processes
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+from grappa import should
+
+from git_tests.helpers.commands.log_command import LogCommand
+from git_tests.helpers.commands.status_command import StatusCommand
+from git_tests.helpers.porcelain import parse_log, parse_status
+from git_tests.tools.executors.async_local_executor import AsyncLocalExecutor
+from git_tests.tools.executors.local_executor import LocalStreamingExecutor
+
+
+@pytest.mark.order(11)
+class TestPorcelainCommands:
+    """Verification of porcelain Command variants with other executors than LocalExecutor."""
+
+    def test_streaming_executor_result_is_parsed(self, committed_repository: Path):
+        """
+        Given:
+            - local repository with one commit and an untracked file
+        When:
+            - porcelain variants of status and log are run by LocalStreamingExecutor
+        Then:
+            - both results are parsed, the same as with LocalExecutor
+        """
+        Path(committed_repository, "untracked").write_text("new\n")
+        command_data = {"cloned_repo_path": committed_repository}
+
+        status_result = StatusCommand(
+            variant="porcelain",
+            command_data=command_data,
+            executor=LocalStreamingExecutor(),
+        ).run()
+        status_result.rc | should.be.equal.to(0)
+        status_result.parsed.branch_head | should.be.equal.to("master")
+        [
+            entry.path for entry in status_result.parsed.with_kind("?")
+        ] | should.be.equal.to(["untracked"])
+
+        log_result = LogCommand(
+            variant="porcelain",
+            command_data=command_data,
+            executor=LocalStreamingExecutor(),
+        ).run()
+        log_result.rc | should.be.equal.to(0)
+        [entry.subject for entry in log_result.parsed] | should.be.equal.to(["initial"])
+
+    def test_async_executor_returns_raw_output(self, committed_repository: Path):
+        """
+        Given:
+            - local repository with one commit
+        When:
+            - porcelain variants of status and log are run by AsyncLocalExecutor
+        Then:
+            - results have stdout as bytes, which the porcelain parsers accept
+        """
+        command_data = {"cloned_repo_path": committed_repository}
+        executor = AsyncLocalExecutor()
+
+        status_result, log_result = executor.run_all(
+            [
+                StatusCommand(
+                    variant="porcelain", command_data=command_data, executor=executor
+                ).run(),
+                LogCommand(
+                    variant="porcelain", command_data=command_data, executor=executor
+                ).run(),
+            ]
+        )
+        status_result.rc | should.be.equal.to(0)
+        parse_status(status_result.stdout).branch_head | should.be.equal.to("master")
+        log_result.rc | should.be.equal.to(0)
+        [entry.subject for entry in parse_log(log_result.stdout)] | should.be.equal.to(
+            ["initial"]
+        )
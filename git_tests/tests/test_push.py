@@ -6,12 +6,8 @@ import pytest
 from grappa import should
 
 from git_tests.config import PathsConfig, SingleGitServerConfig, Inventory
-from git_tests.helpers.commands.add_command import AddCommand
-from git_tests.helpers.commands.checkout_command import CheckoutCommand
-from git_tests.helpers.commands.clone_command import CloneCommand
-from git_tests.helpers.commands.commit_command import CommitCommand
-from git_tests.helpers.commands.config_command import ConfigCommand
 from git_tests.helpers.commands.push_command import PushCommand
+from git_tests.helpers.workflow_steps import WorkflowSteps
 from git_tests.tools.executors.local_executor import LocalExecutor, LocalPexpectExecutor
 from git_tests.tools.executors.ssh_executor import SshExecutor, SshHostData
 
@@ -26,7 +22,7 @@ class TestPush:
     paths_config = PathsConfig()
     single_git_server_config = SingleGitServerConfig()
     inventory_config = Inventory()
-    local_test_dir_path = Path(paths_config.base_dir, "TMP_TEST_PUSH")
+    local_test_dir_path = Path(paths_config.workspace_dir, "TMP_TEST_PUSH")
     cloned_repo_path = Path(
         local_test_dir_path, single_git_server_config.test_repo_name
     )
@@ -34,8 +30,15 @@ class TestPush:
     new_branch_name = "new_branch_01"
     new_file_path = Path(cloned_repo_path, "new_file01")
     new_commit_message = "new_commit message 01"
+    workflow_state = (
+        WorkflowSteps.create_file(new_file_path.name),
+        WorkflowSteps.add_file(new_file_path.name),
+        WorkflowSteps.configure_user(),
+        WorkflowSteps.checkout_branch(new_branch_name),
+        WorkflowSteps.commit(new_commit_message),
+    )
 
-    def test_push_to_origin(self):
+    def test_push_to_origin(self, ssh_connection_pool):
         """
         Given:
             - local environment with created directory for repository
@@ -55,6 +58,7 @@ class TestPush:
             user=self.server_config.ansible_user,
             password=self.server_config.ansible_password,
             host=self.server_config.ansible_host,
+            port=self.server_config.ansible_port,
         )
 
         origin_repo_path = Path(
@@ -62,7 +66,7 @@ class TestPush:
             self.single_git_server_config.test_repo_name,
         )
         # TODO: Can be refactored to be another CommandProtocol implementation
-        with SshExecutor(host_data=host_data) as ssh_executor:
+        with SshExecutor(host_data=host_data, pool=ssh_connection_pool) as ssh_executor:
             result = ssh_executor.execute(f"cd {origin_repo_path}; git log --oneline")
             stderr_content = result.read(channel="stderr")
         stderr_content | should.have.length.of(1)
@@ -85,7 +89,7 @@ class TestPush:
             f"{self.new_branch_name} -> {self.new_branch_name}"
         )
 
-        with SshExecutor(host_data=host_data) as ssh_executor:
+        with SshExecutor(host_data=host_data, pool=ssh_connection_pool) as ssh_executor:
             result = ssh_executor.execute(
                 f"cd {origin_repo_path}; git log --oneline --branches {self.new_branch_name}"
             )
@@ -98,72 +102,26 @@ class TestPush:
             isinstance(match_content, re.Match) | should.be.true
 
     @pytest.fixture(scope="class", autouse=True)
-    def prepare_environment(self):
-        # TODO: it is way too long, must be divided or logic must be changed
+    def prepare_environment(self, repository_template_cache, workflow_state_tree):
+        """Setup/Teardown fixture.
+        Creates and deletes directory for the test.
+        Gets repository in the workflow_state from the workflow state tree:
+        cloned, with a new file committed on a new branch.
+        File is staged before the checkout, so the state extends TestCommit state.
+        """
         if self.local_test_dir_path.exists():
             shutil.rmtree(self.local_test_dir_path)
-        self.local_test_dir_path.mkdir()
+        self.local_test_dir_path.mkdir(parents=True)
 
-        clone_command = CloneCommand(
-            variant="basic",
-            command_data={
-                "server_config": self.server_config,
-                "single_git_server_config": self.single_git_server_config,
-                "cloned_repo_path": self.cloned_repo_path,
-            },
-            executor=self.local_pexpect_executor,
-        ).run()
-        clone_command.rc | should.be.equal.to(0)
-
-        checkout_command = CheckoutCommand(
-            variant="branch",
-            command_data={
-                "branch_name": self.new_branch_name,
-                "cloned_repo_path": self.cloned_repo_path,
-            },
-            executor=self.local_executor,
-        ).run()
-        checkout_command.rc | should.be.equal.to(0)
-
-        self.new_file_path.touch()
+        workflow_state_tree.fork(
+            self.workflow_state, self.cloned_repo_path, label=self.__class__.__name__
+        )
         self.new_file_path.is_file() | should.be.true
 
-        add_command = AddCommand(
-            variant="basic",
-            command_data={
-                "new_file_path": self.new_file_path,
-                "cloned_repo_path": self.cloned_repo_path,
-            },
-            executor=self.local_executor,
-        ).run()
-
-        add_command.rc | should.be.equal.to(0)
-
-        config_user_result = ConfigCommand(
-            variant="user",
-            command_data={"cloned_repo_path": self.cloned_repo_path},
-            executor=self.local_executor,
-        ).run()
-        config_user_result.rc | should.be.equal.to(0)
-
-        config_user_result = ConfigCommand(
-            variant="email",
-            command_data={"cloned_repo_path": self.cloned_repo_path},
-            executor=self.local_executor,
-        ).run()
-        config_user_result.rc | should.be.equal.to(0)
-
-        commit_command = CommitCommand(
-            variant="basic",
-            command_data={
-                "commit_message": self.new_commit_message,
-                "cloned_repo_path": self.cloned_repo_path,
-            },
-            executor=self.local_executor,
-        ).run()
-        commit_command.rc | should.be.equal.to(0)
-
         yield
 
+        # server repository has the pushed branch now
+        repository_template_cache.invalidate()
+        workflow_state_tree.invalidate()
         if self.local_test_dir_path.exists():
             shutil.rmtree(self.local_test_dir_path)
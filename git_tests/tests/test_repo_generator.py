@@ -0,0 +1,122 @@
+from pathlib import Path
+
+import pytest
+from grappa import should
+
+from git_tests.tools.executors.local_executor import LocalExecutor
+from git_tests.tools.repo_generator import (
+    RepositoryGenerator,
+    RepositoryGeneratorParameters,
+)
+
+
+@pytest.mark.order(20)
+class TestRepositoryGenerator:
+    """Verification of synthetic repositories generated by RepositoryGenerator."""
+
+    local_executor = LocalExecutor()
+    parameters = RepositoryGeneratorParameters(
+        file_count=12, commit_count=3, branch_count=2, blob_size=64
+    )
+    # must only change together with FAST_IMPORT_STREAM_VERSION,
+    # otherwise FixtureRepositoryCache serves repositories of the old shape
+    expected_master_commit = "2b2aec7573af9389a7265cb64cde5946aac213b6"
+
+    def test_same_parameters_give_same_hashes(self, tmp_path: Path):
+        """
+        Given:
+            - generator parameters
+        When:
+            - repository is generated twice, and once more with another seed
+        Then:
+            - both repositories have the same refs and commit hashes,
+              master commit is the pinned one
+            - repository with another seed has other hashes
+        """
+        first = RepositoryGenerator(self.parameters).generate_local(
+            Path(tmp_path, "first"), bare=True
+        )
+        second = RepositoryGenerator(self.parameters).generate_local(
+            Path(tmp_path, "second"), bare=True
+        )
+        reseeded = RepositoryGenerator(
+            RepositoryGeneratorParameters(
+                file_count=12, commit_count=3, branch_count=2, blob_size=64, seed=1
+            )
+        ).generate_local(Path(tmp_path, "reseeded"), bare=True)
+
+        first.successful | should.be.true
+        self._get_refs(first.path) | should.be.equal.to(self._get_refs(second.path))
+        self._get_refs(first.path)["refs/heads/master"] | should.be.equal.to(
+            self.expected_master_commit
+        )
+        self._get_refs(reseeded.path)["refs/heads/master"] | should.not_be.equal.to(
+            self.expected_master_commit
+        )
+
+    def test_repository_shape(self, tmp_path: Path):
+        """
+        Given:
+            - parameters with 12 files, 3 commits and 2 branches
+        When:
+            - working repository is generated
+        Then:
+            - result and repository have 3 main branch commits plus one branch commit
+            - master has 12 files, all of them checked out
+            - there are 2 branches
+        """
+        result = RepositoryGenerator(self.parameters).generate_local(tmp_path)
+
+        result.successful | should.be.true
+        result.commits | should.be.equal.to(4)
+        self._git(tmp_path, "rev-list", "--count", "--all") | should.be.equal.to("4")
+        self._git(tmp_path, "rev-list", "--count", "master") | should.be.equal.to("3")
+        self._git(tmp_path, "ls-tree", "-r", "--name-only", "master").split(
+            "\n"
+        ) | should.have.length.of(12)
+        self._git(tmp_path, "ls-files").split("\n") | should.have.length.of(12)
+        self._get_refs(tmp_path) | should.have.length.of(2)
+
+    def test_no_files(self, tmp_path: Path):
+        """
+        Given:
+            - parameters with no files
+        When:
+            - working repository is generated
+        Then:
+            - commits are generated with empty trees, no blobs are streamed
+        """
+        result = RepositoryGenerator(
+            RepositoryGeneratorParameters(file_count=0, commit_count=2)
+        ).generate_local(tmp_path)
+
+        result.successful | should.be.true
+        result.commits | should.be.equal.to(2)
+        result.blobs | should.be.equal.to(0)
+        self._git(tmp_path, "rev-list", "--count", "master") | should.be.equal.to("2")
+        self._git(tmp_path, "ls-tree", "-r", "master") | should.be.empty
+
+    def test_invalid_parameters(self):
+        """
+        Given:
+            - negative file count
+        When:
+            - parameters are created
+        Then:
+            - ValueError is raised
+        """
+        with pytest.raises(ValueError, match="file_count"):
+            RepositoryGeneratorParameters(file_count=-1)
+
+    def _get_refs(self, repo_path: Path) -> dict[str, str]:
+        """Returns refs of the repository with their commit hashes."""
+        refs = self._git(repo_path, "for-each-ref", "--format=%(refname) %(objectname)")
+        return dict(line.split() for line in refs.split("\n"))
+
+    def _git(self, repo_path: Path, *args: str) -> str:
+        """Runs git in the repository and returns its output."""
+        result = self.local_executor.execute(
+            ["git", "-C", str(repo_path), *args], raw_output=True
+        )
+        result.rc | should.be.equal.to(0)
+        return result.stdout.decode().strip()
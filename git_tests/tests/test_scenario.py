@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pytest
+from grappa import should
+
+from git_tests.helpers.commands.log_command import LogCommand
+from git_tests.helpers.commands.status_command import StatusCommand
+from git_tests.helpers.scenario import Scenario
+from git_tests.tools.executors.local_executor import LocalExecutor
+
+
+@pytest.mark.order(9)
+class TestScenario:
+    """Verification of Scenario planning and execution."""
+
+    local_executor = LocalExecutor()
+
+    def test_failed_output_check_stops_dependents(self, tmp_path: Path):
+        """
+        Given:
+            - local repository
+            - scenario: status with a stdout expectation which is not met,
+              then log depending on it
+        When:
+            - scenario is compiled and run
+        Then:
+            - both steps are in separate batches
+            - status fails its expectation and log is not executed
+        """
+        self.local_executor.execute(["git", "init", "-q", str(tmp_path)])
+        command_data = {"cloned_repo_path": tmp_path}
+        plan = (
+            Scenario("failed output check")
+            .step(
+                "status",
+                StatusCommand,
+                variant="basic",
+                command_data=command_data,
+                stdout_contains=["not in the output"],
+            )
+            .step("log", LogCommand, variant="basic", command_data=command_data)
+            .compile()
+        )
+        plan.batches | should.have.length.of(2)
+
+        scenario_result = plan.run()
+        scenario_result.steps["status"].result.rc | should.be.equal.to(0)
+        scenario_result.steps["status"].passed | should.be.false
+        scenario_result.steps["log"].result | should.be.none
+        scenario_result.steps["log"].failures | should.be.equal.to(
+            ["not executed, dependency failed"]
+        )
@@ -0,0 +1,93 @@
+from pathlib import Path, PurePosixPath
+
+import pytest
+from grappa import should
+
+from git_tests.tools.executors.local_executor import LocalExecutor
+from git_tests.tools.executors.ssh_executor import SshExecutor, SshHostData
+from git_tests.tools.sftp_transfer import SftpTransfer
+
+
+@pytest.mark.order(16)
+class TestSftpTransfer:
+    """Verification of repository seeding and harvesting against the local stand-in server."""
+
+    local_executor = LocalExecutor()
+
+    def test_seed_and_harvest_round_trip(
+        self,
+        local_ssh_host_data: SshHostData,
+        committed_repository: Path,
+        tmp_path: Path,
+    ):
+        """
+        Given:
+            - local repository with one commit
+            - empty bare repository on the server
+        When:
+            - local repository is seeded into the server one and harvested back
+        Then:
+            - harvested bundle has the same master commit as the local repository
+        """
+        remote_repo_path = self._init_bare_repository(tmp_path)
+        bundle_path = Path(tmp_path, "harvested.bundle")
+
+        with SshExecutor(host_data=local_ssh_host_data) as ssh_executor, SftpTransfer(
+            ssh_executor, remote_tmp_dir=PurePosixPath(tmp_path)
+        ) as sftp:
+            sftp.seed_repository(committed_repository, remote_repo_path)
+            sftp.harvest_repository(remote_repo_path, bundle_path) | should.be.true
+
+        local_head = self._rev_parse(["-C", str(committed_repository)], "master")
+        self._rev_parse(
+            [f"--git-dir={remote_repo_path}"], "master"
+        ) | should.be.equal.to(local_head)
+        bundle_heads = self.local_executor.execute(
+            ["git", "bundle", "list-heads", str(bundle_path), "refs/heads/master"],
+            raw_output=True,
+        )
+        bundle_heads.stdout.decode().split()[0] | should.be.equal.to(local_head)
+        list(tmp_path.glob("git_tests_*.bundle")) | should.be.empty
+
+    def test_empty_repositories(self, local_ssh_host_data: SshHostData, tmp_path: Path):
+        """
+        Given:
+            - local and server repositories without commits, as after provisioning
+        When:
+            - local repository is seeded into the server one and harvested back
+        Then:
+            - both end without error, nothing is harvested and server repo stays empty
+        """
+        remote_repo_path = self._init_bare_repository(tmp_path)
+        local_repo_path = Path(tmp_path, "local")
+        self.local_executor.execute(
+            ["git", "init", "-q", str(local_repo_path)]
+        ).rc | should.be.equal.to(0)
+        bundle_path = Path(tmp_path, "harvested.bundle")
+
+        with SshExecutor(host_data=local_ssh_host_data) as ssh_executor, SftpTransfer(
+            ssh_executor, remote_tmp_dir=PurePosixPath(tmp_path)
+        ) as sftp:
+            sftp.seed_repository(local_repo_path, remote_repo_path)
+            sftp.harvest_repository(remote_repo_path, bundle_path) | should.be.false
+
+        bundle_path.exists() | should.be.false
+        self.local_executor.execute(
+            ["git", f"--git-dir={remote_repo_path}", "for-each-ref"]
+        ).stdout | should.be.equal.to(str(b""))
+
+    def _init_bare_repository(self, base_dir: Path) -> PurePosixPath:
+        """Creates empty bare repository, the "server" one."""
+        repo_path = Path(base_dir, "server", "repo.git")
+        self.local_executor.execute(
+            ["git", "init", "-q", "--bare", str(repo_path)]
+        ).rc | should.be.equal.to(0)
+        return PurePosixPath(repo_path)
+
+    def _rev_parse(self, git_options: list[str], revision: str) -> str:
+        """Returns commit hash of the revision."""
+        result = self.local_executor.execute(
+            ["git", *git_options, "rev-parse", revision], raw_output=True
+        )
+        result.rc | should.be.equal.to(0)
+        return result.stdout.decode().strip()
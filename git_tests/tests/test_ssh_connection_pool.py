@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+from grappa import should
+
+from git_tests.tools.executors.ssh_executor import (
+    SshConnectionPool,
+    SshExecutor,
+    SshHostData,
+)
+
+
+@pytest.mark.order(10)
+class TestSshConnectionPool:
+    """Verification of the Ssh transport pool against the local stand-in server."""
+
+    def test_idle_transport_is_reused(self, local_ssh_host_data: SshHostData):
+        """
+        Given:
+            - pool with one released transport
+        When:
+            - two SshExecutor blocks run a command one after another
+        Then:
+            - both commands succeed on the same transport
+        """
+        pool = SshConnectionPool()
+        try:
+            transports = []
+            for _ in range(2):
+                with SshExecutor(
+                    host_data=local_ssh_host_data, pool=pool
+                ) as ssh_executor:
+                    result = ssh_executor.execute("echo pooled")
+                    result.recv_exit_status() | should.be.equal.to(0)
+                    transports.append(result.channel.get_transport())
+
+            transports[0] | should.be.equal.to(transports[1])
+        finally:
+            pool.close()
+
+    def test_limit_blocks_until_release(self, local_ssh_host_data: SshHostData):
+        """
+        Given:
+            - pool limited to one transport per host, the transport is acquired
+        When:
+            - the transport is acquired again, before and after it is released
+        Then:
+            - acquire times out while the transport is taken
+            - waiting acquire gets the same transport after the release
+        """
+        pool = SshConnectionPool(max_transports_per_host=1)
+        try:
+            transport = pool.acquire(local_ssh_host_data)
+            (
+                lambda: pool.acquire(local_ssh_host_data, timeout=0.2)
+            ) | should.raise_error(TimeoutError)
+
+            releaser = threading.Timer(
+                0.2,
+                pool.release,
+                kwargs={"host_data": local_ssh_host_data, "transport": transport},
+            )
+            releaser.start()
+            pool.acquire(local_ssh_host_data, timeout=5) | should.be.equal.to(transport)
+            releaser.join()
+        finally:
+            pool.close()
+
+    def test_broken_transport_is_replaced(self, local_ssh_host_data: SshHostData):
+        """
+        Given:
+            - pool with one released transport
+        When:
+            - the transport is closed, e.g. by the server
+        Then:
+            - the next acquire fails the health check and opens a new transport
+        """
+        pool = SshConnectionPool(max_transports_per_host=1)
+        try:
+            transport = pool.acquire(local_ssh_host_data)
+            pool.release(local_ssh_host_data, transport)
+            transport.close()
+
+            new_transport = pool.acquire(local_ssh_host_data, timeout=5)
+            new_transport | should.not_be.equal.to(transport)
+            new_transport.is_active() | should.be.true
+        finally:
+            pool.close()
+
+    def test_idle_transport_is_evicted(self, local_ssh_host_data: SshHostData):
+        """
+        Given:
+            - pool with short idle timeout, one released transport
+        When:
+            - the transport stays unused longer than the idle timeout
+        Then:
+            - the next acquire closes it and opens a new transport
+        """
+        pool = SshConnectionPool(idle_timeout=0.1)
+        try:
+            transport = pool.acquire(local_ssh_host_data)
+            pool.release(local_ssh_host_data, transport)
+            time.sleep(0.3)
+
+            new_transport = pool.acquire(local_ssh_host_data)
+            new_transport | should.not_be.equal.to(transport)
+            transport.is_active() | should.be.false
+        finally:
+            pool.close()
@@ -0,0 +1,58 @@
+import pytest
+from grappa import should
+
+from git_tests.tools.executors.ssh_executor import SshExecutor, SshHostData
+
+
+@pytest.mark.order(12)
+class TestSshExecutor:
+    """Verification of SshExecutor output buffering against the local stand-in server."""
+
+    def test_channel_closed_after_exit_status(self, local_ssh_host_data: SshHostData):
+        """
+        Given:
+            - connected SshExecutor
+        When:
+            - command output and exit status are read, without close()
+        Then:
+            - channel is closed and output is still readable
+        """
+        with SshExecutor(host_data=local_ssh_host_data) as ssh_executor:
+            result = ssh_executor.execute("echo out && echo err >&2")
+            result.recv_exit_status() | should.be.equal.to(0)
+
+            result.channel.closed | should.be.true
+            result.read(channel="stdout") | should.be.equal.to(["out\n"])
+            result.read(channel="stderr") | should.be.equal.to(["err\n"])
+
+    @pytest.mark.parametrize(
+        "spill_to_disk, expected_lines, truncated",
+        [(True, 2000, False), (False, 200, True)],
+    )
+    def test_output_above_memory_limit(
+        self,
+        local_ssh_host_data: SshHostData,
+        spill_to_disk: bool,
+        expected_lines: int,
+        truncated: bool,
+    ):
+        """
+        Given:
+            - SshExecutor with 1000 bytes memory limit for the output
+        When:
+            - command writes 10000 bytes to stdout
+        Then:
+            - with spill_to_disk, whole output is kept in a temporary file
+            - without it, output is cut at the limit and marked as truncated
+        """
+        with SshExecutor(
+            host_data=local_ssh_host_data,
+            output_memory_limit=1000,
+            spill_to_disk=spill_to_disk,
+        ) as ssh_executor:
+            result = ssh_executor.execute("seq 1000 2999")
+            result.recv_exit_status() | should.be.equal.to(0)
+
+            len(result.read(channel="stdout")) | should.be.equal.to(expected_lines)
+            result.is_truncated(channel="stdout") | should.be.equal.to(truncated)
+            result.close()
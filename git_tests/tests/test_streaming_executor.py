@@ -0,0 +1,85 @@
+import signal
+from pathlib import Path
+
+import pytest
+from grappa import should
+
+from git_tests.tools.executors.local_executor import LocalStreamingExecutor
+
+
+@pytest.mark.order(15)
+class TestLocalStreamingExecutor:
+    """Verification of early stop, tail and process cleanup of LocalStreamingExecutor."""
+
+    long_running_command = ["sh", "-c", "echo starting; echo ready; exec sleep 31.5"]
+
+    def test_stop_on_matched_line(self):
+        """
+        Given:
+            - command which prints "ready" and then runs for 30 seconds
+        When:
+            - it is executed with stop_when matching "ready"
+        Then:
+            - process is terminated right after the line, nothing is left running
+            - result is stopped, with rc -SIGTERM and stdout ending with the line
+        """
+        executor = LocalStreamingExecutor(stop_when=lambda line: "ready" in line)
+
+        result = executor.execute(self.long_running_command)
+
+        result.stopped | should.be.true
+        result.rc | should.be.equal.to(-signal.SIGTERM)
+        result.stdout | should.be.equal.to("starting\nready\n")
+        self._get_processes(["sleep", "31.5"]) | should.be.empty
+
+    def test_callback_and_tail(self):
+        """
+        Given:
+            - command which prints 10 lines, to stdout and stderr
+        When:
+            - it is executed keeping 3 lines, with a callback
+        Then:
+            - callback gets every stdout line
+            - result has the last 3 lines of each output, not stopped, rc 0
+        """
+        lines = []
+        executor = LocalStreamingExecutor(callback=lines.append, keep_lines=3)
+
+        result = executor.execute("seq 1 10; seq 11 20 >&2")
+
+        lines | should.be.equal.to([f"{number}\n" for number in range(1, 11)])
+        result.stdout | should.be.equal.to("8\n9\n10\n")
+        result.stderr | should.be.equal.to("18\n19\n20\n")
+        result.stopped | should.be.false
+        result.rc | should.be.equal.to(0)
+
+    def test_leaving_stream_early_terminates_process(self):
+        """
+        Given:
+            - output stream of a long running command
+        When:
+            - the iteration is left after the first line, without context manager
+        Then:
+            - process is terminated when the iterator is closed
+        """
+        stream = LocalStreamingExecutor().stream(self.long_running_command)
+
+        for line in stream:
+            line | should.be.equal.to("starting\n")
+            break
+
+        self._get_processes(["sleep", "31.5"]) | should.be.empty
+        stream.close_process() | should.be.equal.to(-signal.SIGTERM)
+
+    @staticmethod
+    def _get_processes(argv: list[str]) -> list[Path]:
+        """Returns /proc entries of running processes with exactly the given arguments."""
+        expected = "\0".join(argv).encode() + b"\0"
+        processes = []
+        for cmdline in Path("/proc").glob("[0-9]*/cmdline"):
+            try:
+                if cmdline.read_bytes() == expected:
+                    processes.append(cmdline.parent)
+            except OSError:
+                pass
+        return processes
@@ -0,0 +1,363 @@
+import math
+import random
+import statistics
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Literal
+
+from git_tests.tools.benchmark_runner import BenchmarkReport, BenchmarkResult
+
+
+def load_benchmark_reports(paths: list[Path]) -> BenchmarkReport:
+    """Loads and merges benchmark reports, e.g. written by pytest-xdist workers.
+
+    Args:
+        paths: report files of one run
+
+    Returns:
+        report with results of all files and metadata of the first one
+    """
+    if not paths:
+        raise ValueError("No benchmark reports given")
+    reports = [BenchmarkReport.load(path) for path in paths]
+    git_versions = {report.metadata.get("git_version") for report in reports}
+    if len(git_versions) > 1:
+        raise ValueError(
+            f"Reports of one run have different git versions: {git_versions}"
+        )
+    return BenchmarkReport(
+        metadata=reports[0].metadata,
+        results=[result for report in reports for result in report.results],
+    )
+
+
+def mann_whitney_u(
+    baseline: list[float], candidate: list[float]
+) -> tuple[float, float]:
+    """One-sided Mann-Whitney U test, for candidate samples being greater (slower).
+
+    Exact distribution is used for small samples without ties,
+    normal approximation with tie and continuity correction otherwise.
+
+    Args:
+        baseline: samples of the baseline
+        candidate: samples of the candidate
+
+    Returns:
+        U statistic of the candidate and p-value
+    """
+    n1, n2 = len(baseline), len(candidate)
+    ranked = sorted(
+        [(value, 0) for value in baseline] + [(value, 1) for value in candidate]
+    )
+    ranks = [0.0] * len(ranked)
+    tie_sizes = []
+    start = 0
+    while start < len(ranked):
+        end = start
+        while end + 1 < len(ranked) and ranked[end + 1][0] == ranked[start][0]:
+            end += 1
+        for index in range(start, end + 1):
+            ranks[index] = (start + end) / 2 + 1
+        tie_sizes.append(end - start + 1)
+        start = end + 1
+
+    candidate_ranks = sum(rank for rank, (_, group) in zip(ranks, ranked) if group == 1)
+    u_statistic = candidate_ranks - n2 * (n2 + 1) / 2
+
+    if n1 <= 20 and n2 <= 20 and all(size == 1 for size in tie_sizes):
+        return u_statistic, _get_exact_u_tail(n1, n2, u_statistic)
+
+    mean = n1 * n2 / 2
+    total = n1 + n2
+    tie_correction = sum(size**3 - size for size in tie_sizes) / (total * (total - 1))
+    variance = n1 * n2 / 12 * (total + 1 - tie_correction)
+    if variance <= 0:
+        return u_statistic, 1.0
+    z_score = (u_statistic - mean - 0.5) / math.sqrt(variance)
+    return u_statistic, 0.5 * math.erfc(z_score / math.sqrt(2))
+
+
+def _get_exact_u_tail(n1: int, n2: int, u_statistic: float) -> float:
+    """Returns P(U >= u_statistic) under the null hypothesis, without ties."""
+    # counts[i][j][u]: orderings of i baseline and j candidate samples with U = u
+    counts = [[[1] for _ in range(n2 + 1)] for _ in range(n1 + 1)]
+    for i in range(n1 + 1):
+        for j in range(n2 + 1):
+            if i == 0 or j == 0:
+                continue
+            # the largest sample is a candidate one (adds i to U) or a baseline one
+            with_candidate = [0] * i + counts[i][j - 1]
+            with_baseline = counts[i - 1][j]
+            size = max(len(with_candidate), len(with_baseline))
+            counts[i][j] = [
+                (with_candidate[u] if u < len(with_candidate) else 0)
+                + (with_baseline[u] if u < len(with_baseline) else 0)
+                for u in range(size)
+            ]
+    distribution = counts[n1][n2]
+    tail = sum(distribution[math.ceil(u_statistic) :])
+    return tail / math.comb(n1 + n2, n1)
+
+
+def bootstrap_median_ratio(
+    baseline: list[float],
+    candidate: list[float],
+    resamples: int = 2000,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> tuple[float, float]:
+    """Bootstrap confidence interval of median(candidate) / median(baseline).
+
+    Args:
+        baseline: samples of the baseline
+        candidate: samples of the candidate
+        resamples: number of bootstrap resamples
+        confidence: confidence level of the interval
+        seed: seed of the random generator, for repeatable results
+
+    Returns:
+        lower and upper bound of the interval
+    """
+    rng = random.Random(seed)
+    ratios = []
+    for _ in range(resamples):
+        baseline_median = statistics.median(rng.choices(baseline, k=len(baseline)))
+        candidate_median = statistics.median(rng.choices(candidate, k=len(candidate)))
+        ratios.append(candidate_median / max(baseline_median, 1e-12))
+    ratios.sort()
+    tail = (1 - confidence) / 2
+    return (
+        ratios[int(tail * (resamples - 1))],
+        ratios[math.ceil((1 - tail) * (resamples - 1))],
+    )
+
+
+@dataclass
+class BenchmarkComparison:
+    """Comparison of one Command variant on one repository size.
+
+    Args:
+        name: name of the benchmarked Command variant
+        size: name of the repository size
+        status: "regression", "improvement", "unchanged",
+            "failed" (candidate failed), "missing" (in the baseline only)
+            or "new" (no successful baseline result)
+        baseline_median: median of the baseline samples, in seconds
+        candidate_median: median of the candidate samples, in seconds
+        ratio: candidate_median / baseline_median
+        p_value: one-sided p-value of the Mann-Whitney test, for the detected direction
+        interval: bootstrap confidence interval of the ratio
+    """
+
+    name: str
+    size: str
+    status: str
+    baseline_median: float | None = None
+    candidate_median: float | None = None
+    ratio: float | None = None
+    p_value: float | None = None
+    interval: tuple[float, float] | None = None
+
+
+@dataclass
+class ComparisonResult:
+    """Comparison of two benchmark runs.
+
+    Args:
+        baseline: metadata of the baseline run
+        candidate: metadata of the candidate run
+        comparisons: comparison of every Command variant and size
+        allow_missing: if baseline cases missing in the candidate run pass the gate
+    """
+
+    baseline: dict
+    candidate: dict
+    comparisons: list[BenchmarkComparison] = field(default_factory=list)
+    allow_missing: bool = False
+
+    @property
+    def regressions(self) -> list[BenchmarkComparison]:
+        """Comparisons which fail the gate: regressions, failed candidates
+        and, unless allowed, cases missing in the candidate run
+        (e.g. report of a worker not written, or a variant crashed before reporting).
+        """
+        failing = {"regression", "failed"} | (
+            set() if self.allow_missing else {"missing"}
+        )
+        return [
+            comparison
+            for comparison in self.comparisons
+            if comparison.status in failing
+        ]
+
+    @property
+    def compared(self) -> int:
+        """Number of cases with samples in both runs."""
+        return sum(1 for comparison in self.comparisons if comparison.ratio is not None)
+
+    @property
+    def exit_code(self) -> int:
+        """0 if some cases were compared and none of them failed the gate, 1 otherwise."""
+        return 1 if self.regressions or not self.compared else 0
+
+    def summary(self) -> list[str]:
+        """Human-readable table of all comparisons."""
+        lines = [
+            f"baseline:  {self.baseline.get('git_version')}, "
+            f"revision {self.baseline.get('harness_revision')}",
+            f"candidate: {self.candidate.get('git_version')}, "
+            f"revision {self.candidate.get('harness_revision')}",
+        ]
+        if not self.comparisons:
+            return lines
+        width = max(len(comparison.name) for comparison in self.comparisons)
+        lines.append(
+            f"{'command':<{width}} {'size':<8} {'baseline':>10} {'candidate':>10} "
+            f"{'ratio':>7} {'evidence':>18}  status"
+        )
+        for comparison in self.comparisons:
+            if comparison.ratio is None:
+                lines.append(
+                    f"{comparison.name:<{width}} {comparison.size:<8} "
+                    f"{'':>10} {'':>10} {'':>7} {'':>18}  {comparison.status}"
+                )
+                continue
+            if comparison.interval is not None:
+                evidence = (
+                    f"[{comparison.interval[0]:.3f}, {comparison.interval[1]:.3f}]"
+                )
+            else:
+                evidence = f"p={comparison.p_value:.4f}"
+            lines.append(
+                f"{comparison.name:<{width}} {comparison.size:<8} "
+                f"{comparison.baseline_median * 1000:>8.2f}ms "
+                f"{comparison.candidate_median * 1000:>8.2f}ms "
+                f"{comparison.ratio:>7.3f} {evidence:>18}  {comparison.status}"
+            )
+        return lines
+
+
+class BenchmarkComparator:
+    """Statistical comparison of two benchmark runs (BenchmarkReport),
+    e.g. of two git versions or of two revisions of this harness.
+
+    A Command variant on a repository size regresses if its median is slower
+    by more than the threshold, and the difference is significant:
+        - "mannwhitney": one-sided Mann-Whitney U test p-value below alpha
+        - "bootstrap": whole bootstrap confidence interval of the median ratio
+          (confidence 1 - alpha) above 1 + threshold
+    Improvements are detected the same way, in the other direction.
+    """
+
+    def __init__(
+        self,
+        metric: Literal["wall", "cpu"] = "wall",
+        method: Literal["mannwhitney", "bootstrap"] = "mannwhitney",
+        threshold: float = 0.05,
+        alpha: float = 0.01,
+        allow_missing: bool = False,
+    ) -> None:
+        """Constructor method for BenchmarkComparator.
+
+        Args:
+            metric: compared samples, wall time or CPU time
+            method: statistical test
+            threshold: smallest relative slowdown reported, e.g. 0.05 for 5%
+            alpha: significance level
+            allow_missing: if baseline cases missing in the candidate run pass the gate
+        """
+        self.metric = metric
+        self.method = method
+        self.threshold = threshold
+        self.alpha = alpha
+        self.allow_missing = allow_missing
+
+    def compare(
+        self, baseline: BenchmarkReport, candidate: BenchmarkReport
+    ) -> ComparisonResult:
+        """Compares every Command variant and size of both runs.
+
+        Args:
+            baseline: reference run
+            candidate: compared run
+        """
+        baseline_results = {
+            (result.name, result.size): result for result in baseline.results
+        }
+        candidate_results = {
+            (result.name, result.size): result for result in candidate.results
+        }
+        comparison_result = ComparisonResult(
+            baseline=baseline.metadata,
+            candidate=candidate.metadata,
+            allow_missing=self.allow_missing,
+        )
+        for key in sorted(baseline_results.keys() | candidate_results.keys()):
+            if key not in baseline_results or key not in candidate_results:
+                comparison_result.comparisons.append(
+                    BenchmarkComparison(
+                        name=key[0],
+                        size=key[1],
+                        status="new" if key in candidate_results else "missing",
+                    )
+                )
+                continue
+            comparison_result.comparisons.append(
+                self.__compare_results(baseline_results[key], candidate_results[key])
+            )
+        return comparison_result
+
+    def __compare_results(
+        self, baseline: BenchmarkResult, candidate: BenchmarkResult
+    ) -> BenchmarkComparison:
+        """Compares samples of one Command variant and size."""
+        comparison = BenchmarkComparison(
+            name=candidate.name, size=candidate.size, status="unchanged"
+        )
+        if not candidate.successful:
+            comparison.status = "failed"
+            return comparison
+        if not baseline.successful:
+            comparison.status = "new"
+            return comparison
+
+        baseline_samples = self.__get_samples(baseline)
+        candidate_samples = self.__get_samples(candidate)
+        comparison.baseline_median = statistics.median(baseline_samples)
+        comparison.candidate_median = statistics.median(candidate_samples)
+        comparison.ratio = comparison.candidate_median / max(
+            comparison.baseline_median, 1e-12
+        )
+        slower = comparison.ratio > 1 + self.threshold
+        faster = comparison.ratio < 1 / (1 + self.threshold)
+
+        if self.method == "bootstrap":
+            comparison.interval = bootstrap_median_ratio(
+                baseline_samples, candidate_samples, confidence=1 - self.alpha
+            )
+            low, high = comparison.interval
+            slower = slower and low > 1 + self.threshold
+            faster = faster and high < 1 / (1 + self.threshold)
+        else:
+            if faster:
+                _, comparison.p_value = mann_whitney_u(
+                    candidate_samples, baseline_samples
+                )
+            else:
+                _, comparison.p_value = mann_whitney_u(
+                    baseline_samples, candidate_samples
+                )
+            slower = slower and comparison.p_value < self.alpha
+            faster = faster and comparison.p_value < self.alpha
+
+        if slower:
+            comparison.status = "regression"
+        elif faster:
+            comparison.status = "improvement"
+        return comparison
+
+    def __get_samples(self, result: BenchmarkResult) -> list[float]:
+        """Returns samples of the compared metric."""
+        return result.wall_samples if self.metric == "wall" else result.cpu_samples
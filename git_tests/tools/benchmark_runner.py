@@ -0,0 +1,387 @@
+import dataclasses
+import json
+import math
+import platform
+import resource
+import shutil
+import statistics
+import time
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from git_tests.helpers.commands.command_protocol import CommandProtocol
+from git_tests.tools.executors.local_executor import LocalExecutor
+
+
+BENCHMARK_FORMAT_VERSION = 1
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Returns percentile of the samples, with linear interpolation between them.
+
+    Args:
+        samples: measured values, at least one
+        fraction: percentile as a fraction, e.g. 0.95 for p95
+    """
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * fraction
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+@dataclass
+class BenchmarkStatistics:
+    """Statistics of one measured quantity, in seconds.
+
+    Args:
+        median: median of the samples
+        p95: 95th percentile
+        p99: 99th percentile
+        mean: arithmetic mean
+        stdev: sample standard deviation, 0 for a single sample
+        min: smallest sample
+        max: largest sample
+    """
+
+    median: float
+    p95: float
+    p99: float
+    mean: float
+    stdev: float
+    min: float
+    max: float
+
+    @classmethod
+    def from_samples(cls, samples: list[float]) -> "BenchmarkStatistics | None":
+        """Computes statistics, None if there are no samples.
+
+        Args:
+            samples: measured values
+        """
+        if not samples:
+            return None
+        return cls(
+            median=statistics.median(samples),
+            p95=percentile(samples, 0.95),
+            p99=percentile(samples, 0.99),
+            mean=statistics.fmean(samples),
+            stdev=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            min=min(samples),
+            max=max(samples),
+        )
+
+
+@dataclass
+class BenchmarkCase:
+    """One Command variant, benchmarked on one repository size.
+
+    Args:
+        command: Command class, e.g. StatusCommand
+        variant: command variant
+        size: name of the repository size, e.g. "small"
+        prepare: creates state for one iteration in the given empty directory
+            and returns the Command ready to run; not measured
+        read_only: if the Command doesn't change the state, so it is prepared once
+            and run by all iterations
+        teardown: called after the last iteration, e.g. for cleaning the server
+    """
+
+    command: type[CommandProtocol]
+    variant: str
+    size: str
+    prepare: Callable[[Path], CommandProtocol] = field(repr=False)
+    read_only: bool = False
+    teardown: Callable[[], None] | None = field(default=None, repr=False)
+
+    @property
+    def name(self) -> str:
+        """Name of the benchmarked Command variant, e.g. "StatusCommand.porcelain"."""
+        return f"{self.command.__name__}.{self.variant}"
+
+    @property
+    def id(self) -> str:
+        """Unique id of the case, e.g. "StatusCommand.porcelain[small]"."""
+        return f"{self.name}[{self.size}]"
+
+
+@dataclass
+class BenchmarkResult:
+    """Result of one BenchmarkCase.
+
+    Args:
+        name: name of the benchmarked Command variant
+        size: name of the repository size
+        warmup: number of not recorded iterations
+        iterations: number of recorded iterations, after calibration
+        wall_samples: wall time of every recorded iteration
+        cpu_samples: CPU time (user + system) of every recorded iteration,
+            of this process and of the processes it started and waited for
+        wall: statistics of wall_samples
+        cpu: statistics of cpu_samples
+        failures: errors of failed iterations; the case stops at the first one
+    """
+
+    name: str
+    size: str
+    warmup: int
+    iterations: int
+    wall_samples: list[float] = field(default_factory=list)
+    cpu_samples: list[float] = field(default_factory=list)
+    wall: BenchmarkStatistics | None = None
+    cpu: BenchmarkStatistics | None = None
+    failures: list[str] = field(default_factory=list)
+
+    @property
+    def successful(self) -> bool:
+        return not self.failures and bool(self.wall_samples)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BenchmarkResult":
+        """Creates result from its JSON form.
+
+        Args:
+            data: result as written by BenchmarkReport.write()
+        """
+        result = cls(
+            **{
+                name: value
+                for name, value in data.items()
+                if name not in ("wall", "cpu")
+            }
+        )
+        result.wall = BenchmarkStatistics.from_samples(result.wall_samples)
+        result.cpu = BenchmarkStatistics.from_samples(result.cpu_samples)
+        return result
+
+
+@dataclass
+class BenchmarkReport:
+    """Benchmark results of one run, with information about the environment.
+
+    Args:
+        metadata: git version, harness revision, platform, runner settings, etc.
+        results: results of all cases
+    """
+
+    metadata: dict[str, Any] = field(default_factory=dict)
+    results: list[BenchmarkResult] = field(default_factory=list)
+
+    def write(self, path: Path) -> None:
+        """Writes report as JSON.
+
+        Args:
+            path: destination file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(
+                {
+                    "format_version": BENCHMARK_FORMAT_VERSION,
+                    "metadata": self.metadata,
+                    "results": [dataclasses.asdict(result) for result in self.results],
+                },
+                indent=2,
+            )
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "BenchmarkReport":
+        """Loads report written by write().
+
+        Args:
+            path: report file
+        """
+        data = json.loads(path.read_text())
+        if data.get("format_version") != BENCHMARK_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported benchmark report format: {data.get('format_version')}"
+            )
+        return cls(
+            metadata=data["metadata"],
+            results=[BenchmarkResult.from_dict(result) for result in data["results"]],
+        )
+
+    def summary(self) -> list[str]:
+        """Human-readable table: median, p95 and p99 of wall time and median CPU time."""
+        if not self.results:
+            return []
+        width = max(len(result.name) for result in self.results)
+        lines = [
+            f"{'command':<{width}} {'size':<8} {'iters':>5} "
+            f"{'median':>9} {'p95':>9} {'p99':>9} {'cpu':>9}"
+        ]
+        for result in self.results:
+            if not result.successful:
+                lines.append(
+                    f"{result.name:<{width}} {result.size:<8} FAILED: "
+                    f"{'; '.join(result.failures)[:120]}"
+                )
+                continue
+            lines.append(
+                f"{result.name:<{width}} {result.size:<8} {result.iterations:>5} "
+                f"{result.wall.median * 1000:>7.2f}ms {result.wall.p95 * 1000:>7.2f}ms "
+                f"{result.wall.p99 * 1000:>7.2f}ms {result.cpu.median * 1000:>7.2f}ms"
+            )
+        return lines
+
+
+class BenchmarkRunner:
+    """Runs BenchmarkCases repeatedly and measures wall and CPU time of the Command.
+
+    Every case starts with warmup iterations, which are not recorded. Their median
+    calibrates the number of recorded iterations, so a case takes about target_seconds,
+    within min_iterations and max_iterations. Only Command.run() is measured,
+    preparing and deleting the state of an iteration is not.
+
+    CPU time includes the processes started by the Command (e.g. git and ssh),
+    which is only correct if nothing else runs in this process at the same time.
+    """
+
+    def __init__(
+        self,
+        work_dir: Path,
+        warmup: int = 1,
+        min_iterations: int = 5,
+        max_iterations: int = 50,
+        target_seconds: float = 2.0,
+    ) -> None:
+        """Constructor method for BenchmarkRunner.
+
+        Args:
+            work_dir: directory for the states of iterations
+            warmup: number of not recorded iterations, used for calibration
+            min_iterations: minimum number of recorded iterations
+            max_iterations: maximum number of recorded iterations
+            target_seconds: intended measured time of all recorded iterations
+        """
+        self.__work_dir = work_dir
+        self.warmup = warmup
+        self.min_iterations = min_iterations
+        self.max_iterations = max_iterations
+        self.target_seconds = target_seconds
+
+    @property
+    def settings(self) -> dict[str, Any]:
+        """Runner settings, for the report metadata."""
+        return {
+            "warmup": self.warmup,
+            "min_iterations": self.min_iterations,
+            "max_iterations": self.max_iterations,
+            "target_seconds": self.target_seconds,
+        }
+
+    def run(self, case: BenchmarkCase) -> BenchmarkResult:
+        """Runs warmup, calibration and recorded iterations of the case.
+
+        Args:
+            case: case to run
+        """
+        case_dir = Path(self.__work_dir, case.id)
+        if case_dir.exists():
+            shutil.rmtree(case_dir)
+        case_dir.mkdir(parents=True)
+        result = BenchmarkResult(
+            name=case.name, size=case.size, warmup=self.warmup, iterations=0
+        )
+        try:
+            shared_command = None
+            if case.read_only:
+                Path(case_dir, "shared").mkdir()
+                shared_command = case.prepare(Path(case_dir, "shared"))
+
+            warmup_samples = []
+            for iteration in range(self.warmup):
+                wall, _ = self.__run_iteration(
+                    case, shared_command, Path(case_dir, f"warmup_{iteration}")
+                )
+                warmup_samples.append(wall)
+
+            result.iterations = self.__calibrate(warmup_samples)
+            for iteration in range(result.iterations):
+                wall, cpu = self.__run_iteration(
+                    case, shared_command, Path(case_dir, str(iteration))
+                )
+                result.wall_samples.append(wall)
+                result.cpu_samples.append(cpu)
+        except Exception as error:
+            result.failures.append(f"{type(error).__name__}: {error}")
+        finally:
+            if case.teardown is not None:
+                case.teardown()
+            shutil.rmtree(case_dir, ignore_errors=True)
+
+        result.wall = BenchmarkStatistics.from_samples(result.wall_samples)
+        result.cpu = BenchmarkStatistics.from_samples(result.cpu_samples)
+        return result
+
+    def __calibrate(self, warmup_samples: list[float]) -> int:
+        """Returns number of recorded iterations, from the warmup wall times."""
+        if not warmup_samples:
+            return self.min_iterations
+        iteration_seconds = max(statistics.median(warmup_samples), 1e-6)
+        iterations = math.ceil(self.target_seconds / iteration_seconds)
+        return max(self.min_iterations, min(self.max_iterations, iterations))
+
+    @staticmethod
+    def __run_iteration(
+        case: BenchmarkCase,
+        shared_command: CommandProtocol | None,
+        iteration_dir: Path,
+    ) -> tuple[float, float]:
+        """Prepares state, runs the Command and returns its wall and CPU time."""
+        command = shared_command
+        if command is None:
+            iteration_dir.mkdir()
+            command = case.prepare(iteration_dir)
+
+        cpu_start = BenchmarkRunner.__get_cpu_time()
+        wall_start = time.perf_counter()
+        command_result = command.run()
+        wall = time.perf_counter() - wall_start
+        cpu = BenchmarkRunner.__get_cpu_time() - cpu_start
+
+        if shared_command is None:
+            shutil.rmtree(iteration_dir, ignore_errors=True)
+        if command_result.rc != 0:
+            raise RuntimeError(
+                f"rc {command_result.rc}: {str(command_result.stderr)[:500]}"
+            )
+        return wall, cpu
+
+    @staticmethod
+    def __get_cpu_time() -> float:
+        """CPU time of this process and its waited-for children, in seconds."""
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def get_benchmark_metadata(
+    base_dir: Path, runner: BenchmarkRunner, **extra: Any
+) -> dict[str, Any]:
+    """Returns environment information for BenchmarkReport.
+
+    Args:
+        base_dir: directory of the harness repository
+        runner: runner used for the results
+        extra: additional metadata, e.g. repository sizes
+    """
+    local_executor = LocalExecutor()
+    git_version = local_executor.execute(["git", "--version"], raw_output=True)
+    revision = local_executor.execute(
+        ["git", "-C", str(base_dir), "rev-parse", "HEAD"], raw_output=True
+    )
+    return {
+        "git_version": git_version.stdout.decode().strip(),
+        "harness_revision": (
+            revision.stdout.decode().strip() if revision.rc == 0 else None
+        ),
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "runner": runner.settings,
+        **extra,
+    }
@@ -0,0 +1,191 @@
+import dataclasses
+import hashlib
+import json
+import shlex
+
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Literal
+
+import paramiko
+
+from git_tests.tools.executors.local_executor import LocalExecutor
+from git_tests.tools.executors.ssh_executor import (
+    SshConnectionPool,
+    SshExecutor,
+    SshHostData,
+)
+
+
+@dataclass
+class EnvironmentFingerprint:
+    """State of the test environment, which decides if provisioning is needed.
+
+    Args:
+        playbooks: sha256 of every playbook file, by file name
+        inventory: sha256 of the inventory file
+        git_versions: "git --version" output of every host, None if git is missing
+        server_repo_state: sha256 of refs and objects of the server test repository
+    """
+
+    playbooks: dict[str, str]
+    inventory: str
+    git_versions: dict[str, str | None]
+    server_repo_state: str
+
+    def to_json(self) -> str:
+        """Serializes fingerprint, in a stable form."""
+        return json.dumps(dataclasses.asdict(self), sort_keys=True)
+
+    @classmethod
+    def from_json(cls, data: str) -> "EnvironmentFingerprint | None":
+        """Deserializes fingerprint, returns None for missing or broken data."""
+        try:
+            return cls(**json.loads(data))
+        except (TypeError, ValueError):
+            return None
+
+    def same_configuration(self, other: "EnvironmentFingerprint") -> bool:
+        """Checks if everything except the server repository state is the same."""
+        return (
+            self.playbooks == other.playbooks
+            and self.inventory == other.inventory
+            and self.git_versions == other.git_versions
+        )
+
+
+class EnvironmentFingerprintCollector:
+    """Collects EnvironmentFingerprint and stores it on both hosts.
+
+    Fingerprint is stored right after provisioning. In the next session,
+    provisioning is:
+        - skipped, if nothing has changed
+        - limited to the server configuration, if only the server repository changed
+        - fully executed otherwise, or if any host can't be checked
+
+    Tests push into the server repository, so it must be restored
+    to its provisioned state at the end of the session (see worker_repository
+    in conftest.py), otherwise the next session always sees a changed repository.
+    """
+
+    fingerprint_file_name = ".git_tests_env_fingerprint"
+
+    def __init__(
+        self,
+        playbooks: list[Path],
+        inventory_file: Path,
+        local_fingerprint_file: Path,
+        host_data: SshHostData,
+        server_repo_path: PurePosixPath,
+        ssh_connection_pool: SshConnectionPool | None = None,
+    ) -> None:
+        """Constructor method for EnvironmentFingerprintCollector.
+
+        Args:
+            playbooks: playbook files used for provisioning
+            inventory_file: inventory file used for provisioning
+            local_fingerprint_file: where to store fingerprint on the tests host
+            host_data: git server connection information
+            server_repo_path: test repository on the git server
+            ssh_connection_pool: pool of connections to use, optional
+        """
+        self.__playbooks = playbooks
+        self.__inventory_file = inventory_file
+        self.__local_fingerprint_file = local_fingerprint_file
+        self.__host_data = host_data
+        self.__server_repo_path = server_repo_path
+        self.__ssh_connection_pool = ssh_connection_pool
+        self.__local_executor = LocalExecutor()
+
+    def get_provisioning_plan(self) -> Literal["skip", "server", "full"]:
+        """Compares current fingerprint with the stored ones.
+
+        Returns:
+            "skip" - nothing to do, "server" - only server configuration, "full" - everything
+        """
+        try:
+            current, stored_on_server = self.__collect()
+        except (paramiko.SSHException, OSError, EOFError):
+            return "full"
+
+        stored_locally = None
+        if self.__local_fingerprint_file.exists():
+            stored_locally = EnvironmentFingerprint.from_json(
+                self.__local_fingerprint_file.read_text()
+            )
+        if stored_locally is None or stored_locally != stored_on_server:
+            return "full"
+        if not current.same_configuration(stored_locally):
+            return "full"
+        if current.server_repo_state != stored_locally.server_repo_state:
+            return "server"
+        return "skip"
+
+    def store(self) -> None:
+        """Collects current fingerprint and stores it on both hosts.
+        Should be called right after provisioning.
+        """
+        current, _ = self.__collect()
+        data = current.to_json()
+        with SshExecutor(
+            host_data=self.__host_data, pool=self.__ssh_connection_pool
+        ) as ssh_executor:
+            result = ssh_executor.execute(
+                f"printf '%s' {shlex.quote(data)} > ~/{self.fingerprint_file_name}"
+            )
+            if result.recv_exit_status() != 0:
+                raise RuntimeError(
+                    f"Fingerprint not stored: {result.read(channel='stderr')}"
+                )
+        self.__local_fingerprint_file.write_text(data)
+
+    def __collect(
+        self,
+    ) -> tuple[EnvironmentFingerprint, EnvironmentFingerprint | None]:
+        """Returns current fingerprint and the one stored on the server.
+        All server data is read in one round-trip.
+        """
+        local_git_version = self.__local_executor.execute(["git", "--version"])
+        repo = shlex.quote(str(self.__server_repo_path))
+        with SshExecutor(
+            host_data=self.__host_data, pool=self.__ssh_connection_pool
+        ) as ssh_executor:
+            git_version, repo_state, stored = ssh_executor.execute_batch(
+                [
+                    "git --version",
+                    f"git --git-dir={repo} symbolic-ref HEAD"
+                    f" && git --git-dir={repo} for-each-ref"
+                    f" && git --git-dir={repo} count-objects -v",
+                    f"cat ~/{self.fingerprint_file_name}",
+                ]
+            )
+
+        current = EnvironmentFingerprint(
+            playbooks={
+                playbook.name: self.__hash_file(playbook)
+                for playbook in self.__playbooks
+            },
+            inventory=self.__hash_file(self.__inventory_file),
+            git_versions={
+                "localhost": (
+                    local_git_version.stdout if local_git_version.rc == 0 else None
+                ),
+                self.__host_data.host: (
+                    "".join(git_version.stdout) if git_version.rc == 0 else None
+                ),
+            },
+            server_repo_state=hashlib.sha256(
+                f"{repo_state.rc}:{''.join(repo_state.stdout)}".encode()
+            ).hexdigest(),
+        )
+        stored_on_server = (
+            EnvironmentFingerprint.from_json("".join(stored.stdout))
+            if stored.rc == 0
+            else None
+        )
+        return current, stored_on_server
+
+    @staticmethod
+    def __hash_file(path: Path) -> str:
+        """Returns sha256 of the file content."""
+        return hashlib.sha256(path.read_bytes()).hexdigest()
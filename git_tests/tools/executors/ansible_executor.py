@@ -1,6 +1,12 @@
 # TODO: can be covered by Adapter pattern
 import abc
-from dataclasses import dataclass
+import dataclasses
+import datetime
+import json
+import threading
+import uuid
+import warnings
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Protocol, Literal
 from ansible_runner.interface import run
@@ -20,6 +26,33 @@ class AnsibleResultStats:
     changed: dict[str, int]
 
 
+@dataclass
+class AnsibleTaskTiming:
+    """Timing of one Ansible task on one host.
+
+    Args:
+        playbook: playbook file name
+        play: play name
+        task: task name
+        host: host the task was executed on
+        start: start time, unix timestamp
+        end: end time, unix timestamp
+        outcome: task result
+    """
+
+    playbook: str
+    play: str
+    task: str
+    host: str
+    start: float
+    end: float
+    outcome: Literal["ok", "changed", "failed", "skipped", "unreachable"]
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
 @dataclass
 class AnsibleExecutorResult:
     """Result structure for AnsibleExecutor instances.
@@ -27,42 +60,187 @@ class AnsibleExecutorResult:
     Args:
         status: Playbook execution status
         stats: stats collected by Playbook
+        task_timings: timing of every executed task
+        artifacts_dir: directory with artifacts of the run, None if not stored
     """
 
     status: Literal[
         "starting", "running", "canceled", "timeout", "failed", "successful"
     ]
     stats: AnsibleResultStats
+    task_timings: list[AnsibleTaskTiming] = field(default_factory=list)
+    artifacts_dir: Path | None = None
+
+
+class AnsibleTaskTimingCollector:
+    """Ansible Runner event handler, which records timing of every task.
+
+    Task start is taken from the "runner_on_start" event,
+    and its end from the first result event of the same task and host.
+    """
+
+    outcome_events = {
+        "runner_on_ok": "ok",
+        "runner_on_failed": "failed",
+        "runner_on_skipped": "skipped",
+        "runner_on_unreachable": "unreachable",
+    }
+
+    def __init__(self) -> None:
+        """Constructor method for AnsibleTaskTimingCollector."""
+        self.timings: list[AnsibleTaskTiming] = []
+        self.__started: dict[tuple[str, str], float] = {}
+        self.__lock = threading.Lock()
+
+    def handle_event(self, event: dict) -> bool:
+        """Event handler for ansible_runner.run.
+
+        Args:
+            event: Ansible Runner event
+
+        Returns:
+            True, so the event is stored in artifacts as well
+        """
+        event_name = event.get("event")
+        event_data = event.get("event_data", {})
+        key = (event_data.get("task_uuid"), event_data.get("host"))
+        timestamp = self.__get_timestamp(event)
+
+        with self.__lock:
+            if event_name == "runner_on_start":
+                self.__started[key] = timestamp
+            elif event_name in self.outcome_events and key in self.__started:
+                outcome = self.outcome_events[event_name]
+                if outcome == "ok" and event_data.get("res", {}).get("changed"):
+                    outcome = "changed"
+                self.timings.append(
+                    AnsibleTaskTiming(
+                        playbook=Path(event_data.get("playbook", "")).name,
+                        play=event_data.get("play", ""),
+                        task=event_data.get("task", ""),
+                        host=event_data.get("host", ""),
+                        start=self.__started.pop(key),
+                        end=timestamp,
+                        outcome=outcome,
+                    )
+                )
+        return True
+
+    @staticmethod
+    def __get_timestamp(event: dict) -> float:
+        """Event creation time (UTC, ISO format), or now if missing."""
+        created = event.get("created")
+        if not created:
+            return datetime.datetime.now(datetime.timezone.utc).timestamp()
+        return (
+            datetime.datetime.fromisoformat(created)
+            .replace(tzinfo=datetime.timezone.utc)
+            .timestamp()
+        )
+
+
+def get_slowest_tasks_summary(
+    task_timings: list[AnsibleTaskTiming], limit: int = 10
+) -> list[str]:
+    """Human-readable lines with the slowest tasks, slowest first.
+
+    Args:
+        task_timings: timings to summarize
+        limit: number of tasks to show
+    """
+    slowest = sorted(task_timings, key=lambda timing: timing.duration, reverse=True)
+    return [
+        f"{timing.duration:7.2f}s  {timing.outcome:<11} {timing.host}: "
+        f"{timing.playbook} / {timing.task}"
+        for timing in slowest[:limit]
+    ]
 
 
 class AnsibleExecutorProtocol(Protocol):
     """Protocol for the AnsibleExecutor instances."""
 
     @abc.abstractmethod
-    def execute(self, playbook: Path, inventory: Path) -> AnsibleExecutorResult:
+    def execute(
+        self, playbook: Path, inventory: Path, limit: str | None = None
+    ) -> AnsibleExecutorResult:
         """Run Ansible Playbook.
 
         Args:
             playbook: path to the playbook to play
             inventory: path to the inventory file
+            limit: host pattern to limit the play to, all hosts if None
         """
         pass
 
 
 class AnsibleExecutor(AnsibleExecutorProtocol):
-    """Runs Ansible Playbooks."""
+    """Runs Ansible Playbooks.
+    Records timing of every task and optionally stores artifacts of every run.
+    """
+
+    task_timings_file_name = "task_timings.json"
+
+    def __init__(self, artifacts_dir: Path | None = None) -> None:
+        """Constructor method for AnsibleExecutor.
 
-    def execute(self, playbook: Path, inventory: Path) -> AnsibleExecutorResult:
+        Args:
+            artifacts_dir: where to store Ansible Runner artifacts (stdout, job events)
+                and task timings, one subdirectory per run; not stored if None
+        """
+        self.__artifacts_dir = artifacts_dir
+
+    def execute(
+        self, playbook: Path, inventory: Path, limit: str | None = None
+    ) -> AnsibleExecutorResult:
         """Run Ansible Playbook.
 
         Args:
             playbook: path to the playbook to play
             inventory: path to the inventory file
+            limit: host pattern to limit the play to, all hosts if None
         """
-        # TODO: error handling needed
-        # TODO: full Ansible log storage needed
-        run_result = run(playbook=str(playbook), inventory=str(inventory), quiet=True)
+        timing_collector = AnsibleTaskTimingCollector()
+        run_kwargs = {}
+        if self.__artifacts_dir is not None:
+            run_kwargs["artifact_dir"] = str(self.__artifacts_dir)
+            run_kwargs["ident"] = f"{playbook.stem}_{limit or 'all'}_{uuid.uuid4().hex}"
+        run_result = run(
+            playbook=str(playbook),
+            inventory=str(inventory),
+            limit=limit,
+            quiet=True,
+            event_handler=timing_collector.handle_event,
+            **run_kwargs,
+        )
+        # no stats if the run failed before the play, e.g. playbook syntax error
+        stats = run_result.stats or {
+            stats_field.name: {}
+            for stats_field in dataclasses.fields(AnsibleResultStats)
+        }
         executor_result = AnsibleExecutorResult(
-            status=run_result.status, stats=AnsibleResultStats(**run_result.stats)
+            status=run_result.status,
+            stats=AnsibleResultStats(**stats),
+            task_timings=timing_collector.timings,
         )
+        if self.__artifacts_dir is not None:
+            executor_result.artifacts_dir = Path(run_result.config.artifact_dir)
+            self.__store_task_timings(executor_result)
         return executor_result
+
+    def __store_task_timings(self, executor_result: AnsibleExecutorResult) -> None:
+        """Writes task timings next to the run artifacts.
+        Failed write only warns, timings are diagnostics and the Playbook result stands.
+        """
+        timings_file = Path(executor_result.artifacts_dir, self.task_timings_file_name)
+        try:
+            timings_file.write_text(
+                json.dumps(
+                    [
+                        dataclasses.asdict(timing)
+                        for timing in executor_result.task_timings
+                    ],
+                    indent=2,
+                )
+            )
+        except OSError as error:
+            warnings.warn(f"Task timings not stored in {timings_file}: {error}")
@@ -0,0 +1,242 @@
+import time
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Literal
+
+from git_tests.tools.executors.ansible_executor import (
+    AnsibleExecutorProtocol,
+    AnsibleExecutorResult,
+)
+
+
+@dataclass(frozen=True)
+class ProvisioningNode:
+    """One unit of provisioning: Playbook played on a single host.
+
+    Args:
+        name: unique name of the node, used in dependencies
+        playbook: path to the playbook to play
+        host: host pattern the play is limited to
+        depends_on: names of nodes which must succeed first
+    """
+
+    name: str
+    playbook: Path
+    host: str
+    depends_on: tuple[str, ...] = ()
+
+
+@dataclass
+class ProvisioningNodeResult:
+    """Result of one ProvisioningNode.
+
+    Args:
+        status: Playbook execution status, "skipped" if any dependency failed
+        start: start time, in seconds from the beginning of provisioning
+        end: end time, in seconds from the beginning of provisioning
+        executor_result: result of the AnsibleExecutor, None if skipped
+    """
+
+    status: Literal[
+        "starting",
+        "running",
+        "canceled",
+        "timeout",
+        "failed",
+        "successful",
+        "skipped",
+    ]
+    start: float
+    end: float
+    executor_result: AnsibleExecutorResult | None = None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class ProvisioningResult:
+    """Result of the whole ProvisioningGraph.
+
+    Args:
+        nodes: results of all nodes, by node name
+        critical_path: chain of nodes which determined the total duration
+        duration: total duration, in seconds
+    """
+
+    nodes: dict[str, ProvisioningNodeResult] = field(default_factory=dict)
+    critical_path: list[str] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def successful(self) -> bool:
+        return all(result.status == "successful" for result in self.nodes.values())
+
+    def summary(self) -> list[str]:
+        """Human-readable lines: all nodes in start order and the critical path."""
+        lines = [f"Provisioning took {self.duration:.1f}s"]
+        for name, result in sorted(self.nodes.items(), key=lambda item: item[1].start):
+            lines.append(
+                f"  {name}: {result.status}, "
+                f"{result.start:.1f}s - {result.end:.1f}s ({result.duration:.1f}s)"
+            )
+        lines.append(f"Critical path: {' -> '.join(self.critical_path)}")
+        return lines
+
+
+class ProvisioningGraph:
+    """Dependency graph of ProvisioningNodes."""
+
+    def __init__(self, nodes: list[ProvisioningNode]) -> None:
+        """Constructor method for ProvisioningGraph.
+        Checks that all dependencies exist and there are no cycles.
+
+        Args:
+            nodes: nodes of the graph
+        """
+        self.nodes = {node.name: node for node in nodes}
+        for node in nodes:
+            missing = set(node.depends_on) - set(self.nodes)
+            if missing:
+                raise ValueError(f"Node {node.name} depends on unknown {missing}")
+        self.__check_cycles()
+
+    def subgraph(self, names: list[str]) -> "ProvisioningGraph":
+        """Returns graph with selected nodes only.
+        Dependencies on not selected nodes are dropped.
+
+        Args:
+            names: names of nodes to keep
+        """
+        return ProvisioningGraph(
+            [
+                ProvisioningNode(
+                    name=node.name,
+                    playbook=node.playbook,
+                    host=node.host,
+                    depends_on=tuple(
+                        dependency
+                        for dependency in node.depends_on
+                        if dependency in names
+                    ),
+                )
+                for name, node in self.nodes.items()
+                if name in names
+            ]
+        )
+
+    def __check_cycles(self) -> None:
+        """Raises ValueError if nodes depend on each other in a cycle."""
+        visited: set[str] = set()
+        in_progress: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in in_progress:
+                raise ValueError(f"Dependency cycle at node {name}")
+            if name in visited:
+                return
+            in_progress.add(name)
+            for dependency in self.nodes[name].depends_on:
+                visit(dependency)
+            in_progress.remove(name)
+            visited.add(name)
+
+        for name in self.nodes:
+            visit(name)
+
+
+class AnsibleDagScheduler:
+    """Plays ProvisioningGraph with AnsibleExecutor.
+
+    Node starts as soon as all its dependencies succeed,
+    so independent nodes (e.g. different hosts) are played in parallel.
+    Nodes depending on a failed one are skipped.
+    """
+
+    def __init__(
+        self, ansible_executor: AnsibleExecutorProtocol, max_workers: int = 4
+    ) -> None:
+        """Constructor method for AnsibleDagScheduler.
+
+        Args:
+            ansible_executor: executor used for every node
+            max_workers: maximum number of Playbooks played at once
+        """
+        self.__ansible_executor = ansible_executor
+        self.__max_workers = max_workers
+
+    def execute(self, graph: ProvisioningGraph, inventory: Path) -> ProvisioningResult:
+        """Plays all nodes of the graph.
+
+        Args:
+            graph: nodes to play
+            inventory: path to the inventory file
+
+        Returns:
+            results of all nodes and the critical path
+        """
+        result = ProvisioningResult()
+        waiting = dict(graph.nodes)
+        running: dict[Future, tuple[ProvisioningNode, float]] = {}
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as pool:
+            while waiting or running:
+                for name, node in list(waiting.items()):
+                    dependencies = [result.nodes.get(dep) for dep in node.depends_on]
+                    if any(dep is None for dep in dependencies):
+                        continue
+                    del waiting[name]
+                    now = time.monotonic() - started
+                    if any(dep.status != "successful" for dep in dependencies):
+                        result.nodes[name] = ProvisioningNodeResult(
+                            status="skipped", start=now, end=now
+                        )
+                        continue
+                    future = pool.submit(
+                        self.__ansible_executor.execute,
+                        playbook=node.playbook,
+                        inventory=inventory,
+                        limit=node.host,
+                    )
+                    running[future] = (node, now)
+
+                if not running:
+                    # everything left was just skipped, check its dependents
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node, start = running.pop(future)
+                    executor_result = future.result()
+                    result.nodes[node.name] = ProvisioningNodeResult(
+                        status=executor_result.status,
+                        start=start,
+                        end=time.monotonic() - started,
+                        executor_result=executor_result,
+                    )
+
+        result.duration = time.monotonic() - started
+        result.critical_path = self.__get_critical_path(graph, result)
+        return result
+
+    @staticmethod
+    def __get_critical_path(
+        graph: ProvisioningGraph, result: ProvisioningResult
+    ) -> list[str]:
+        """Walks back from the node which ended last,
+        always through the dependency which ended last (the one it waited for).
+        """
+        if not result.nodes:
+            return []
+        name = max(result.nodes, key=lambda node_name: result.nodes[node_name].end)
+        path = [name]
+        while graph.nodes[name].depends_on:
+            name = max(
+                graph.nodes[name].depends_on,
+                key=lambda node_name: result.nodes[node_name].end,
+            )
+            path.append(name)
+        return list(reversed(path))
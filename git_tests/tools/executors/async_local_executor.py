@@ -0,0 +1,114 @@
+import asyncio
+import os
+
+from pathlib import Path
+from typing import Awaitable, Iterable
+
+from git_tests.tools.executors.local_executor import (
+    LocalExecutorProtocol,
+    LocalExecutionResult,
+)
+
+
+class AsyncLocalExecutor(LocalExecutorProtocol):
+    """Executes command in local environment, using asyncio subprocesses.
+
+    Can be used with the same Command implementations as LocalExecutor,
+    but their run() returns an awaitable:
+        executor = AsyncLocalExecutor()
+        results = executor.run_all(
+            [StatusCommand(..., executor=executor).run() for ... in ...]
+        )
+    """
+
+    def __init__(self, concurrency_limit: int = 8) -> None:
+        """Constructor method for AsyncLocalExecutor.
+
+        Args:
+            concurrency_limit: default number of processes running at once in gather()
+        """
+        self.__concurrency_limit = concurrency_limit
+
+    async def execute(
+        self,
+        command: str | list[str],
+        cwd: Path | None = None,
+        env: dict[str, str] | None = None,
+        raw_output: bool = False,
+    ) -> LocalExecutionResult:
+        """Run subprocess and gather the output, without blocking the event loop.
+
+        Args:
+            command: command to execute; string is run by the shell, list is run directly
+            cwd: current working directory, where to execute a command
+            env: additional environment variables for the command
+            raw_output: keep stdout and stderr as bytes, instead of their str() form
+        """
+        if isinstance(command, str):
+            program, *args = ["/bin/sh", "-c", command]
+        else:
+            program, *args = command
+
+        process = await asyncio.create_subprocess_exec(
+            program,
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=str(cwd) if cwd else None,
+            env={**os.environ, **env} if env else None,
+        )
+        try:
+            stdout, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+
+        execution_result = LocalExecutionResult(
+            args=command,
+            rc=process.returncode,
+            stdout=stdout if raw_output else str(stdout),
+            stderr=stderr if raw_output else str(stderr),
+        )
+        return execution_result
+
+    async def gather(
+        self,
+        executions: Iterable[Awaitable[LocalExecutionResult]],
+        limit: int | None = None,
+    ) -> list[LocalExecutionResult]:
+        """Awaits many executions, with limited number of them running at once.
+
+        Args:
+            executions: awaitables returned by execute() or by Command run()
+            limit: number of executions running at once, default from the constructor
+
+        Returns:
+            results in the same order as executions
+        """
+        semaphore = asyncio.Semaphore(limit or self.__concurrency_limit)
+
+        async def bounded(
+            execution: Awaitable[LocalExecutionResult],
+        ) -> LocalExecutionResult:
+            async with semaphore:
+                return await execution
+
+        return list(await asyncio.gather(*(bounded(item) for item in executions)))
+
+    def run_all(
+        self,
+        executions: Iterable[Awaitable[LocalExecutionResult]],
+        limit: int | None = None,
+    ) -> list[LocalExecutionResult]:
+        """Synchronous entry point for gather(), e.g. for use in tests or fixtures.
+
+        Args:
+            executions: awaitables returned by execute() or by Command run()
+            limit: number of executions running at once, default from the constructor
+
+        Returns:
+            results in the same order as executions
+        """
+        return asyncio.run(self.gather(executions, limit=limit))
@@ -0,0 +1,195 @@
+import collections
+import dataclasses
+import os
+import threading
+
+from pathlib import Path
+
+from git_tests.tools.executors.local_executor import (
+    LocalExecutionResult,
+    LocalExecutor,
+    LocalExecutorProtocol,
+)
+
+
+class CachingLocalExecutor(LocalExecutorProtocol):
+    """Executor with opt-in result cache for read-only git commands.
+
+    Only commands whose output depends solely on refs and objects (log) are cached,
+    keyed by the arguments, environment and a cheap fingerprint of the repository:
+    HEAD, all loose ref tips, packed refs, reflogs (for log -g),
+    repository config and .mailmap.
+    Commands which read the working tree or the index (e.g. status) are never cached,
+    as files changed outside of git would make their cached results stale.
+    Any other git command executed in the same repository drops its cached results.
+
+    Cache has bounded size, least recently used results are evicted first.
+    """
+
+    read_only_subcommands = frozenset({"log"})
+
+    def __init__(
+        self,
+        executor: LocalExecutorProtocol | None = None,
+        max_entries: int = 256,
+    ) -> None:
+        """Constructor method for CachingLocalExecutor.
+
+        Args:
+            executor: executor which runs not cached commands, LocalExecutor by default
+            max_entries: maximum number of cached results
+        """
+        self.__executor = executor or LocalExecutor()
+        self.__max_entries = max_entries
+        self.__cache: collections.OrderedDict[
+            tuple, LocalExecutionResult
+        ] = collections.OrderedDict()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def execute(
+        self,
+        command: str | list[str],
+        cwd: Path | None = None,
+        env: dict[str, str] | None = None,
+        raw_output: bool = False,
+    ) -> LocalExecutionResult:
+        """Returns cached result of a read-only git command, or runs the command.
+
+        Args:
+            command: command to execute, as shell string or list of arguments
+            cwd: current working directory, where to execute a command
+            env: additional environment variables for the command
+            raw_output: keep stdout and stderr as bytes, see LocalExecutor
+        """
+        execute_kwargs = {"command": command, "cwd": cwd, "env": env}
+        if raw_output:
+            execute_kwargs["raw_output"] = True
+        repo_path, subcommand = self.__parse_git_command(command, cwd)
+        if repo_path is None:
+            return self.__executor.execute(**execute_kwargs)
+
+        if subcommand not in self.read_only_subcommands:
+            result = self.__executor.execute(**execute_kwargs)
+            self.invalidate(repo_path)
+            return result
+
+        key = (
+            repo_path,
+            tuple(command),
+            cwd,
+            tuple(sorted((env or {}).items())),
+            raw_output,
+            self.__get_repo_fingerprint(repo_path),
+        )
+        with self.__lock:
+            if key in self.__cache:
+                self.__cache.move_to_end(key)
+                self.hits += 1
+                return dataclasses.replace(self.__cache[key])
+            self.misses += 1
+
+        result = self.__executor.execute(**execute_kwargs)
+        with self.__lock:
+            self.__cache[key] = result
+            while len(self.__cache) > self.__max_entries:
+                self.__cache.popitem(last=False)
+                self.evictions += 1
+        return dataclasses.replace(result)
+
+    def invalidate(self, repo_path: Path | None = None) -> None:
+        """Drops cached results of the repository, or all of them.
+
+        Args:
+            repo_path: repository to drop results of, None for all repositories
+        """
+        with self.__lock:
+            for key in list(self.__cache):
+                if repo_path is None or key[0] == repo_path:
+                    del self.__cache[key]
+                    self.invalidations += 1
+
+    def summary(self) -> list[str]:
+        """Human-readable lines with cache counters."""
+        lookups = self.hits + self.misses
+        if not lookups:
+            return []
+        return [
+            f"Read-only command cache: {self.hits} hits, {self.misses} misses "
+            f"({self.hits / lookups:.0%} hit rate), {self.evictions} evictions, "
+            f"{self.invalidations} invalidated entries"
+        ]
+
+    @staticmethod
+    def __parse_git_command(
+        command: str | list[str], cwd: Path | None
+    ) -> tuple[Path | None, str | None]:
+        """Returns repository path and subcommand of a git command,
+        (None, None) if it is not a git command given as a list of arguments.
+        """
+        if isinstance(command, str) or not command:
+            return None, None
+        if Path(command[0]).name != "git":
+            return None, None
+
+        repo_path = Path(cwd) if cwd else None
+        index = 1
+        while index < len(command) and command[index].startswith("-"):
+            if command[index] == "-C" and index + 1 < len(command):
+                repo_path = Path(repo_path or "", command[index + 1])
+                index += 2
+            elif command[index] == "-c":
+                index += 2
+            else:
+                index += 1
+        if repo_path is None or index >= len(command):
+            return None, None
+        return repo_path.resolve(), command[index]
+
+    @staticmethod
+    def __get_repo_fingerprint(repo_path: Path) -> tuple:
+        """Cheap state of refs of the repository, without running git."""
+        git_dir = Path(repo_path, ".git")
+        if not git_dir.is_dir():
+            git_dir = repo_path
+
+        def stat(path: Path) -> tuple[int, int] | None:
+            try:
+                path_stat = os.stat(path)
+            except OSError:
+                return None
+            return path_stat.st_mtime_ns, path_stat.st_size
+
+        def read(path: Path) -> str | None:
+            try:
+                return path.read_text()
+            except OSError:
+                return None
+
+        refs_dir = Path(git_dir, "refs")
+        loose_refs = tuple(
+            sorted(
+                (str(ref_path.relative_to(git_dir)), read(ref_path))
+                for ref_path in refs_dir.rglob("*")
+                if ref_path.is_file()
+            )
+        )
+        # reflog entries are appended e.g. by "reset --hard HEAD", with no ref change
+        reflogs = tuple(
+            sorted(
+                (str(log_path.relative_to(git_dir)), stat(log_path))
+                for log_path in Path(git_dir, "logs").rglob("*")
+                if log_path.is_file()
+            )
+        )
+        return (
+            read(Path(git_dir, "HEAD")),
+            loose_refs,
+            reflogs,
+            stat(Path(git_dir, "packed-refs")),
+            stat(Path(git_dir, "config")),
+            stat(Path(repo_path, ".mailmap")),
+        )
@@ -0,0 +1,192 @@
+import re
+import shlex
+import subprocess
+import uuid
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from git_tests.tools.executors.local_executor import (
+    LocalExecutionResult,
+    LocalExecutorProtocol,
+    prepare_subprocess,
+)
+
+
+@dataclass
+class RecordedCommand:
+    """Command collected by LocalCommandRecorder, not executed yet.
+
+    Args:
+        command: command to execute, as shell string or list of arguments
+        cwd: current working directory, where to execute a command
+        env: additional environment variables for the command
+        raw_output: keep stdout and stderr of the result as bytes
+    """
+
+    command: str | list[str]
+    cwd: Path | None = None
+    env: dict[str, str] | None = None
+    raw_output: bool = False
+
+
+class LocalCommandRecorder(LocalExecutorProtocol):
+    """Collects RecordedCommand from a Command, without running it.
+
+    Used for passing Commands to the LocalBatchExecutor:
+        recorded = StatusCommand(..., executor=LocalCommandRecorder()).run()
+    """
+
+    def execute(
+        self,
+        command: str | list[str],
+        cwd: Path | None = None,
+        env: dict[str, str] | None = None,
+        raw_output: bool = False,
+    ) -> RecordedCommand:
+        """Returns command description instead of running it.
+
+        Args:
+            command: command to execute, as shell string or list of arguments
+            cwd: current working directory, where to execute a command
+            env: additional environment variables for the command
+            raw_output: keep stdout and stderr of the result as bytes
+        """
+        return RecordedCommand(command=command, cwd=cwd, env=env, raw_output=raw_output)
+
+
+@dataclass
+class LocalBatchResult:
+    """Result of one command executed by LocalBatchExecutor.
+
+    Args:
+        result: the same result as LocalExecutor would return, None if not executed
+        seconds: execution time of the command, None if not executed
+    """
+
+    result: LocalExecutionResult | None
+    seconds: float | None
+
+    @property
+    def executed(self) -> bool:
+        return self.result is not None
+
+
+class LocalBatchExecutor:
+    """Executes many local commands in one process launch (one bash script).
+
+    Every command runs in its own subshell, with stdin from /dev/null.
+    Output of every command is framed with a unique marker on both streams,
+    together with its return code and timestamps, and split back per command.
+    Batch stops at the first command with an unexpected return code.
+    """
+
+    def execute_batch(
+        self,
+        commands: list[RecordedCommand],
+        expected_rcs: list[int | None] | None = None,
+        cwd: Path | None = None,
+    ) -> list[LocalBatchResult]:
+        """Run all commands in one bash process.
+
+        Args:
+            commands: commands to execute, all with the same env
+            expected_rcs: return code expected for every command, None for any;
+                batch stops after the first command with a different one
+            cwd: current working directory of the whole batch;
+                commands with their own cwd change to it in their subshell
+
+        Returns:
+            results in the same order as commands;
+            commands after the stop are not executed
+        """
+        if not commands:
+            return []
+        env = commands[0].env
+        if any(command.env != env for command in commands):
+            raise ValueError("All commands in a batch must have the same env")
+        expected_rcs = expected_rcs or [None] * len(commands)
+
+        marker = f"__git_tests_batch_{uuid.uuid4().hex}__"
+        script = self.__build_script(commands, expected_rcs, marker)
+        bash_command, run_kwargs = prepare_subprocess(
+            ["bash", "-c", script], cwd=cwd, env=env
+        )
+        process = subprocess.run(bash_command, stdin=subprocess.DEVNULL, **run_kwargs)
+        return self.__split_output(commands, process.stdout, process.stderr, marker)
+
+    @staticmethod
+    def __build_script(
+        commands: list[RecordedCommand],
+        expected_rcs: list[int | None],
+        marker: str,
+    ) -> str:
+        """Builds bash script with framed commands."""
+        lines = []
+        for index, (command, expected_rc) in enumerate(zip(commands, expected_rcs)):
+            shell_command = (
+                command.command
+                if isinstance(command.command, str)
+                else shlex.join(command.command)
+            )
+            if command.cwd:
+                shell_command = f"cd {shlex.quote(str(command.cwd))} && {shell_command}"
+            lines += [
+                f"printf '\\n%s\\n' '{marker} {index} start' >&2",
+                "__start=$EPOCHREALTIME",
+                f"printf '%s %s\\n' '{marker} {index} start' \"$__start\"",
+                f"( {shell_command} ) </dev/null",
+                "__rc=$?",
+                "__end=$EPOCHREALTIME",
+                f"printf '\\n%s %s %s %s\\n' '{marker} {index} end' "
+                '"$__rc" "$__start" "$__end"',
+                f"printf '\\n%s\\n' '{marker} {index} end' >&2",
+            ]
+            if expected_rc is not None:
+                lines.append(f'[ "$__rc" = "{expected_rc}" ] || exit 0')
+        return "\n".join(lines)
+
+    @staticmethod
+    def __split_output(
+        commands: list[RecordedCommand], stdout: bytes, stderr: bytes, marker: str
+    ) -> list[LocalBatchResult]:
+        """Splits framed output of the script into results of every command."""
+        results = []
+        for index, command in enumerate(commands):
+            start_line = re.search(rf"{marker} {index} start [^\n]*\n".encode(), stdout)
+            end_line = re.search(
+                rf"\n{marker} {index} end (\d+) (\S*) (\S*)\n".encode(), stdout
+            )
+            if start_line is None or end_line is None:
+                results.append(LocalBatchResult(result=None, seconds=None))
+                continue
+
+            stderr_frame = re.search(
+                rf"\n{marker} {index} start\n(.*?)\n{marker} {index} end\n".encode(),
+                stderr,
+                re.DOTALL,
+            )
+            command_stdout = stdout[start_line.end() : end_line.start()]
+            command_stderr = stderr_frame.group(1) if stderr_frame else b""
+            rc, start, end = end_line.groups()
+            seconds = (
+                float(end.replace(b",", b".")) - float(start.replace(b",", b"."))
+                if start and end
+                else None
+            )
+            results.append(
+                LocalBatchResult(
+                    result=LocalExecutionResult(
+                        args=command.command,
+                        rc=int(rc),
+                        stdout=command_stdout
+                        if command.raw_output
+                        else str(command_stdout),
+                        stderr=command_stderr
+                        if command.raw_output
+                        else str(command_stderr),
+                    ),
+                    seconds=seconds,
+                )
+            )
+        return results
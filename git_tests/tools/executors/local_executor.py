@@ -1,11 +1,75 @@
 import abc
+import collections
+import functools
+import os
+import shutil
 import subprocess
+import threading
 
 import pexpect
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Protocol, AnyStr
+from typing import Any, AnyStr, Callable, Iterator, Protocol
+
+
+# subprocess uses posix_spawn() instead of fork()+exec() only if this is set
+# and the call has no cwd, no close_fds and absolute executable path
+POSIX_SPAWN_SUPPORTED: bool = getattr(subprocess, "_USE_POSIX_SPAWN", False)
+
+
+def resolve_executable(name: str) -> str:
+    """Returns absolute path of the executable, looked up in current PATH.
+
+    Args:
+        name: executable name or path
+    """
+    return _resolve_executable(name, os.environ.get("PATH"))
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_executable(name: str, path: str | None) -> str:
+    """Cached lookup for resolve_executable(), keyed by PATH value too."""
+    if os.path.dirname(name):
+        return name
+    executable = shutil.which(name, path=path)
+    if executable is None:
+        raise FileNotFoundError(f"Executable not found in PATH: {name}")
+    return executable
+
+
+def prepare_subprocess(
+    command: str | list[str],
+    cwd: Path | None = None,
+    env: dict[str, str] | None = None,
+) -> tuple[str | list[str], dict[str, Any]]:
+    """Returns command and keyword arguments for subprocess.run() or Popen().
+
+    Command given as a string is run by the shell.
+    Command given as a list of arguments is run directly, without /bin/sh,
+    and with posix_spawn() where the platform supports it (requires no cwd).
+
+    Args:
+        command: command to execute, as shell string or list of arguments
+        cwd: current working directory, where to execute a command
+        env: additional environment variables, merged with the current environment
+    """
+    run_kwargs = {
+        "stdout": subprocess.PIPE,
+        "stderr": subprocess.PIPE,
+    }
+    if isinstance(command, str):
+        run_kwargs.update({"shell": True})
+    else:
+        command = [resolve_executable(command[0]), *command[1:]]
+        # posix_spawn() path requires close_fds=False; descriptors opened
+        # by Python are non-inheritable anyway (PEP 446), so none leak
+        run_kwargs.update({"close_fds": bool(cwd) or not POSIX_SPAWN_SUPPORTED})
+    if cwd:
+        run_kwargs.update({"cwd": str(cwd)})
+    if env:
+        run_kwargs.update({"env": {**os.environ, **env}})
+    return command, run_kwargs
 
 
 @dataclass
@@ -17,24 +81,34 @@ class LocalExecutionResult:
         rc: return code of the executed command
         stdout: output capture
         stderr: error otput capture
+        stopped: True if the process was terminated before it ended by itself
     """
 
     args: list
     rc: int
     stdout: AnyStr | list[AnyStr]
     stderr: AnyStr
+    stopped: bool = False
 
 
 class LocalExecutorProtocol(Protocol):
     """Protocol for the LocalExecutor instances."""
 
     @abc.abstractmethod
-    def execute(self, command: str, cwd: Path | None = None) -> LocalExecutionResult:
+    def execute(
+        self,
+        command: str | list[str],
+        cwd: Path | None = None,
+        env: dict[str, str] | None = None,
+        raw_output: bool = False,
+    ) -> LocalExecutionResult:
         """Run command in a implemented way.
 
         Args:
-            command: command to execute
+            command: command to execute, as shell string or list of arguments
             cwd: current working directory, where to execute a command
+            env: additional environment variables for the command
+            raw_output: keep stdout and stderr as bytes, instead of their str() form
         """
         pass
 
@@ -43,34 +117,206 @@ class LocalExecutor(LocalExecutorProtocol):
     """Executes command in local environment, using subprocess.
 
     Can be used for commands, which ends without any interactive manner.
+    Command can be a shell string or a list of arguments, see prepare_subprocess().
     """
 
-    def execute(self, command: str, cwd: Path | None = None) -> LocalExecutionResult:
+    def execute(
+        self,
+        command: str | list[str],
+        cwd: Path | None = None,
+        env: dict[str, str] | None = None,
+        raw_output: bool = False,
+    ) -> LocalExecutionResult:
         """Run subprocess and gather the output.
 
         Args:
-            command: command to execute
+            command: command to execute, as shell string or list of arguments
             cwd: current working directory, where to execute a command
+            env: additional environment variables for the command
+            raw_output: keep stdout and stderr as bytes, instead of their str() form;
+                used by Command variants which parse the output
         """
-        run_kwargs = {
-            "stdout": subprocess.PIPE,
-            "stderr": subprocess.PIPE,
-            "shell": True,
-        }
-        if cwd:
-            run_kwargs.update({"cwd": str(cwd)})
-
+        command, run_kwargs = prepare_subprocess(command, cwd, env)
         result = subprocess.run(command, **run_kwargs)
         execution_result = LocalExecutionResult(
             args=result.args,
             rc=result.returncode,
-            stdout=str(result.stdout),
-            stderr=str(result.stderr),
+            stdout=result.stdout if raw_output else str(result.stdout),
+            stderr=result.stderr if raw_output else str(result.stderr),
         )
 
         return execution_result
 
 
+class LocalStreamingExecutor(LocalExecutorProtocol):
+    """Executes command in local environment, using subprocess, reading output as it comes.
+
+    Output is never buffered as a whole, only the last lines are kept.
+    The process can be stopped as soon as an expected line appears:
+        LogCommand(
+            variant="basic",
+            command_data={"cloned_repo_path": path},
+            executor=LocalStreamingExecutor(stop_when=lambda line: message in line),
+        ).run()
+    """
+
+    def __init__(
+        self,
+        stop_when: Callable[[str], bool] | None = None,
+        callback: Callable[[str], None] | None = None,
+        keep_lines: int = 100,
+        encoding: str = "utf-8",
+    ) -> None:
+        """Constructor method for LocalStreamingExecutor.
+
+        Args:
+            stop_when: predicate for stdout lines; process is stopped on the first match
+            callback: called with every stdout line
+            keep_lines: number of last stdout/stderr lines to keep in the result
+            encoding: encoding used for decoding the output
+        """
+        self.__stop_when = stop_when
+        self.__callback = callback
+        self.__keep_lines = keep_lines
+        self.__encoding = encoding
+
+    def execute(
+        self,
+        command: str | list[str],
+        cwd: Path | None = None,
+        env: dict[str, str] | None = None,
+        raw_output: bool = False,
+    ) -> LocalExecutionResult:
+        """Run subprocess and consume its output line by line.
+
+        Args:
+            command: command to execute, as shell string or list of arguments
+            cwd: current working directory, where to execute a command
+            env: additional environment variables for the command
+            raw_output: return the kept stdout and stderr as bytes,
+                encoded back with the executor encoding
+
+        Returns:
+            execution result with the last decoded lines of stdout and stderr;
+            if stopped by the predicate, stdout ends with the matched line
+        """
+        stdout_tail = collections.deque(maxlen=self.__keep_lines)
+        stderr_tail = collections.deque(maxlen=self.__keep_lines)
+        stopped = False
+        # the process is terminated also if callback or stop_when raises
+        with self.stream(command, cwd=cwd, env=env, stderr_tail=stderr_tail) as stream:
+            for line in stream:
+                stdout_tail.append(line)
+                if self.__callback:
+                    self.__callback(line)
+                if self.__stop_when and self.__stop_when(line):
+                    stopped = True
+                    break
+            rc = stream.close_process(terminate=stopped)
+
+        stdout, stderr = "".join(stdout_tail), "".join(stderr_tail)
+        execution_result = LocalExecutionResult(
+            args=stream.args,
+            rc=rc,
+            stdout=stdout.encode(self.__encoding) if raw_output else stdout,
+            stderr=stderr.encode(self.__encoding) if raw_output else stderr,
+            stopped=stopped,
+        )
+        return execution_result
+
+    def stream(
+        self,
+        command: str | list[str],
+        cwd: Path | None = None,
+        env: dict[str, str] | None = None,
+        stderr_tail: collections.deque | None = None,
+    ) -> "LocalOutputStream":
+        """Starts subprocess and returns iterator over its decoded stdout lines.
+
+        Args:
+            command: command to execute, as shell string or list of arguments
+            cwd: current working directory, where to execute a command
+            env: additional environment variables for the command
+            stderr_tail: container for the last stderr lines, filled in the background
+        """
+        command, run_kwargs = prepare_subprocess(command, cwd, env)
+        process = subprocess.Popen(
+            command, encoding=self.__encoding, errors="replace", **run_kwargs
+        )
+        if stderr_tail is None:
+            stderr_tail = collections.deque(maxlen=self.__keep_lines)
+        return LocalOutputStream(process=process, stderr_tail=stderr_tail)
+
+
+class LocalOutputStream:
+    """Iterator over decoded stdout lines of the running process.
+
+    Stderr is drained in a background thread, so a full stderr pipe
+    can't block the process. Leaving the iteration early (break or exception)
+    terminates the process, once the iterator is closed or garbage collected.
+    Can be used as Context Manager, which always terminates the process at exit.
+    """
+
+    def __init__(self, process: subprocess.Popen, stderr_tail: collections.deque):
+        """Constructor method for LocalOutputStream.
+
+        Args:
+            process: started process, with stdout and stderr pipes in text mode
+            stderr_tail: container for the last stderr lines
+        """
+        self.__process = process
+        self.__closed = False
+        self.__stderr_thread = threading.Thread(
+            target=stderr_tail.extend, args=(process.stderr,), daemon=True
+        )
+        self.__stderr_thread.start()
+
+    @property
+    def args(self) -> str | list[str]:
+        """Arguments used for the command execution."""
+        return self.__process.args
+
+    def __iter__(self) -> Iterator[str]:
+        try:
+            yield from self.__process.stdout
+        except GeneratorExit:
+            # iteration left before the end of stdout
+            self.close_process()
+            raise
+
+    def __enter__(self) -> "LocalOutputStream":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close_process()
+
+    def close_process(self, terminate: bool = True, timeout: float = 5.0) -> int:
+        """Collects return code of the process, terminating it if it still runs.
+
+        Args:
+            terminate: if False, waits for the process to end by itself
+            timeout: time to wait for exit after SIGTERM, before SIGKILL
+
+        Returns:
+            return code of the process; the same one for repeated calls
+        """
+        process = self.__process
+        if self.__closed:
+            return process.returncode
+        self.__closed = True
+        process.stdout.close()
+        if terminate and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        process.wait()
+        self.__stderr_thread.join(timeout=timeout)
+        process.stderr.close()
+        return process.returncode
+
+
 class LocalPexpectExecutorProtocol(Protocol):
     """Protocol for the LocalPexpectExecutor instances."""
 
@@ -0,0 +1,232 @@
+import collections
+import os
+import re
+import selectors
+import signal
+import time
+
+import pexpect
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from git_tests.tools.executors.local_executor import (
+    LocalExecutionResult,
+    LocalPexpectExecutorProtocol,
+)
+
+
+@dataclass
+class PexpectSession:
+    """Interactive command to run by the LocalPexpectMultiplexer.
+
+    Args:
+        command: command to execute
+        expect: expectation-action pairs, the same as for LocalPexpectExecutor
+        cwd: current working directory, where to execute a command
+        timeout: seconds after which the session is killed
+    """
+
+    command: str
+    expect: list[tuple[str, str]] = field(default_factory=list)
+    cwd: Path | None = None
+    timeout: float = 60.0
+
+
+class PexpectSessionBuilder(LocalPexpectExecutorProtocol):
+    """Collects PexpectSession from a Command, without running it.
+
+    Used for passing Commands to the LocalPexpectMultiplexer:
+        sessions = [
+            CloneCommand(..., executor=PexpectSessionBuilder()).run() for ... in ...
+        ]
+        results = LocalPexpectMultiplexer().execute_many(sessions)
+    """
+
+    def __init__(self, timeout: float = 60.0) -> None:
+        """Constructor method for PexpectSessionBuilder.
+
+        Args:
+            timeout: timeout for created sessions
+        """
+        self.__timeout = timeout
+
+    def execute(
+        self,
+        command: str,
+        expect: list[tuple[str, str]] | None = None,
+        cwd: Path | None = None,
+    ) -> PexpectSession:
+        """Returns session description instead of running the command.
+
+        Args:
+            command: command to execute
+            expect: expectation-action pairs for pexpect to handle
+            cwd: current working directory, where to execute a command
+        """
+        return PexpectSession(
+            command=command, expect=list(expect or []), cwd=cwd, timeout=self.__timeout
+        )
+
+
+@dataclass
+class _SessionState:
+    """Runtime state of one spawned PexpectSession."""
+
+    index: int
+    child: pexpect.spawn
+    deadline: float
+    pending: collections.deque
+    buffer: bytes = b""
+    segments: list[bytes] = field(default_factory=list)
+
+
+class LocalPexpectMultiplexer(LocalPexpectExecutorProtocol):
+    """Executes many interactive commands at once, using Pexpect and one selector loop.
+
+    Every session gets its own pty, but all prompts are served by a single thread.
+    Output is read as it comes and expectations are checked against it in order,
+    the same way as LocalPexpectExecutor does it.
+    """
+
+    def __init__(self, max_sessions: int = 32, read_size: int = 65536) -> None:
+        """Constructor method for LocalPexpectMultiplexer.
+
+        Args:
+            max_sessions: number of children running at once, others are queued
+            read_size: maximum number of bytes read from a pty at once
+        """
+        self.__max_sessions = max_sessions
+        self.__read_size = read_size
+
+    def execute(
+        self,
+        command: str,
+        expect: list[tuple[str, str]] | None = None,
+        cwd: Path | None = None,
+    ) -> LocalExecutionResult:
+        """Run single command, for compatibility with LocalPexpectExecutor.
+
+        Args:
+            command: command to execute
+            expect: expectation-action pairs for pexpect to handle
+            cwd: current working directory, where to execute a command
+        """
+        session = PexpectSession(command=command, expect=list(expect or []), cwd=cwd)
+        return self.execute_many([session])[0]
+
+    def execute_many(
+        self, sessions: list[PexpectSession]
+    ) -> list[LocalExecutionResult]:
+        """Run all sessions concurrently and gather their results.
+
+        Args:
+            sessions: sessions to run
+
+        Returns:
+            results in the same order as sessions;
+            sessions killed after their timeout have stopped flag set and rc -SIGKILL
+        """
+        results: list[LocalExecutionResult | None] = [None] * len(sessions)
+        queue = collections.deque(enumerate(sessions))
+        active: dict[int, _SessionState] = {}
+
+        with selectors.DefaultSelector() as selector:
+            try:
+                while queue or active:
+                    while queue and len(active) < self.__max_sessions:
+                        index, session = queue.popleft()
+                        state = self.__spawn(index, session)
+                        active[state.child.child_fd] = state
+                        selector.register(
+                            state.child.child_fd, selectors.EVENT_READ, state
+                        )
+
+                    nearest_deadline = min(state.deadline for state in active.values())
+                    select_timeout = max(0.0, nearest_deadline - time.monotonic())
+                    for key, _ in selector.select(timeout=select_timeout):
+                        state = key.data
+                        if not self.__read(state):
+                            selector.unregister(key.fd)
+                            del active[key.fd]
+                            results[state.index] = self.__finish(state, stopped=False)
+
+                    now = time.monotonic()
+                    for fd, state in list(active.items()):
+                        if now >= state.deadline:
+                            selector.unregister(fd)
+                            del active[fd]
+                            results[state.index] = self.__finish(state, stopped=True)
+            finally:
+                # e.g. spawn of a queued session failed, running children are killed
+                for state in active.values():
+                    state.child.kill(signal.SIGKILL)
+                    state.child.close(force=True)
+        return results
+
+    def __spawn(self, index: int, session: PexpectSession) -> _SessionState:
+        """Spawns the child of the session."""
+        child = pexpect.spawn(session.command, cwd=session.cwd)
+        pending = collections.deque(
+            (re.compile(pattern.encode()), response)
+            for pattern, response in session.expect
+        )
+        return _SessionState(
+            index=index,
+            child=child,
+            deadline=time.monotonic() + session.timeout,
+            pending=pending,
+        )
+
+    def __read(self, state: _SessionState) -> bool:
+        """Reads available output and answers matched expectations.
+
+        Returns:
+            False if child closed its output (EOF)
+        """
+        try:
+            data = os.read(state.child.child_fd, self.__read_size)
+        except OSError:
+            # Linux pty returns EIO after the child side is closed
+            data = b""
+        if not data:
+            return False
+
+        state.buffer += data
+        while state.pending:
+            pattern, response = state.pending[0]
+            match = pattern.search(state.buffer)
+            if match is None:
+                break
+            state.segments.append(state.buffer[: match.start()])
+            state.buffer = state.buffer[match.end() :]
+            state.child.sendline(response)
+            state.pending.popleft()
+        return True
+
+    def __finish(self, state: _SessionState, stopped: bool) -> LocalExecutionResult:
+        """Closes the child and builds the result, in the LocalPexpectExecutor format."""
+        state.segments.append(state.buffer)
+        if stopped:
+            # SIGKILL right away, so rc is always -SIGKILL for a stopped session,
+            # not the signal of the first step of terminate() which took effect
+            state.child.kill(signal.SIGKILL)
+        # output is already at EOF, so waiting doesn't block the loop,
+        # unlike the fixed sleep in close()
+        state.child.wait()
+        state.child.ptyproc.delayafterclose = 0
+        state.child.close()
+        rc = state.child.exitstatus
+        if rc is None and state.child.signalstatus is not None:
+            rc = -state.child.signalstatus
+        elif rc is None:
+            rc = -signal.SIGKILL
+
+        output = [str(segment).strip() for segment in state.segments if segment]
+        return LocalExecutionResult(
+            args=state.child.args,
+            rc=rc,
+            stderr="",
+            stdout=" ".join(output),
+            stopped=stopped,
+        )
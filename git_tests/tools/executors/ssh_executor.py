@@ -1,6 +1,14 @@
 import abc
-from dataclasses import dataclass
-from typing import Protocol, Literal, TypeVar
+import codecs
+import io
+import re
+import select
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Iterator, Literal, Protocol, TypeVar
 
 import paramiko
 
@@ -8,7 +16,7 @@ import paramiko
 TypeSshExecutor = TypeVar("TypeSshExecutor", bound="SshExecutor")
 
 
-@dataclass
+@dataclass(frozen=True)
 class SshHostData:
     """Host connection data for SshExecutor.
 
@@ -16,11 +24,117 @@ class SshHostData:
         host: hostname to connect
         user: username to connect
         password: password to use
+        port: Ssh server port
+
+    Frozen, so it can be used as a key of the SshConnectionPool.
     """
 
     host: str
     user: str
     password: str
+    port: int = 22
+
+
+def iter_channel_output(
+    channel: paramiko.Channel, timeout: float | None = None, read_size: int = 32768
+) -> Iterator[tuple[Literal["stdout", "stderr"], bytes]]:
+    """Reads stdout and stderr of the channel at the same time, until EOF.
+    Both are read as soon as data is available, so the remote command
+    can't be blocked by a full window of the channel which is not read.
+
+    Args:
+        channel: channel with started command
+        timeout: maximum time to wait for new data
+        read_size: maximum number of bytes read at once
+
+    Yields:
+        channel name and chunk of its data
+    """
+    while True:
+        while channel.recv_ready():
+            yield "stdout", channel.recv(read_size)
+        while channel.recv_stderr_ready():
+            yield "stderr", channel.recv_stderr(read_size)
+        if (channel.eof_received or channel.closed) and not (
+            channel.recv_ready() or channel.recv_stderr_ready()
+        ):
+            return
+        readable, _, _ = select.select([channel], [], [], timeout)
+        if not readable:
+            raise TimeoutError(f"No output from the channel in {timeout}s.")
+
+
+def drain_channel(
+    channel: paramiko.Channel, timeout: float | None = None, read_size: int = 32768
+) -> tuple[bytes, bytes, int]:
+    """Reads whole stdout and stderr of the channel, see iter_channel_output().
+
+    Args:
+        channel: channel with started command
+        timeout: maximum time to wait for new data
+        read_size: maximum number of bytes read at once
+
+    Returns:
+        stdout, stderr and exit code of the command
+    """
+    output = {"stdout": bytearray(), "stderr": bytearray()}
+    for name, data in iter_channel_output(channel, timeout, read_size):
+        output[name] += data
+    return bytes(output["stdout"]), bytes(output["stderr"]), channel.recv_exit_status()
+
+
+class SshOutputBuffer:
+    """Bounded buffer for one output channel of SshExecutionResult.
+
+    Data is kept in memory up to the memory limit. Above it, data is moved
+    to a temporary file (spill_to_disk=True) or the rest is dropped
+    and the buffer is marked as truncated (spill_to_disk=False).
+    """
+
+    def __init__(self, memory_limit: int, spill_to_disk: bool) -> None:
+        """Constructor method for SshOutputBuffer.
+
+        Args:
+            memory_limit: maximum number of bytes kept in memory
+            spill_to_disk: if data above the limit should go to a temporary file
+        """
+        self.__memory_limit = memory_limit
+        self.__spill_to_disk = spill_to_disk
+        # temporary file is created only when data goes over the limit
+        self.__file = io.BytesIO()
+        self.size = 0
+        self.truncated = False
+
+    @property
+    def spilled(self) -> bool:
+        """True if data was moved to a temporary file."""
+        return self.__spill_to_disk and self.size > self.__memory_limit
+
+    def write(self, data: bytes) -> None:
+        """Appends data to the buffer, respecting the limits."""
+        if self.size + len(data) > self.__memory_limit:
+            if not self.__spill_to_disk:
+                data = data[: self.__memory_limit - self.size]
+                self.truncated = True
+            elif isinstance(self.__file, io.BytesIO):
+                spill_file = tempfile.TemporaryFile()
+                spill_file.write(self.__file.getbuffer())
+                self.__file = spill_file
+        self.__file.write(data)
+        self.size += len(data)
+
+    def readlines(self) -> list[str]:
+        """Returns buffered content as decoded lines."""
+        self.__file.seek(0)
+        lines = [line.decode(errors="replace") for line in self.__file]
+        self.__file.seek(0, io.SEEK_END)
+        return lines
+
+    def close(self) -> None:
+        """Releases memory or the temporary file.
+        Only needed if the buffer was spilled, see spilled.
+        """
+        self.__file.close()
 
 
 @dataclass
@@ -29,18 +143,40 @@ class SshExecutionResult:
 
     Args:
         stdin: input channel
-        stdout: general output channel
-        stderr: error output channel
-
-    Channels works like files, so they can be read only if they are open.
+        channel: Ssh channel of the executed command
+        memory_limit: maximum number of bytes kept in memory for each output channel
+        spill_to_disk: if output above memory_limit should go to a temporary file,
+                       instead of being dropped
+        timeout: maximum time to wait for new output
+
+    Stdout and stderr are read together into SshOutputBuffer instances,
+    when read() or recv_exit_status() is called for the first time.
+    Alternatively, iter_lines() streams one channel without keeping it.
+
+    Channel is closed as soon as the output is read to the end and exit status
+    is received, so close() is needed only for results not read to the end,
+    or with output spilled to disk.
     """
 
     stdin: paramiko.channel.ChannelFile
-    stdout: paramiko.channel.ChannelFile
-    stderr: paramiko.channel.ChannelFile
+    channel: paramiko.Channel
+    memory_limit: int = 1024 * 1024
+    spill_to_disk: bool = True
+    timeout: float | None = 10
+
+    _buffers: dict[str, SshOutputBuffer] = field(init=False, repr=False)
+    _drained: bool = field(init=False, repr=False, default=False)
+
+    def __post_init__(self) -> None:
+        """Creates output buffers."""
+        self._buffers = {
+            name: SshOutputBuffer(self.memory_limit, self.spill_to_disk)
+            for name in ("stdout", "stderr")
+        }
 
     def read(self, channel: Literal["stdin", "stdout", "stderr"]) -> list[str]:
         """Read content of the selected channel.
+        Waits for the command to close its output.
 
         Args:
             channel: which channel to read
@@ -48,7 +184,248 @@ class SshExecutionResult:
         Returns:
             content of a selected channel
         """
-        return getattr(self, channel).readlines()
+        if channel == "stdin":
+            return self.stdin.readlines()
+        self.__drain()
+        return self._buffers[channel].readlines()
+
+    def iter_lines(
+        self, channel: Literal["stdout", "stderr"] = "stdout"
+    ) -> Iterator[str]:
+        """Yields decoded lines of the selected channel as they arrive.
+        Lines are not kept, so read() of the same channel returns only
+        what was buffered before. The other channel is buffered as usual.
+
+        Args:
+            channel: which channel to stream
+        """
+        if self._drained:
+            yield from self._buffers[channel].readlines()
+            return
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        for name, data in iter_channel_output(self.channel, timeout=self.timeout):
+            if name != channel:
+                self._buffers[name].write(data)
+                continue
+            pending += decoder.decode(data)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line + "\n"
+        self.__finish()
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending
+
+    def recv_exit_status(self) -> int:
+        """Waits for the command to end and returns its exit code."""
+        self.__drain()
+        exit_status = self.channel.recv_exit_status()
+        self.channel.close()
+        return exit_status
+
+    def is_truncated(self, channel: Literal["stdout", "stderr"]) -> bool:
+        """Checks if part of the channel output was dropped because of memory limit."""
+        return self._buffers[channel].truncated
+
+    def close(self) -> None:
+        """Closes the channel and releases buffers."""
+        self.channel.close()
+        for buffer in self._buffers.values():
+            buffer.close()
+
+    def __drain(self) -> None:
+        """Reads remaining stdout and stderr into buffers."""
+        if self._drained:
+            return
+        for name, data in iter_channel_output(self.channel, timeout=self.timeout):
+            self._buffers[name].write(data)
+        self.__finish()
+
+    def __finish(self) -> None:
+        """Marks output as read to the end, closes the channel if the command has ended."""
+        self._drained = True
+        if self.channel.exit_status_ready():
+            self.channel.close()
+
+
+@dataclass
+class SshBatchResult:
+    """Result structure for one command of SshExecutor.execute_batch().
+
+    Args:
+        command: executed command
+        rc: exit code of the command
+        stdout: general output lines, the same as read(channel="stdout")
+        stderr: error output lines, the same as read(channel="stderr")
+    """
+
+    command: str
+    rc: int
+    stdout: list[str]
+    stderr: list[str]
+
+
+@dataclass
+class PooledTransport:
+    """Authenticated paramiko Transport kept by the SshConnectionPool.
+
+    Args:
+        transport: connected and authenticated transport
+        last_used: monotonic time of the last release to the pool
+        in_use: number of executors currently holding the transport
+    """
+
+    transport: paramiko.Transport
+    last_used: float = field(default_factory=time.monotonic)
+    in_use: int = 0
+
+    def is_healthy(self) -> bool:
+        """Checks if transport can still be used for opening channels."""
+        if not (self.transport.is_active() and self.transport.is_authenticated()):
+            return False
+        try:
+            self.transport.send_ignore()
+        except (EOFError, OSError, paramiko.SSHException):
+            return False
+        return True
+
+
+class SshConnectionPool:
+    """Keeps authenticated Ssh transports alive between SshExecutor blocks.
+
+    Transports are grouped by SshHostData. Every SshExecutor.execute() call
+    opens a new channel on a shared transport, so key exchange and password
+    authentication are done only once per transport.
+
+    Should be closed after use, e.g. at the end of the Pytest session.
+    """
+
+    def __init__(
+        self,
+        max_transports_per_host: int = 2,
+        idle_timeout: float = 300.0,
+        keepalive_interval: int = 30,
+        connect_timeout: float = 10.0,
+    ) -> None:
+        """Constructor method for SshConnectionPool.
+
+        Args:
+            max_transports_per_host: limit of open transports for one SshHostData
+            idle_timeout: seconds after which unused transport is closed
+            keepalive_interval: seconds between keepalive packets, 0 disables them
+            connect_timeout: timeout for socket connection and banner
+        """
+        self.__max_transports_per_host = max_transports_per_host
+        self.__idle_timeout = idle_timeout
+        self.__keepalive_interval = keepalive_interval
+        self.__connect_timeout = connect_timeout
+        self.__transports: dict[SshHostData, list[PooledTransport]] = {}
+        self.__condition = threading.Condition()
+
+    def acquire(
+        self, host_data: SshHostData, timeout: float | None = None
+    ) -> paramiko.Transport:
+        """Returns healthy transport for the host.
+        Reuses an idle transport (not held by any executor), or opens a new one
+        if the limit allows it. Transports are never shared by executors,
+        so if all are taken and limit is reached, waits for a release.
+
+        Args:
+            host_data: host connection information
+            timeout: how long to wait for a free transport, None means forever
+
+        Returns:
+            authenticated paramiko Transport
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.__condition:
+            while True:
+                self.__evict(host_data)
+                pooled_transports = self.__transports.setdefault(host_data, [])
+                free = [pooled for pooled in pooled_transports if not pooled.in_use]
+                if free:
+                    pooled = free[0]
+                    pooled.in_use += 1
+                    return pooled.transport
+                if len(pooled_transports) < self.__max_transports_per_host:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(
+                        f"No free Ssh transport for {host_data.host} in {timeout}s."
+                    )
+                self.__condition.wait(timeout=remaining)
+
+            # placeholder reserves the slot, while connecting outside of the lock
+            pooled = PooledTransport(transport=None, in_use=1)
+            pooled_transports.append(pooled)
+
+        try:
+            pooled.transport = self.__connect(host_data)
+        except Exception:
+            with self.__condition:
+                pooled_transports.remove(pooled)
+                self.__condition.notify()
+            raise
+        return pooled.transport
+
+    def release(self, host_data: SshHostData, transport: paramiko.Transport) -> None:
+        """Gives transport back to the pool.
+
+        Args:
+            host_data: host connection information used for acquire()
+            transport: transport returned by acquire()
+        """
+        with self.__condition:
+            for pooled in self.__transports.get(host_data, []):
+                if pooled.transport is transport:
+                    pooled.in_use -= 1
+                    pooled.last_used = time.monotonic()
+                    break
+            self.__condition.notify()
+
+    def close(self) -> None:
+        """Closes all transports kept by the pool."""
+        with self.__condition:
+            for pooled_transports in self.__transports.values():
+                for pooled in pooled_transports:
+                    if pooled.transport is not None:
+                        pooled.transport.close()
+            self.__transports.clear()
+            self.__condition.notify_all()
+
+    def __connect(self, host_data: SshHostData) -> paramiko.Transport:
+        """Opens and authenticates a new transport.
+
+        Host key is not verified, the same as AutoAddPolicy in SshExecutor.
+        """
+        transport = paramiko.Transport((host_data.host, host_data.port))
+        transport.banner_timeout = self.__connect_timeout
+        try:
+            transport.start_client(timeout=self.__connect_timeout)
+            transport.auth_password(
+                username=host_data.user, password=host_data.password
+            )
+        except Exception:
+            transport.close()
+            raise
+        if self.__keepalive_interval:
+            transport.set_keepalive(self.__keepalive_interval)
+        return transport
+
+    def __evict(self, host_data: SshHostData) -> None:
+        """Closes broken and idle transports of the host. Must be called under lock."""
+        now = time.monotonic()
+        pooled_transports = self.__transports.get(host_data, [])
+        for pooled in list(pooled_transports):
+            if pooled.in_use or pooled.transport is None:
+                continue
+            idle = now - pooled.last_used > self.__idle_timeout
+            if idle or not pooled.is_healthy():
+                pooled.transport.close()
+                pooled_transports.remove(pooled)
 
 
 class SshExecutorProtocol(Protocol):
@@ -61,11 +438,12 @@ class SshExecutorProtocol(Protocol):
     host_data: SshHostData
 
     @abc.abstractmethod
-    def execute(self, command: str) -> SshExecutionResult:
+    def execute(self, command: str, timeout: float | None = 10) -> SshExecutionResult:
         """Run command in a implemented way.
 
         Args:
             command: command to execute
+            timeout: maximum time to wait for new output, None means no limit
         """
         pass
 
@@ -76,50 +454,166 @@ class SshExecutor(SshExecutorProtocol):
     Can be used as Context Manager:
         with SshExecutor(host_data) as ssh_executor:
             ssh_executor.execute()
+
+    If SshConnectionPool is given, transport is borrowed from the pool
+    and given back when the block ends, instead of a new connection.
     """
 
-    def __init__(self, host_data: SshHostData) -> None:
+    def __init__(
+        self,
+        host_data: SshHostData,
+        pool: SshConnectionPool | None = None,
+        output_memory_limit: int = 1024 * 1024,
+        spill_to_disk: bool = True,
+    ) -> None:
         """Constructor method for SshExecutor.
 
         Args:
             host_data: host connection information
+            pool: pool of connections to use, optional
+            output_memory_limit: bytes of stdout/stderr kept in memory, for each result
+            spill_to_disk: if output above the limit goes to a temporary file,
+                           otherwise it is dropped
         """
         self.__host_data = host_data
+        self.__pool = pool
+        self.__output_memory_limit = output_memory_limit
+        self.__spill_to_disk = spill_to_disk
         self.__client = None
+        self.__transport = None
 
     def __enter__(self) -> TypeSshExecutor:
         """Enter method for Context Manager.
-        Creates SSH client and starts the connection.
+        Creates SSH client and starts the connection, or borrows the transport from the pool.
 
         Returns:
             SshExecutor instance
         """
+        if self.__pool is not None:
+            self.__transport = self.__pool.acquire(self.__host_data)
+            return self
+
         self.__client = paramiko.SSHClient()
         self.__client.set_missing_host_key_policy(paramiko.AutoAddPolicy)
         self.__client.connect(
             hostname=self.__host_data.host,
+            port=self.__host_data.port,
             username=self.__host_data.user,
             password=self.__host_data.password,
         )
+        self.__transport = self.__client.get_transport()
         return self
 
     def __exit__(self, *exc):
         """Invoked after exiting Context Manager block.
-        Closes the Ssh connection.
+        Closes the Ssh connection, or gives the transport back to the pool.
         """
-        self.__client.close()
+        if self.__pool is not None:
+            self.__pool.release(self.__host_data, self.__transport)
+        else:
+            self.__client.close()
+        self.__transport = None
 
-    def execute(self, command: str) -> SshExecutionResult:
+    def execute(self, command: str, timeout: float | None = 10) -> SshExecutionResult:
         """Executes command through Ssh.
+        Every call opens a new channel on the current transport.
 
         Args:
             command: to execute
+            timeout: maximum time to wait for new output (and for a blocked write
+                to stdin); None for commands which can be silent for long,
+                e.g. git writing a big pack with --quiet
 
         Returns:
             execution_result: gathered result data
         """
-        result = self.__client.exec_command(command, timeout=10)
+        channel = self.__transport.open_session(timeout=10)
+        channel.settimeout(timeout)
+        channel.exec_command(command)
         execution_result = SshExecutionResult(
-            stdin=result[0], stdout=result[1], stderr=result[2]
+            stdin=channel.makefile_stdin("wb"),
+            channel=channel,
+            memory_limit=self.__output_memory_limit,
+            spill_to_disk=self.__spill_to_disk,
+            timeout=timeout,
         )
         return execution_result
+
+    def open_sftp(
+        self, window_size: int | None = None, max_packet_size: int | None = None
+    ) -> paramiko.SFTPClient:
+        """Opens SFTP session on the current transport.
+
+        Args:
+            window_size: SSH window size of the SFTP channel, paramiko default if None
+            max_packet_size: maximum SSH packet size of the SFTP channel
+
+        Returns:
+            SFTP client, which should be closed after use
+        """
+        return paramiko.SFTPClient.from_transport(
+            self.__transport, window_size=window_size, max_packet_size=max_packet_size
+        )
+
+    def execute_batch(
+        self, commands: list[str], timeout: float | None = 60
+    ) -> list[SshBatchResult]:
+        """Executes many commands through one Ssh channel, in one round-trip.
+
+        Commands are sent as one script to the remote shell, every one in its own subshell.
+        Output of each command is framed with unique delimiter lines on stdout and stderr,
+        which are used for splitting it back into separate results.
+
+        Args:
+            commands: commands to execute, in order
+            timeout: maximum time to wait for new output
+
+        Returns:
+            results in the same order as commands
+        """
+        marker = f"GIT_TESTS_{uuid.uuid4().hex}"
+        script_lines = []
+        for index, command in enumerate(commands):
+            script_lines.extend(
+                [
+                    f"printf '{marker}:BEGIN:{index}\\n'",
+                    f"printf '{marker}:BEGIN:{index}\\n' >&2",
+                    f"(\n{command}\n) < /dev/null",
+                    "rc=$?",
+                    f"printf '\\n{marker}:END:{index}:%d\\n' \"$rc\"",
+                    f"printf '\\n{marker}:END:{index}:%d\\n' \"$rc\" >&2",
+                ]
+            )
+
+        channel = self.__transport.open_session(timeout=10)
+        try:
+            channel.exec_command("\n".join(script_lines))
+            stdout, stderr, _ = drain_channel(channel, timeout=timeout)
+        finally:
+            channel.close()
+
+        frame = re.compile(
+            rf"{marker}:BEGIN:(\d+)\n(.*?)\n{marker}:END:\1:(\d+)\n", flags=re.DOTALL
+        )
+        stdout_frames = {
+            int(index): (output, int(rc))
+            for index, output, rc in frame.findall(stdout.decode(errors="replace"))
+        }
+        stderr_frames = {
+            int(index): output
+            for index, output, _ in frame.findall(stderr.decode(errors="replace"))
+        }
+
+        results = []
+        for index, command in enumerate(commands):
+            # command not framed means that the shell has stopped before it
+            output, rc = stdout_frames.get(index, ("", -1))
+            results.append(
+                SshBatchResult(
+                    command=command,
+                    rc=rc,
+                    stdout=output.splitlines(keepends=True),
+                    stderr=stderr_frames.get(index, "").splitlines(keepends=True),
+                )
+            )
+        return results
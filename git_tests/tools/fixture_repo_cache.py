@@ -0,0 +1,302 @@
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from git_tests.tools.executors.local_executor import LocalExecutor
+from git_tests.tools.repo_generator import (
+    FAST_IMPORT_STREAM_VERSION,
+    RepositoryGenerator,
+    RepositoryGeneratorParameters,
+)
+
+
+@dataclass
+class FixtureRepositoryEntry:
+    """One published repository of the FixtureRepositoryCache.
+
+    Args:
+        key: cache key, hash of the generator parameters and the git version
+        path: directory of the entry
+        size: size of the repository in bytes
+        last_used: time of the last use, as unix timestamp
+    """
+
+    key: str
+    path: Path
+    size: int
+    last_used: float
+
+    @property
+    def repository(self) -> Path:
+        """Bare repository of the entry."""
+        return Path(self.path, "repository")
+
+
+class FixtureRepositoryCache:
+    """On-disk cache of generated (RepositoryGenerator) bare repositories,
+    shared by sessions and pytest-xdist workers:
+        cache.checkout(RepositoryGeneratorParameters(file_count=10000), destination)
+
+    Entries are content-addressed: key is a hash of the generator parameters,
+    the generator stream version and the git version, so a repository is generated
+    once and reused until one of them changes.
+
+    Directory layout:
+        entries/<key>/repository, entries/<key>/metadata.json - published entries
+        locks/<key>.lock - entry locks: exclusive while generated, shared while used
+        tmp/ - entries being generated or deleted
+        cache.lock - lock of the eviction
+
+    Entry is generated in tmp/ and published with one atomic rename, so it is never
+    seen half-built. Above max_size, least recently used entries are evicted,
+    skipping entries used by other processes at the moment.
+    """
+
+    def __init__(self, cache_dir: Path, max_size: int = 2 * 1024**3) -> None:
+        """Constructor method for FixtureRepositoryCache.
+
+        Args:
+            cache_dir: directory of the cache, shared by all processes
+            max_size: maximum total size of entries in bytes
+        """
+        self.__cache_dir = cache_dir
+        self.__entries_dir = Path(cache_dir, "entries")
+        self.__locks_dir = Path(cache_dir, "locks")
+        self.__tmp_dir = Path(cache_dir, "tmp")
+        self.__max_size = max_size
+        self.__local_executor = LocalExecutor()
+        self.__git_version: str | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation_seconds = 0.0
+
+    @property
+    def git_version(self) -> str:
+        """Output of "git --version", part of the cache key."""
+        if self.__git_version is None:
+            result = self.__local_executor.execute(
+                ["git", "--version"], raw_output=True
+            )
+            self.__git_version = result.stdout.decode().strip()
+        return self.__git_version
+
+    def get_key(self, parameters: RepositoryGeneratorParameters) -> str:
+        """Returns cache key of the generated repository.
+
+        Args:
+            parameters: generator parameters
+        """
+        key_data = json.dumps(
+            {
+                "parameters": json.loads(parameters.to_json()),
+                "stream_version": FAST_IMPORT_STREAM_VERSION,
+                "git_version": self.git_version,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(key_data.encode()).hexdigest()
+
+    def checkout(
+        self,
+        parameters: RepositoryGeneratorParameters,
+        destination: Path,
+        bare: bool = False,
+    ) -> Path:
+        """Clones the cached repository, generating it first if it is not cached.
+        Objects are hardlinked, so the clone is cheap and independent of the cache.
+
+        Args:
+            parameters: generator parameters
+            destination: path of the new repository, must not exist
+            bare: if the new repository should be bare
+
+        Returns:
+            destination path
+        """
+        key = self.get_key(parameters)
+        with self.__use_entry(key, parameters) as entry:
+            result = self.__local_executor.execute(
+                [
+                    "git",
+                    "clone",
+                    "--quiet",
+                    "--local",
+                    *(["--bare"] if bare else []),
+                    str(entry.repository),
+                    str(destination),
+                ],
+                raw_output=True,
+            )
+        if result.rc != 0:
+            raise RuntimeError(f"Clone of cached repository failed: {result.stderr}")
+        self.evict(keep={key})
+        return destination
+
+    def entries(self) -> list[FixtureRepositoryEntry]:
+        """Returns published entries, least recently used first."""
+        entries = []
+        if not self.__entries_dir.is_dir():
+            return entries
+        for entry_dir in self.__entries_dir.iterdir():
+            metadata_path = Path(entry_dir, "metadata.json")
+            try:
+                metadata = json.loads(metadata_path.read_text())
+                last_used = metadata_path.stat().st_mtime
+            except (OSError, ValueError):
+                continue
+            entries.append(
+                FixtureRepositoryEntry(
+                    key=entry_dir.name,
+                    path=entry_dir,
+                    size=metadata["size"],
+                    last_used=last_used,
+                )
+            )
+        return sorted(entries, key=lambda entry: entry.last_used)
+
+    def evict(self, keep: set[str] | None = None) -> list[str]:
+        """Deletes least recently used entries, until the cache fits in max_size.
+        Entries used by other processes are skipped.
+
+        Args:
+            keep: keys of entries which must not be deleted
+
+        Returns:
+            keys of deleted entries
+        """
+        evicted = []
+        self.__cache_dir.mkdir(parents=True, exist_ok=True)
+        with self.__lock(Path(self.__cache_dir, "cache.lock"), fcntl.LOCK_EX):
+            entries = self.entries()
+            total_size = sum(entry.size for entry in entries)
+            for entry in entries:
+                if total_size <= self.__max_size:
+                    break
+                if entry.key in (keep or set()):
+                    continue
+                try:
+                    with self.__lock(
+                        self.__get_lock_path(entry.key),
+                        fcntl.LOCK_EX | fcntl.LOCK_NB,
+                    ):
+                        self.__remove(entry.path)
+                except BlockingIOError:
+                    continue
+                total_size -= entry.size
+                evicted.append(entry.key)
+        self.evictions += len(evicted)
+        return evicted
+
+    def summary(self) -> list[str]:
+        """Human-readable lines with cache counters."""
+        if not self.hits + self.misses:
+            return []
+        return [
+            f"Fixture repository cache: {self.hits} hits, {self.misses} misses, "
+            f"{self.generation_seconds:.3f}s generating, {self.evictions} evictions"
+        ]
+
+    @contextlib.contextmanager
+    def __use_entry(
+        self, key: str, parameters: RepositoryGeneratorParameters
+    ) -> Iterator[FixtureRepositoryEntry]:
+        """Holds shared lock of the entry, generating and publishing it first if needed."""
+        entry_dir = Path(self.__entries_dir, key)
+        lock_path = self.__get_lock_path(key)
+        with open(lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_SH)
+            try:
+                if entry_dir.is_dir():
+                    self.hits += 1
+                else:
+                    # exclusive lock, so only one process generates the entry
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                    if entry_dir.is_dir():
+                        self.hits += 1
+                    else:
+                        self.misses += 1
+                        self.__generate(entry_dir, parameters)
+                    fcntl.flock(lock, fcntl.LOCK_SH)
+
+                metadata_path = Path(entry_dir, "metadata.json")
+                os.utime(metadata_path)
+                yield FixtureRepositoryEntry(
+                    key=key,
+                    path=entry_dir,
+                    size=json.loads(metadata_path.read_text())["size"],
+                    last_used=time.time(),
+                )
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def __generate(
+        self, entry_dir: Path, parameters: RepositoryGeneratorParameters
+    ) -> None:
+        """Generates the entry in tmp/ and publishes it with an atomic rename."""
+        build_dir = Path(self.__tmp_dir, f"{entry_dir.name}_{uuid.uuid4().hex}")
+        build_dir.mkdir(parents=True)
+        try:
+            result = RepositoryGenerator(parameters).generate_local(
+                Path(build_dir, "repository"), bare=True
+            )
+            if not result.successful:
+                raise RuntimeError(f"Repository generation failed: {result.stderr}")
+            self.generation_seconds += result.seconds
+            Path(build_dir, "metadata.json").write_text(
+                json.dumps(
+                    {
+                        "parameters": json.loads(parameters.to_json()),
+                        "git_version": self.git_version,
+                        "size": self.__get_size(Path(build_dir, "repository")),
+                        "seconds": result.seconds,
+                    },
+                    indent=2,
+                )
+            )
+            self.__entries_dir.mkdir(parents=True, exist_ok=True)
+            os.rename(build_dir, entry_dir)
+        finally:
+            if build_dir.exists():
+                shutil.rmtree(build_dir, ignore_errors=True)
+
+    def __remove(self, entry_dir: Path) -> None:
+        """Unpublishes the entry with an atomic rename, then deletes it."""
+        self.__tmp_dir.mkdir(parents=True, exist_ok=True)
+        removed_dir = Path(self.__tmp_dir, f"{entry_dir.name}_{uuid.uuid4().hex}")
+        os.rename(entry_dir, removed_dir)
+        shutil.rmtree(removed_dir, ignore_errors=True)
+
+    def __get_lock_path(self, key: str) -> Path:
+        """Returns lock file of the entry, creating the locks directory."""
+        self.__locks_dir.mkdir(parents=True, exist_ok=True)
+        return Path(self.__locks_dir, f"{key}.lock")
+
+    @staticmethod
+    @contextlib.contextmanager
+    def __lock(lock_path: Path, operation: int) -> Iterator[None]:
+        """Holds flock of the file, for the whole block."""
+        with open(lock_path, "a") as lock:
+            fcntl.flock(lock, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def __get_size(path: Path) -> int:
+        """Returns total size of files in the directory."""
+        return sum(
+            file_path.stat().st_size
+            for file_path in path.rglob("*")
+            if file_path.is_file()
+        )
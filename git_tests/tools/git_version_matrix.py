@@ -0,0 +1,493 @@
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import re
+import shutil
+import statistics
+import sys
+import tarfile
+import time
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Literal
+from xml.etree import ElementTree
+
+from git_tests.tools.benchmark_comparison import load_benchmark_reports
+from git_tests.tools.executors.local_executor import LocalExecutor
+
+
+TARBALL_SUFFIXES = (".tar.gz", ".tgz", ".tar.xz", ".tar.bz2", ".tar")
+DEFAULT_MAKE_OPTIONS = (
+    "NO_GETTEXT=YesPlease",
+    "NO_TCLTK=YesPlease",
+    "NO_PERL=YesPlease",
+    "NO_PYTHON=YesPlease",
+    "INSTALL_SYMLINKS=YesPlease",
+)
+
+
+@dataclass
+class GitBuild:
+    """One git installation, a column of the GitVersionMatrix.
+
+    Args:
+        version: git version, e.g. "2.43.0"
+        prefix: installation prefix, git is prefix/bin/git
+        source: binary, installation prefix or source tarball it was prepared from
+    """
+
+    version: str
+    prefix: Path
+    source: Path
+
+    @property
+    def bin_dir(self) -> Path:
+        """Directory with git and its helper executables."""
+        return Path(self.prefix, "bin")
+
+    def get_environment(self) -> dict[str, str]:
+        """Environment variables which make this git the one found in PATH,
+        for LocalExecutor.execute(env=...) of a process using it.
+        """
+        return {
+            "PATH": os.pathsep.join(
+                [str(self.bin_dir), os.environ.get("PATH", os.defpath)]
+            )
+        }
+
+
+class GitBuildCache:
+    """Prepares git versions once, into versioned installation prefixes
+    shared by sessions:
+        build = GitBuildCache(cache_dir).prepare(Path("git-2.43.0.tar.xz"))
+
+    Accepted sources, already present locally:
+        - source tarball (e.g. git-2.43.0.tar.xz): built with make and installed
+          into builds/git-2.43.0-<hash>; key is hash of the tarball and make options
+        - git binary (e.g. /opt/git/bin/git): it and the git-* executables next to it
+          are linked into builds/git-<version>-<hash of the path>/bin
+        - installation prefix (directory with bin/git): used in place
+
+    Directory layout:
+        builds/<name> - published prefixes, with git_build.json
+        locks/<name>.lock - exclusive while the prefix is prepared
+        tmp/ - prefixes being prepared
+
+    Prefix is installed with DESTDIR into tmp/ and published with one atomic rename,
+    so other processes never see a half-installed git.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        make_options: tuple[str, ...] = DEFAULT_MAKE_OPTIONS,
+        jobs: int | None = None,
+    ) -> None:
+        """Constructor method for GitBuildCache.
+
+        Args:
+            cache_dir: directory of the cache
+            make_options: variables for git Makefile, part of the tarball build key
+            jobs: parallel make jobs, number of CPUs by default
+        """
+        self.__builds_dir = Path(cache_dir, "builds")
+        self.__locks_dir = Path(cache_dir, "locks")
+        self.__tmp_dir = Path(cache_dir, "tmp")
+        self.__make_options = make_options
+        self.__jobs = jobs or os.cpu_count() or 1
+        self.__local_executor = LocalExecutor()
+
+    def prepare(self, source: Path) -> GitBuild:
+        """Returns prepared git of the source, building it first if it is not cached.
+
+        Args:
+            source: source tarball, git binary or installation prefix
+        """
+        source = source.resolve()
+        if source.is_dir():
+            if not Path(source, "bin", "git").is_file():
+                raise ValueError(f"Not a git installation prefix: {source}")
+            return GitBuild(
+                version=self.get_version(Path(source, "bin", "git")),
+                prefix=source,
+                source=source,
+            )
+        if source.name.endswith(TARBALL_SUFFIXES):
+            key_hash = hashlib.sha256(json.dumps(self.__make_options).encode())
+            with open(source, "rb") as tarball:
+                for chunk in iter(lambda: tarball.read(1024**2), b""):
+                    key_hash.update(chunk)
+            name = f"{self.__get_tarball_name(source)}-{key_hash.hexdigest()[:12]}"
+            return self.__prepare_prefix(name, source, self.__build_tarball)
+
+        version = self.get_version(source)
+        path_hash = hashlib.sha256(str(source).encode()).hexdigest()[:12]
+        return self.__prepare_prefix(
+            f"git-{version}-{path_hash}", source, self.__link_binary
+        )
+
+    def get_version(self, git_binary: Path) -> str:
+        """Returns version of the git binary, e.g. "2.43.0".
+
+        Args:
+            git_binary: path of the git executable
+        """
+        result = self.__local_executor.execute(
+            [str(git_binary), "--version"], raw_output=True
+        )
+        match = re.match(r"git version (\S+)", result.stdout.decode())
+        if result.rc != 0 or match is None:
+            raise ValueError(f"Not a git binary: {git_binary}")
+        return match.group(1)
+
+    def __prepare_prefix(
+        self, name: str, source: Path, install: Callable[[Path, Path, Path], Path]
+    ) -> GitBuild:
+        """Returns published prefix, installing it under exclusive lock if needed."""
+        prefix = Path(self.__builds_dir, name)
+        metadata_path = Path(prefix, "git_build.json")
+        self.__locks_dir.mkdir(parents=True, exist_ok=True)
+        with self.__lock(Path(self.__locks_dir, f"{name}.lock")):
+            if not metadata_path.is_file():
+                staging_dir = Path(self.__tmp_dir, f"{name}_{uuid.uuid4().hex}")
+                staging_dir.mkdir(parents=True)
+                try:
+                    start = time.perf_counter()
+                    installed = install(source, prefix, staging_dir)
+                    Path(installed, "git_build.json").write_text(
+                        json.dumps(
+                            {
+                                "version": self.get_version(
+                                    Path(installed, "bin", "git")
+                                ),
+                                "source": str(source),
+                                "seconds": time.perf_counter() - start,
+                            },
+                            indent=2,
+                        )
+                    )
+                    self.__builds_dir.mkdir(parents=True, exist_ok=True)
+                    os.rename(installed, prefix)
+                finally:
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+        metadata = json.loads(metadata_path.read_text())
+        return GitBuild(version=metadata["version"], prefix=prefix, source=source)
+
+    def __build_tarball(self, source: Path, prefix: Path, staging_dir: Path) -> Path:
+        """Builds git from the tarball and installs it for prefix, into staging_dir."""
+        source_dir = Path(staging_dir, "src")
+        with tarfile.open(source) as tarball:
+            extract_options = (
+                {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+            )
+            tarball.extractall(source_dir, **extract_options)
+        top_dirs = list(source_dir.iterdir())
+        build_dir = top_dirs[0] if len(top_dirs) == 1 else source_dir
+
+        destdir = Path(staging_dir, "root")
+        result = self.__local_executor.execute(
+            [
+                "make",
+                f"-j{self.__jobs}",
+                f"prefix={prefix}",
+                f"DESTDIR={destdir}",
+                *self.__make_options,
+                "install",
+            ],
+            cwd=build_dir,
+            raw_output=True,
+        )
+        if result.rc != 0:
+            raise RuntimeError(
+                f"Build of {source.name} failed: "
+                f"{result.stderr.decode(errors='replace')[-2000:]}"
+            )
+        return Path(destdir, prefix.relative_to(prefix.anchor))
+
+    @staticmethod
+    def __link_binary(source: Path, prefix: Path, staging_dir: Path) -> Path:
+        """Links the git binary and its git-* neighbours into a prefix, in staging_dir."""
+        installed = Path(staging_dir, "prefix")
+        Path(installed, "bin").mkdir(parents=True)
+        Path(installed, "bin", "git").symlink_to(source)
+        for executable in source.parent.glob("git-*"):
+            if os.access(executable, os.X_OK):
+                Path(installed, "bin", executable.name).symlink_to(executable)
+        return installed
+
+    @staticmethod
+    def __get_tarball_name(source: Path) -> str:
+        """Returns tarball name without the archive suffix, e.g. "git-2.43.0"."""
+        for suffix in TARBALL_SUFFIXES:
+            if source.name.endswith(suffix):
+                return source.name.removesuffix(suffix)
+        return source.name
+
+    @staticmethod
+    @contextlib.contextmanager
+    def __lock(lock_path: Path) -> Iterator[None]:
+        """Holds exclusive flock of the file, for the whole block."""
+        with open(lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+@dataclass
+class MatrixRun:
+    """Run of the suite or the benchmarks against one git version.
+
+    Args:
+        build: git used by the run
+        rc: return code of pytest
+        seconds: wall time of the run
+        log_file: pytest output
+        outcomes: outcome of every test ("passed", "failed", "error", "skipped"),
+            keyed by test id, e.g. "TestClone::test_clone_basic"
+        timings: seconds of every test (tests mode, from junit report),
+            or median wall time of every benchmark, e.g. "StatusCommand.basic[small]"
+    """
+
+    build: GitBuild
+    rc: int
+    seconds: float
+    log_file: Path
+    outcomes: dict[str, str] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def successful(self) -> bool:
+        return self.rc == 0
+
+
+@dataclass
+class MatrixResult:
+    """Results of GitVersionMatrix: one MatrixRun per git version.
+
+    Args:
+        mode: "tests" or "benchmarks"
+        runs: runs in the order of the given builds
+    """
+
+    mode: str
+    runs: list[MatrixRun] = field(default_factory=list)
+
+    @property
+    def successful(self) -> bool:
+        return all(run.successful for run in self.runs)
+
+    def functional_table(self) -> list[str]:
+        """Version x test table of test outcomes."""
+        return self.__table(
+            "test",
+            lambda run, test_id: run.outcomes.get(test_id, "-"),
+            {test_id for run in self.runs for test_id in run.outcomes},
+        )
+
+    def timing_table(self) -> list[str]:
+        """Version x test (or benchmark) table of timings, in milliseconds."""
+        return self.__table(
+            "test" if self.mode == "tests" else "benchmark",
+            lambda run, name: (
+                f"{run.timings[name] * 1000:.2f}ms" if name in run.timings else "-"
+            ),
+            {name for run in self.runs for name in run.timings},
+        )
+
+    def summary(self) -> list[str]:
+        """Runs with their results, followed by both tables."""
+        lines = [
+            f"git {run.build.version}: {'passed' if run.successful else 'FAILED'} "
+            f"(rc {run.rc}, {run.seconds:.1f}s, log {run.log_file})"
+            for run in self.runs
+        ]
+        return [*lines, "", *self.functional_table(), "", *self.timing_table()]
+
+    def write(self, path: Path) -> None:
+        """Writes results as JSON.
+
+        Args:
+            path: destination file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(
+                {
+                    "mode": self.mode,
+                    "runs": [
+                        {
+                            "version": run.build.version,
+                            "prefix": str(run.build.prefix),
+                            "source": str(run.build.source),
+                            "rc": run.rc,
+                            "seconds": run.seconds,
+                            "outcomes": run.outcomes,
+                            "timings": run.timings,
+                        }
+                        for run in self.runs
+                    ],
+                },
+                indent=2,
+            )
+        )
+
+    def __table(
+        self,
+        title: str,
+        get_cell: Callable[[MatrixRun, str], str],
+        row_names: set[str],
+    ) -> list[str]:
+        """Formats table with a row per name and a column per version."""
+        if not row_names:
+            return []
+        width = max(len(title), *(len(name) for name in row_names))
+        columns = [run.build.version for run in self.runs]
+        column_width = max(10, *(len(column) for column in columns))
+        lines = [
+            f"{title:<{width}} "
+            + " ".join(f"{column:>{column_width}}" for column in columns)
+        ]
+        for name in sorted(row_names):
+            lines.append(
+                f"{name:<{width}} "
+                + " ".join(
+                    f"{get_cell(run, name):>{column_width}}" for run in self.runs
+                )
+            )
+        return lines
+
+
+class GitVersionMatrix:
+    """Runs the test suite or the benchmarks against several git versions in parallel:
+        GitVersionMatrix(builds, base_dir, work_dir, mode="benchmarks").run()
+
+    Every version runs in its own pytest process, with isolated:
+        - PATH: bin directory of the GitBuild first, so both the tests
+          and the server side find this git
+        - workspace (GIT_TESTS_WORKSPACE) under work_dir/git-<version>
+        - local stand-in of the git server (GIT_TESTS_LOCAL_SERVER_PORT),
+          on base_port + index * port_stride; the git server of the inventory
+          has its own git, so it can't be a part of the matrix
+    The fixture repository cache is shared, its entries are keyed by git version.
+    """
+
+    def __init__(
+        self,
+        builds: list[GitBuild],
+        base_dir: Path,
+        work_dir: Path,
+        mode: Literal["tests", "benchmarks"] = "tests",
+        pytest_args: tuple[str, ...] = (),
+        parallel: int | None = None,
+        base_port: int = 2222,
+        port_stride: int = 100,
+    ) -> None:
+        """Constructor method for GitVersionMatrix.
+
+        Args:
+            builds: git versions to run against, all different
+            base_dir: directory of the harness repository, where pytest runs
+            work_dir: directory for workspaces, logs and reports of the runs
+            mode: run the test suite or the benchmarks (git_tests/benchmarks)
+            pytest_args: additional pytest arguments, e.g. ("-n", "2")
+            parallel: number of versions run at the same time, all by default
+            base_port: stand-in server port of the first version
+            port_stride: port distance between versions, room for xdist workers
+        """
+        versions = [build.version for build in builds]
+        if len(set(versions)) != len(versions):
+            raise ValueError(f"Git versions must be different: {versions}")
+        self.__builds = builds
+        self.__base_dir = base_dir
+        self.__work_dir = work_dir
+        self.__mode = mode
+        self.__pytest_args = pytest_args
+        self.__parallel = parallel or len(builds) or 1
+        self.__base_port = base_port
+        self.__port_stride = port_stride
+        self.__local_executor = LocalExecutor()
+
+    def run(self) -> MatrixResult:
+        """Runs all versions and collects their results."""
+        with ThreadPoolExecutor(max_workers=self.__parallel) as pool:
+            runs = list(
+                pool.map(self.__run_version, range(len(self.__builds)), self.__builds)
+            )
+        return MatrixResult(mode=self.__mode, runs=runs)
+
+    def __run_version(self, index: int, build: GitBuild) -> MatrixRun:
+        """Runs pytest against one git version."""
+        run_dir = Path(self.__work_dir, f"git-{build.version}")
+        if run_dir.exists():
+            shutil.rmtree(run_dir)
+        run_dir.mkdir(parents=True)
+        junit_file = Path(run_dir, "junit.xml")
+        benchmark_results = Path(run_dir, "benchmark_results.json")
+
+        environment = {
+            **build.get_environment(),
+            "GIT_TESTS_WORKSPACE": str(Path(run_dir, "workspace")),
+            "GIT_TESTS_LOCAL_SERVER_PORT": str(
+                self.__base_port + index * self.__port_stride
+            ),
+            "GIT_TESTS_BENCHMARK_RESULTS": str(benchmark_results),
+        }
+        command = [
+            sys.executable,
+            "-m",
+            "pytest",
+            "-p",
+            "no:cacheprovider",
+            f"--junitxml={junit_file}",
+            *(["git_tests/benchmarks"] if self.__mode == "benchmarks" else []),
+            *self.__pytest_args,
+        ]
+        start = time.perf_counter()
+        result = self.__local_executor.execute(
+            command, cwd=self.__base_dir, env=environment, raw_output=True
+        )
+        matrix_run = MatrixRun(
+            build=build,
+            rc=result.rc,
+            seconds=time.perf_counter() - start,
+            log_file=Path(run_dir, "pytest.log"),
+        )
+        matrix_run.log_file.write_bytes(result.stdout + result.stderr)
+
+        if junit_file.is_file():
+            for test_id, outcome, seconds in self.__parse_junit(junit_file):
+                matrix_run.outcomes[test_id] = outcome
+                if self.__mode == "tests":
+                    matrix_run.timings[test_id] = seconds
+        report_files = sorted(run_dir.glob(f"{benchmark_results.stem}*.json"))
+        if self.__mode == "benchmarks" and report_files:
+            for benchmark in load_benchmark_reports(report_files).results:
+                if benchmark.successful:
+                    matrix_run.timings[
+                        f"{benchmark.name}[{benchmark.size}]"
+                    ] = statistics.median(benchmark.wall_samples)
+        return matrix_run
+
+    @staticmethod
+    def __parse_junit(junit_file: Path) -> Iterator[tuple[str, str, float]]:
+        """Yields id, outcome and seconds of every test case of the junit report."""
+        for test_case in ElementTree.parse(junit_file).iter("testcase"):
+            class_name = test_case.get("classname", "").rsplit(".", 1)[-1]
+            test_id = f"{class_name}::{test_case.get('name')}"
+            outcome = "passed"
+            for child, child_outcome in (
+                ("failure", "failed"),
+                ("error", "error"),
+                ("skipped", "skipped"),
+            ):
+                if test_case.find(child) is not None:
+                    outcome = child_outcome
+                    break
+            yield test_id, outcome, float(test_case.get("time", 0))
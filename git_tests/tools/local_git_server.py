@@ -0,0 +1,304 @@
+import errno
+import os
+import socket
+import subprocess
+import threading
+
+from pathlib import Path, PurePosixPath
+from typing import TypeVar
+
+import paramiko
+
+
+TypeLocalGitSshServer = TypeVar("TypeLocalGitSshServer", bound="LocalGitSshServer")
+
+
+class LocalGitSshServer:
+    """In-process stand-in for the git server: Ssh server listening on localhost.
+
+    Accepts password authentication for one user and runs exec requests
+    (git-upload-pack, git-receive-pack, or any shell command) as local processes.
+    SFTP subsystem is served too, so SftpTransfer can be used against it.
+
+    Virtual server paths are mapped to local directories, e.g. "/git-repos"
+    to a temporary directory, both in exec commands and in SFTP paths.
+
+    Can be used as Context Manager:
+        with LocalGitSshServer(user, password, path_map) as server:
+            server.port
+    """
+
+    def __init__(
+        self,
+        user: str,
+        password: str,
+        path_map: dict[str, Path],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        host_key_path: Path | None = None,
+    ) -> None:
+        """Constructor method for LocalGitSshServer.
+
+        Args:
+            user: accepted username
+            password: accepted password
+            path_map: virtual server path prefixes and local directories they point to
+            host: address to listen on
+            port: port to listen on, 0 means any free port
+            host_key_path: file with RSA host key; generated and saved if missing
+        """
+        self.user = user
+        self.password = password
+        self.path_map = {virtual: Path(real) for virtual, real in path_map.items()}
+        self.__host = host
+        self.__requested_port = port
+        self.__host_key = self.__load_host_key(host_key_path)
+        self.__socket = None
+        self.__accept_thread = None
+        self.__transports: list[paramiko.Transport] = []
+        self.__stopping = threading.Event()
+
+    @property
+    def port(self) -> int:
+        """Port the server is listening on."""
+        return self.__socket.getsockname()[1]
+
+    def __enter__(self) -> TypeLocalGitSshServer:
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self) -> None:
+        """Starts listening and accepting connections in a background thread."""
+        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.__socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.__socket.bind((self.__host, self.__requested_port))
+        self.__socket.listen(64)
+        self.__accept_thread = threading.Thread(target=self.__accept, daemon=True)
+        self.__accept_thread.start()
+
+    def stop(self) -> None:
+        """Stops accepting connections and closes all open ones."""
+        self.__stopping.set()
+        # close() alone doesn't wake up the thread blocked in accept()
+        try:
+            self.__socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.__socket.close()
+        for transport in self.__transports:
+            transport.close()
+        self.__accept_thread.join(timeout=5)
+
+    def map_path(self, path: str) -> str:
+        """Translates virtual server path to the local one."""
+        for virtual, real in self.path_map.items():
+            if path == virtual or path.startswith(virtual.rstrip("/") + "/"):
+                return str(real) + path[len(virtual.rstrip("/")) :]
+        return path
+
+    def map_command(self, command: str) -> str:
+        """Translates all virtual server paths in the shell command."""
+        for virtual, real in self.path_map.items():
+            command = command.replace(virtual, str(real))
+        return command
+
+    def __accept(self) -> None:
+        """Accepts connections until the server is stopped."""
+        while not self.__stopping.is_set():
+            try:
+                client, _ = self.__socket.accept()
+            except OSError:
+                return
+            transport = paramiko.Transport(client)
+            transport.add_server_key(self.__host_key)
+            transport.set_subsystem_handler(
+                "sftp", paramiko.SFTPServer, _LocalSftpServer
+            )
+            self.__transports = [
+                active for active in self.__transports if active.is_active()
+            ]
+            self.__transports.append(transport)
+            try:
+                transport.start_server(server=_GitSshServerInterface(self))
+            except (paramiko.SSHException, EOFError, OSError):
+                transport.close()
+
+    @staticmethod
+    def __load_host_key(host_key_path: Path | None) -> paramiko.RSAKey:
+        """Loads host key from the file, or generates a new one."""
+        if host_key_path is not None and host_key_path.exists():
+            return paramiko.RSAKey.from_private_key_file(str(host_key_path))
+        host_key = paramiko.RSAKey.generate(2048)
+        if host_key_path is not None:
+            host_key_path.parent.mkdir(parents=True, exist_ok=True)
+            host_key.write_private_key_file(str(host_key_path))
+        return host_key
+
+
+class _GitSshServerInterface(paramiko.ServerInterface):
+    """Authentication and channel handling for one LocalGitSshServer connection."""
+
+    def __init__(self, server: LocalGitSshServer) -> None:
+        self.server = server
+
+    def get_allowed_auths(self, username: str) -> str:
+        return "password"
+
+    def check_auth_password(self, username: str, password: str) -> int:
+        if username == self.server.user and password == self.server.password:
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind: str, chanid: int) -> int:
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(
+        self, channel: paramiko.Channel, command: bytes
+    ) -> bool:
+        thread = threading.Thread(
+            target=self.__run_command,
+            args=(channel, self.server.map_command(command.decode())),
+            daemon=True,
+        )
+        thread.start()
+        return True
+
+    def __run_command(self, channel: paramiko.Channel, command: str) -> None:
+        """Runs command as a local process, connected to the channel."""
+        process = subprocess.Popen(
+            ["/bin/sh", "-c", command],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        stdin_thread = threading.Thread(
+            target=self.__pump_stdin, args=(channel, process), daemon=True
+        )
+        stderr_thread = threading.Thread(
+            target=self.__pump_output,
+            args=(process.stderr, channel.sendall_stderr),
+            daemon=True,
+        )
+        stdin_thread.start()
+        stderr_thread.start()
+        self.__pump_output(process.stdout, channel.sendall)
+        stderr_thread.join()
+        rc = process.wait()
+        process.stdout.close()
+        process.stderr.close()
+        try:
+            channel.send_exit_status(rc)
+            channel.shutdown_write()
+            channel.close()
+        except (OSError, EOFError):
+            pass
+
+    @staticmethod
+    def __pump_stdin(channel: paramiko.Channel, process: subprocess.Popen) -> None:
+        """Copies data from the channel to stdin of the process, until EOF."""
+        try:
+            while data := channel.recv(32768):
+                process.stdin.write(data)
+                process.stdin.flush()
+        except (OSError, EOFError):
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+    @staticmethod
+    def __pump_output(stream, send) -> None:
+        """Copies data from the process output to the channel, until EOF."""
+        try:
+            while data := stream.read1(32768):
+                send(data)
+        except (OSError, EOFError):
+            pass
+
+
+class _LocalSftpServer(paramiko.SFTPServerInterface):
+    """SFTP operations of LocalGitSshServer, on the local filesystem."""
+
+    def __init__(self, server: _GitSshServerInterface, *args, **kwargs) -> None:
+        super().__init__(server, *args, **kwargs)
+        self.__map_path = server.server.map_path
+
+    def list_folder(self, path: str) -> list[paramiko.SFTPAttributes] | int:
+        local_path = self.__map_path(path)
+        try:
+            entries = []
+            for name in os.listdir(local_path):
+                attributes = paramiko.SFTPAttributes.from_stat(
+                    os.lstat(os.path.join(local_path, name))
+                )
+                attributes.filename = name
+                entries.append(attributes)
+            return entries
+        except OSError as error:
+            return paramiko.SFTPServer.convert_errno(error.errno)
+
+    def stat(self, path: str) -> paramiko.SFTPAttributes | int:
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(self.__map_path(path)))
+        except OSError as error:
+            return paramiko.SFTPServer.convert_errno(error.errno)
+
+    def lstat(self, path: str) -> paramiko.SFTPAttributes | int:
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.lstat(self.__map_path(path)))
+        except OSError as error:
+            return paramiko.SFTPServer.convert_errno(error.errno)
+
+    def open(
+        self, path: str, flags: int, attr: paramiko.SFTPAttributes
+    ) -> paramiko.SFTPHandle | int:
+        local_path = self.__map_path(path)
+        try:
+            mode = getattr(attr, "st_mode", None) or 0o666
+            fd = os.open(local_path, flags, mode)
+        except OSError as error:
+            return paramiko.SFTPServer.convert_errno(error.errno)
+
+        if flags & os.O_WRONLY:
+            file_mode = "ab" if flags & os.O_APPEND else "wb"
+        elif flags & os.O_RDWR:
+            file_mode = "a+b" if flags & os.O_APPEND else "r+b"
+        else:
+            file_mode = "rb"
+        handle = paramiko.SFTPHandle(flags)
+        handle.filename = local_path
+        handle.readfile = handle.writefile = os.fdopen(fd, file_mode)
+        return handle
+
+    def remove(self, path: str) -> int:
+        return self.__call(os.remove, self.__map_path(path))
+
+    def rename(self, oldpath: str, newpath: str) -> int:
+        return self.__call(
+            os.rename, self.__map_path(oldpath), self.__map_path(newpath)
+        )
+
+    def mkdir(self, path: str, attr: paramiko.SFTPAttributes) -> int:
+        return self.__call(os.mkdir, self.__map_path(path))
+
+    def rmdir(self, path: str) -> int:
+        return self.__call(os.rmdir, self.__map_path(path))
+
+    def canonicalize(self, path: str) -> str:
+        return str(PurePosixPath("/", path))
+
+    @staticmethod
+    def __call(function, *args) -> int:
+        """Runs filesystem operation and converts its error to SFTP code."""
+        try:
+            function(*args)
+        except OSError as error:
+            return paramiko.SFTPServer.convert_errno(error.errno or errno.EIO)
+        return paramiko.SFTP_OK
@@ -0,0 +1,398 @@
+import dataclasses
+import json
+import math
+import random
+import shlex
+import subprocess
+import time
+
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterator, Literal
+
+from git_tests.config import SingleGitServerConfig
+from git_tests.tools.executors.local_executor import LocalExecutor
+from git_tests.tools.executors.ssh_executor import SshExecutor
+
+
+# must be increased on every change of the generated repositories,
+# it is a part of FixtureRepositoryCache keys
+FAST_IMPORT_STREAM_VERSION = 2
+
+# printable bytes for text blobs: letters, digits, spaces and new lines
+TEXT_ALPHABET = (
+    b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789      \n"
+)
+TEXT_TRANSLATION = bytes(
+    TEXT_ALPHABET[byte % len(TEXT_ALPHABET)] for byte in range(256)
+)
+
+
+@dataclass(frozen=True)
+class RepositoryGeneratorParameters:
+    """Shape of a synthetic repository. The same parameters give the same repository,
+    commit hashes included.
+
+    Args:
+        file_count: number of files in the last commit of the main branch
+        tree_depth: number of directory levels above every file, 0 for a flat tree
+        dirs_per_level: number of subdirectories in every directory of the tree
+        commit_count: number of commits on the main branch; files are added
+            evenly over the commits, and every commit after the first one
+            also modifies some of the existing files
+        modified_files_per_commit: number of existing files modified by every commit
+        branch_count: number of branches, main branch included; other branches
+            start at random commits of the main branch and have one commit each
+        blob_size: median blob size in bytes
+        blob_size_distribution: "fixed" - every blob has blob_size bytes,
+            "uniform" - between 0 and 2 * blob_size,
+            "lognormal" - long tail of big blobs, up to blob_size_max
+        blob_size_max: upper limit of blob size in bytes
+        binary_ratio: fraction of files with binary (random) content,
+            the others have text content
+        main_branch: name of the main branch
+        seed: seed of the random generator
+    """
+
+    file_count: int = 100
+    tree_depth: int = 2
+    dirs_per_level: int = 4
+    commit_count: int = 10
+    modified_files_per_commit: int = 2
+    branch_count: int = 1
+    blob_size: int = 1024
+    blob_size_distribution: Literal["fixed", "uniform", "lognormal"] = "lognormal"
+    blob_size_max: int = 1024 * 1024
+    binary_ratio: float = 0.1
+    main_branch: str = "master"
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        """Validates the parameters."""
+        if self.file_count < 0 or self.commit_count < 1 or self.branch_count < 1:
+            raise ValueError(
+                "file_count must be >= 0, commit_count and branch_count >= 1"
+            )
+        if not 0 <= self.binary_ratio <= 1:
+            raise ValueError("binary_ratio must be between 0 and 1")
+
+    def to_json(self) -> str:
+        """Returns parameters as JSON, with sorted keys."""
+        return json.dumps(dataclasses.asdict(self), sort_keys=True)
+
+
+@dataclass
+class GeneratedRepository:
+    """Result structure for RepositoryGenerator.
+
+    Args:
+        path: path of the generated repository
+        parameters: parameters used for the generation
+        commits: number of generated commits, on all branches
+        blobs: number of streamed blobs
+        streamed_bytes: size of the fast-import stream
+        seconds: time of the generation
+        rc: return code of git fast-import
+        stderr: error output of git fast-import
+    """
+
+    path: Path | PurePosixPath
+    parameters: RepositoryGeneratorParameters
+    commits: int = 0
+    blobs: int = 0
+    streamed_bytes: int = 0
+    seconds: float = 0.0
+    rc: int = 0
+    stderr: str = ""
+
+    @property
+    def successful(self) -> bool:
+        return self.rc == 0
+
+
+@dataclass
+class FastImportStream:
+    """Feed of "git fast-import" for a synthetic repository, generated lazily.
+
+    Blob content is created chunk by chunk while the stream is consumed,
+    so nothing is kept in memory or written to disk, whatever the repository size.
+
+    Args:
+        parameters: shape of the repository
+    """
+
+    parameters: RepositoryGeneratorParameters
+    commits: int = field(init=False, default=0)
+    blobs: int = field(init=False, default=0)
+    streamed_bytes: int = field(init=False, default=0)
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Yields chunks of the stream."""
+        for chunk in self.__iter_commands():
+            self.streamed_bytes += len(chunk)
+            yield chunk
+
+    def __iter_commands(self) -> Iterator[bytes]:
+        """Yields fast-import commands: main branch commits, then other branches."""
+        parameters = self.parameters
+        rng = random.Random(parameters.seed)
+        paths = self.__get_paths(rng)
+        main_ref = f"refs/heads/{parameters.main_branch}"
+
+        existing: list[str] = []
+        for index in range(parameters.commit_count):
+            start = len(paths) * index // parameters.commit_count
+            end = len(paths) * (index + 1) // parameters.commit_count
+            modified = rng.sample(
+                existing, min(parameters.modified_files_per_commit, len(existing))
+            )
+            yield from self.__iter_commit(
+                rng=rng,
+                ref=main_ref,
+                mark=index + 1,
+                parent=index or None,
+                message=f"Synthetic commit {index + 1}",
+                paths=paths[start:end] + modified,
+            )
+            existing += paths[start:end]
+
+        for branch in range(1, parameters.branch_count):
+            yield from self.__iter_commit(
+                rng=rng,
+                ref=f"refs/heads/synthetic_branch_{branch:03d}",
+                mark=parameters.commit_count + branch,
+                parent=rng.randint(1, parameters.commit_count),
+                message=f"Synthetic branch commit {branch}",
+                paths=rng.sample(existing, min(1, len(existing))),
+            )
+        yield b"done\n"
+
+    def __iter_commit(
+        self,
+        rng: random.Random,
+        ref: str,
+        mark: int,
+        parent: int | None,
+        message: str,
+        paths: list[str],
+    ) -> Iterator[bytes]:
+        """Yields one commit with inline blobs of its files."""
+        encoded_message = message.encode()
+        author = f"Git Tests <git_tests@example.com> {1600000000 + mark * 60} +0000"
+        header = [
+            f"commit {ref}",
+            f"mark :{mark}",
+            f"author {author}",
+            f"committer {author}",
+            f"data {len(encoded_message)}",
+        ]
+        yield "\n".join(header).encode() + b"\n" + encoded_message + b"\n"
+        if parent is not None:
+            yield f"from :{parent}\n".encode()
+        for path in paths:
+            size = self.__get_blob_size(rng)
+            yield f"M 100644 inline {path}\ndata {size}\n".encode()
+            yield from self.__iter_blob(rng, size, binary=path.endswith(".bin"))
+            yield b"\n"
+            self.blobs += 1
+        yield b"\n"
+        self.commits += 1
+
+    def __get_paths(self, rng: random.Random) -> list[str]:
+        """Returns paths of all files, spread over the directory tree."""
+        parameters = self.parameters
+        paths = []
+        for index in range(parameters.file_count):
+            dirs = [
+                f"dir_{rng.randrange(parameters.dirs_per_level):02d}"
+                for _ in range(parameters.tree_depth)
+            ]
+            extension = "bin" if rng.random() < parameters.binary_ratio else "txt"
+            paths.append("/".join(dirs + [f"file_{index:06d}.{extension}"]))
+        return paths
+
+    def __get_blob_size(self, rng: random.Random) -> int:
+        """Returns size of the next blob, from the selected distribution."""
+        parameters = self.parameters
+        if parameters.blob_size_distribution == "fixed":
+            size = parameters.blob_size
+        elif parameters.blob_size_distribution == "uniform":
+            size = rng.randint(0, 2 * parameters.blob_size)
+        else:
+            size = int(rng.lognormvariate(math.log(max(parameters.blob_size, 1)), 1.0))
+        return min(size, parameters.blob_size_max)
+
+    @staticmethod
+    def __iter_blob(
+        rng: random.Random, size: int, binary: bool, chunk_size: int = 64 * 1024
+    ) -> Iterator[bytes]:
+        """Yields blob content in chunks: random bytes, or printable text."""
+        remaining = size
+        while remaining:
+            chunk = rng.randbytes(min(remaining, chunk_size))
+            yield chunk if binary else chunk.translate(TEXT_TRANSLATION)
+            remaining -= len(chunk)
+
+
+class RepositoryGenerator:
+    """Generates synthetic repositories, by streaming FastImportStream
+    straight into "git fast-import", without intermediate files:
+        generator = RepositoryGenerator(RepositoryGeneratorParameters(file_count=10000))
+        generator.generate_local(Path("big_repo"))
+        with SshExecutor(host_data) as ssh_executor:
+            generator.generate_remote(ssh_executor, remote_repo_path)
+    """
+
+    def __init__(self, parameters: RepositoryGeneratorParameters) -> None:
+        """Constructor method for RepositoryGenerator.
+
+        Args:
+            parameters: shape of generated repositories
+        """
+        self.parameters = parameters
+        self.__local_executor = LocalExecutor()
+
+    def generate_local(
+        self, repo_path: Path, bare: bool = False
+    ) -> GeneratedRepository:
+        """Generates local repository. Working repository gets the main branch checked out.
+
+        Args:
+            repo_path: path of the repository, created if it doesn't exist;
+                existing repository must have no commits
+            bare: if the repository should be bare
+        """
+        started = time.perf_counter()
+        result = self.__local_executor.execute(
+            ["git", "init", "--quiet", *(["--bare"] if bare else []), str(repo_path)],
+            raw_output=True,
+        )
+        if result.rc == 0:
+            # HEAD must point to the main branch, whatever init.defaultBranch is
+            result = self.__local_executor.execute(
+                [
+                    "git",
+                    "-C",
+                    str(repo_path),
+                    "symbolic-ref",
+                    "HEAD",
+                    f"refs/heads/{self.parameters.main_branch}",
+                ],
+                raw_output=True,
+            )
+        if result.rc != 0:
+            raise RuntimeError(f"Repository init failed: {result.stderr}")
+
+        stream = FastImportStream(self.parameters)
+        process = subprocess.Popen(
+            ["git", "-C", str(repo_path), "fast-import", "--quiet", "--done"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        try:
+            self.__write_stream(stream, process.stdin)
+        except BrokenPipeError:
+            pass  # fast-import failed, its error is reported below
+        finally:
+            process.stdin.close()
+        stderr = process.stderr.read().decode(errors="replace")
+        rc = process.wait()
+
+        if rc == 0 and not bare:
+            checkout = self.__local_executor.execute(
+                [
+                    "git",
+                    "-C",
+                    str(repo_path),
+                    "checkout",
+                    "--quiet",
+                    "--force",
+                    self.parameters.main_branch,
+                ],
+                raw_output=True,
+            )
+            rc, stderr = checkout.rc, stderr + checkout.stderr.decode(errors="replace")
+        return self.__get_result(repo_path, stream, started, rc, stderr)
+
+    def generate_remote(
+        self, ssh_executor: SshExecutor, repo_path: PurePosixPath
+    ) -> GeneratedRepository:
+        """Generates bare repository on the server, e.g. the server test repository
+        from SingleGitServerConfig. Stream is sent through stdin of the Ssh channel.
+
+        Args:
+            ssh_executor: connected SshExecutor of the git server
+            repo_path: path of the bare repository on the server, created if it doesn't exist;
+                existing repository must have no commits
+        """
+        started = time.perf_counter()
+        quoted_path = shlex.quote(str(repo_path))
+        main_ref = f"refs/heads/{self.parameters.main_branch}"
+        stream = FastImportStream(self.parameters)
+        # fast-import is silent while it writes the pack, however long it takes
+        result = ssh_executor.execute(
+            f"git init --quiet --bare {quoted_path} && "
+            f"git --git-dir={quoted_path} symbolic-ref HEAD {shlex.quote(main_ref)} && "
+            f"git --git-dir={quoted_path} fast-import --quiet --done",
+            timeout=None,
+        )
+        try:
+            self.__write_stream(stream, result.stdin)
+        except OSError:
+            if not (result.channel.closed or result.channel.exit_status_ready()):
+                raise
+            # channel closed by failed fast-import, its error is reported below
+        finally:
+            result.stdin.close()
+        rc = result.recv_exit_status()
+        stderr = "".join(result.read(channel="stderr"))
+        result.close()
+        return self.__get_result(repo_path, stream, started, rc, stderr)
+
+    def generate_server_repository(
+        self,
+        ssh_executor: SshExecutor,
+        single_git_server_config: SingleGitServerConfig,
+        repo_name: str | None = None,
+    ) -> GeneratedRepository:
+        """Seeds the server test repository (empty, as created by provisioning).
+
+        Args:
+            ssh_executor: connected SshExecutor of the git server
+            single_git_server_config: server repositories configuration
+            repo_name: name of the repository, test_repo_name of the worker by default
+        """
+        return self.generate_remote(
+            ssh_executor=ssh_executor,
+            repo_path=PurePosixPath(
+                single_git_server_config.repos_path,
+                repo_name or single_git_server_config.test_repo_name,
+            ),
+        )
+
+    def __get_result(
+        self,
+        repo_path: Path | PurePosixPath,
+        stream: FastImportStream,
+        started: float,
+        rc: int,
+        stderr: str,
+    ) -> GeneratedRepository:
+        """Builds result of the generation."""
+        return GeneratedRepository(
+            path=repo_path,
+            parameters=self.parameters,
+            commits=stream.commits,
+            blobs=stream.blobs,
+            streamed_bytes=stream.streamed_bytes,
+            seconds=time.perf_counter() - started,
+            rc=rc,
+            stderr=stderr,
+        )
+
+    @staticmethod
+    def __write_stream(stream: FastImportStream, output: BinaryIO) -> None:
+        """Writes the whole stream to the output, chunk by chunk."""
+        for chunk in stream:
+            output.write(chunk)
@@ -0,0 +1,214 @@
+import functools
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Literal
+
+from git_tests.tools.executors.local_executor import (
+    LocalExecutionResult,
+    LocalExecutor,
+)
+
+
+@dataclass
+class TemplateCheckoutTiming:
+    """Time of one working copy creation.
+
+    Args:
+        label: who asked for the working copy, e.g. test class name
+        seconds: time of the copy
+        strategy: strategy used for the copy
+    """
+
+    label: str
+    seconds: float
+    strategy: str
+
+
+class RepositoryTemplateCache:
+    """Cache of a cloned repository, copied cheaply for every test which needs a clone.
+
+    Repository is cloned from the server once (template), then every working copy
+    is made from the template, using one of the strategies:
+        - "reflink": copy-on-write copy of the whole tree (cp --reflink), if filesystem supports it
+        - "hardlink": objects are hardlinked (git never modifies them), other files copied
+        - "shared": objects are not copied, template objects are used via alternates
+        - "copy": full copy
+    "auto" picks the first supported one of reflink and hardlink.
+
+    Working copy is the same as a fresh clone, including remote configuration,
+    so it can fetch from and push to the server.
+    Template must be invalidated when the server repository changes.
+    """
+
+    def __init__(
+        self,
+        template_dir: Path,
+        clone_template: Callable[[Path], LocalExecutionResult],
+        strategy: Literal["auto", "reflink", "hardlink", "shared", "copy"] = "auto",
+    ) -> None:
+        """Constructor method for RepositoryTemplateCache.
+
+        Args:
+            template_dir: where to keep the template clone
+            clone_template: clones the server repository into the given path
+            strategy: how to make working copies from the template
+        """
+        self.__template_dir = template_dir
+        self.__clone_template = clone_template
+        self.__strategy = strategy
+        self.__lock = threading.Lock()
+        self.__local_executor = LocalExecutor()
+        self.clone_seconds: list[float] = []
+        self.timings: list[TemplateCheckoutTiming] = []
+
+    @property
+    def strategy(self) -> str:
+        """Strategy used for working copies, "auto" resolved."""
+        if self.__strategy == "auto":
+            self.__strategy = "reflink" if self.__reflink_supported() else "hardlink"
+        return self.__strategy
+
+    def checkout(self, destination: Path, label: str = "", record: bool = True) -> Path:
+        """Creates working copy of the server repository.
+
+        Args:
+            destination: path of the new working copy, must not exist
+            label: name to record the timing with, e.g. test class name
+            record: if the copy replaces a clone of a test and should be in the summary;
+                False e.g. for the root of WorkflowStateTree, whose forks are recorded
+
+        Returns:
+            destination path
+        """
+        with self.__lock:
+            if not self.__template_dir.exists():
+                self.__create_template()
+
+        start = time.perf_counter()
+        self.copy(self.__template_dir, destination)
+        if record:
+            self.record_timing(label, time.perf_counter() - start)
+        return destination
+
+    def record_timing(self, label: str, seconds: float) -> None:
+        """Records time of a working copy made instead of a clone,
+        e.g. a fork of WorkflowStateTree.
+
+        Args:
+            label: who asked for the working copy, e.g. test class name
+            seconds: time of the copy
+        """
+        self.timings.append(
+            TemplateCheckoutTiming(label=label, seconds=seconds, strategy=self.strategy)
+        )
+
+    def copy(self, source: Path, destination: Path) -> None:
+        """Copies working repository with the cache strategy.
+        Used for the template, but works for any other repository too.
+
+        Args:
+            source: working repository to copy
+            destination: path of the copy, must not exist
+        """
+        strategy = self.strategy
+        objects_dir = Path(source, ".git", "objects")
+        if strategy == "reflink":
+            result = self.__local_executor.execute(
+                ["cp", "-a", "--reflink=always", str(source), str(destination)]
+            )
+            if result.rc != 0:
+                raise RuntimeError(f"Reflink copy failed: {result.stderr}")
+        elif strategy == "hardlink":
+            shutil.copytree(
+                source,
+                destination,
+                symlinks=True,
+                copy_function=functools.partial(
+                    self.__link_objects, objects_dir=str(objects_dir)
+                ),
+            )
+        elif strategy == "shared":
+            shutil.copytree(
+                source,
+                destination,
+                symlinks=True,
+                ignore=lambda directory, _: (
+                    os.listdir(directory) if Path(directory) == objects_dir else []
+                ),
+            )
+            Path(destination, ".git", "objects", "info").mkdir(parents=True)
+            Path(destination, ".git", "objects", "info", "alternates").write_text(
+                f"{objects_dir}\n"
+            )
+        else:
+            shutil.copytree(source, destination, symlinks=True)
+
+    def invalidate(self) -> None:
+        """Deletes the template, so the next checkout clones the server repository again.
+        Should be called after the server repository is changed.
+        Working copies made with "shared" strategy must not be used after that.
+        """
+        with self.__lock:
+            if self.__template_dir.exists():
+                shutil.rmtree(self.__template_dir)
+
+    def summary(self) -> list[str]:
+        """Human-readable lines: clone time and time saved by every working copy."""
+        if not self.clone_seconds:
+            return []
+        clone_seconds = sum(self.clone_seconds) / len(self.clone_seconds)
+        lines = [
+            f"Template clone: {clone_seconds:.3f}s "
+            f"(cloned {len(self.clone_seconds)} time(s)), strategy: {self.strategy}"
+        ]
+        for timing in self.timings:
+            lines.append(
+                f"  {timing.label}: {timing.seconds:.3f}s, "
+                f"saved {clone_seconds - timing.seconds:.3f}s"
+            )
+        # template clones are the cost of the cache
+        saved = (
+            len(self.timings) * clone_seconds
+            - sum(timing.seconds for timing in self.timings)
+            - sum(self.clone_seconds)
+        )
+        lines.append(f"Total saved: {saved:.3f}s")
+        return lines
+
+    def __create_template(self) -> None:
+        """Clones the server repository into the template directory."""
+        self.__template_dir.parent.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        result = self.__clone_template(self.__template_dir)
+        if result.rc != 0:
+            raise RuntimeError(f"Template clone failed: {result.stderr}")
+        self.clone_seconds.append(time.perf_counter() - start)
+
+    @staticmethod
+    def __link_objects(source: str, destination: str, objects_dir: str) -> None:
+        """Hardlinks files of the object database, copies the other ones."""
+        if os.path.commonpath([source, objects_dir]) == objects_dir:
+            try:
+                os.link(source, destination)
+                return
+            except OSError:
+                # e.g. different filesystem, fall back to a copy
+                pass
+        shutil.copy2(source, destination)
+
+    def __reflink_supported(self) -> bool:
+        """Checks if cp --reflink works in the template's filesystem."""
+        self.__template_dir.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=self.__template_dir.parent) as probe_dir:
+            source = Path(probe_dir, "source")
+            source.write_bytes(b"reflink")
+            probe = self.__local_executor.execute(
+                ["cp", "--reflink=always", str(source), str(Path(probe_dir, "copy"))]
+            )
+        return probe.rc == 0
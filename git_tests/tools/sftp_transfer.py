@@ -0,0 +1,267 @@
+import os
+import posixpath
+import shlex
+import stat
+import tempfile
+import uuid
+
+from pathlib import Path, PurePosixPath
+from typing import TypeVar
+
+import paramiko
+
+from git_tests.tools.executors.local_executor import LocalExecutor
+from git_tests.tools.executors.ssh_executor import SshExecutor
+
+
+TypeSftpTransfer = TypeVar("TypeSftpTransfer", bound="SftpTransfer")
+
+
+class SftpTransfer:
+    """Bulk file transfer to and from the git server, using SFTP on SshExecutor connection.
+
+    Writes are pipelined (no waiting for each write confirmation)
+    and reads are prefetched, with a large SSH window, so a big file
+    is transferred at the link speed instead of the round-trip speed.
+
+    Repositories are transferred as single git bundle files, not as many small files.
+
+    Can be used as Context Manager:
+        with SshExecutor(host_data) as ssh_executor, SftpTransfer(ssh_executor) as sftp:
+            sftp.seed_repository(local_repo_path, remote_repo_path)
+    """
+
+    def __init__(
+        self,
+        ssh_executor: SshExecutor,
+        window_size: int = 64 * 1024 * 1024,
+        max_packet_size: int = 32 * 1024,
+        remote_tmp_dir: PurePosixPath = PurePosixPath("/tmp"),
+        remote_command_timeout: float | None = None,
+    ) -> None:
+        """Constructor method for SftpTransfer.
+
+        Args:
+            ssh_executor: connected SshExecutor, used for SFTP and remote git commands
+            window_size: SSH window size of the SFTP channel
+            max_packet_size: maximum SSH packet size of the SFTP channel
+            remote_tmp_dir: directory on the server for temporary bundles
+            remote_command_timeout: maximum silence of remote git commands
+                (bundle fetch and create are quiet until they end), None means no limit
+        """
+        self.__ssh_executor = ssh_executor
+        self.__window_size = window_size
+        self.__max_packet_size = max_packet_size
+        self.__remote_tmp_dir = remote_tmp_dir
+        self.__remote_command_timeout = remote_command_timeout
+        self.__local_executor = LocalExecutor()
+        self.__sftp = None
+
+    def __enter__(self) -> TypeSftpTransfer:
+        """Enter method for Context Manager.
+        Opens SFTP session.
+
+        Returns:
+            SftpTransfer instance
+        """
+        self.__sftp = self.__ssh_executor.open_sftp(
+            window_size=self.__window_size, max_packet_size=self.__max_packet_size
+        )
+        return self
+
+    def __exit__(self, *exc):
+        """Invoked after exiting Context Manager block.
+        Closes SFTP session.
+        """
+        self.__sftp.close()
+
+    def upload_file(self, local_path: Path, remote_path: PurePosixPath) -> int:
+        """Sends local file to the server, with pipelined writes.
+
+        Args:
+            local_path: file to send
+            remote_path: destination path on the server
+
+        Returns:
+            number of transferred bytes
+        """
+        file_size = local_path.stat().st_size
+        with open(local_path, "rb") as local_file:
+            self.__sftp.putfo(local_file, str(remote_path), file_size=file_size)
+        return file_size
+
+    def download_file(self, remote_path: PurePosixPath, local_path: Path) -> int:
+        """Gets file from the server, with prefetched reads.
+
+        Args:
+            remote_path: file to get
+            local_path: destination path
+
+        Returns:
+            number of transferred bytes
+        """
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(local_path, "wb") as local_file:
+            return self.__sftp.getfo(str(remote_path), local_file, prefetch=True)
+
+    def upload_directory(self, local_path: Path, remote_path: PurePosixPath) -> int:
+        """Sends local directory tree to the server, creating missing directories.
+
+        Args:
+            local_path: directory to send
+            remote_path: destination directory on the server
+
+        Returns:
+            number of transferred bytes
+        """
+        transferred = 0
+        for directory, _, file_names in os.walk(local_path):
+            relative = Path(directory).relative_to(local_path)
+            remote_directory = PurePosixPath(remote_path, *relative.parts)
+            self.__make_remote_dir(remote_directory)
+            for file_name in file_names:
+                transferred += self.upload_file(
+                    Path(directory, file_name),
+                    PurePosixPath(remote_directory, file_name),
+                )
+        return transferred
+
+    def download_directory(self, remote_path: PurePosixPath, local_path: Path) -> int:
+        """Gets directory tree from the server.
+
+        Args:
+            remote_path: directory to get
+            local_path: destination directory
+
+        Returns:
+            number of transferred bytes
+        """
+        transferred = 0
+        local_path.mkdir(parents=True, exist_ok=True)
+        for entry in self.__sftp.listdir_attr(str(remote_path)):
+            remote_entry = PurePosixPath(remote_path, entry.filename)
+            local_entry = Path(local_path, entry.filename)
+            if stat.S_ISDIR(entry.st_mode):
+                transferred += self.download_directory(remote_entry, local_entry)
+            elif stat.S_ISREG(entry.st_mode):
+                transferred += self.download_file(remote_entry, local_entry)
+        return transferred
+
+    def seed_repository(
+        self, local_repo_path: Path, remote_repo_path: PurePosixPath
+    ) -> None:
+        """Fills existing bare repository on the server with all refs of a local repository.
+        Local repository is sent as one bundle file and fetched on the server.
+        Nothing is sent for a local repository without refs (e.g. no commits yet),
+        as a bundle can't be empty.
+
+        Args:
+            local_repo_path: local repository (working or bare)
+            remote_repo_path: bare repository on the server
+        """
+        refs = self.__local_executor.execute(
+            ["git", "-C", str(local_repo_path), "for-each-ref", "--count=1"],
+            raw_output=True,
+        )
+        if refs.rc != 0:
+            raise RuntimeError(f"Repository not readable: {refs.stderr.decode()}")
+        if not refs.stdout:
+            return
+
+        with tempfile.TemporaryDirectory(prefix="git_tests_sftp_") as tmp_dir:
+            bundle_path = Path(tmp_dir, "seed.bundle")
+            result = self.__local_executor.execute(
+                [
+                    "git",
+                    "-C",
+                    str(local_repo_path),
+                    "bundle",
+                    "create",
+                    str(bundle_path),
+                    "--all",
+                ]
+            )
+            if result.rc != 0:
+                raise RuntimeError(f"Bundle creation failed: {result.stderr}")
+            remote_bundle_path = self.__get_remote_tmp_path("seed.bundle")
+            self.upload_file(bundle_path, remote_bundle_path)
+
+        self.__run_remote(
+            f"git --git-dir={shlex.quote(str(remote_repo_path))} fetch --quiet "
+            f"{shlex.quote(str(remote_bundle_path))} '+refs/*:refs/*'",
+            remote_bundle_path,
+        )
+
+    def harvest_repository(
+        self, remote_repo_path: PurePosixPath, local_bundle_path: Path
+    ) -> bool:
+        """Gets all refs of the repository on the server as a local bundle file.
+        Bundle can be cloned with "git clone <bundle>" or inspected with "git bundle".
+
+        Args:
+            remote_repo_path: repository on the server
+            local_bundle_path: destination bundle file
+
+        Returns:
+            False if the repository has no refs (e.g. empty one, right after
+            provisioning), so there is nothing to bundle and no file is written
+        """
+        git_dir = f"--git-dir={shlex.quote(str(remote_repo_path))}"
+        remote_bundle_path = self.__get_remote_tmp_path("harvest.bundle")
+        try:
+            self.__run_remote(
+                f'test -z "$(git {git_dir} for-each-ref --count=1)" || '
+                f"git {git_dir} bundle create "
+                f"--quiet {shlex.quote(str(remote_bundle_path))} --all"
+            )
+            try:
+                self.__sftp.stat(str(remote_bundle_path))
+            except FileNotFoundError:
+                return False
+            self.download_file(remote_bundle_path, local_bundle_path)
+            return True
+        finally:
+            self.__remove_remote(remote_bundle_path)
+
+    def __run_remote(
+        self, command: str, remove_after: PurePosixPath | None = None
+    ) -> None:
+        """Runs command on the server and raises on failure."""
+        try:
+            result = self.__ssh_executor.execute(
+                command, timeout=self.__remote_command_timeout
+            )
+            rc = result.recv_exit_status()
+            if rc != 0:
+                stderr = "".join(result.read(channel="stderr"))
+                raise RuntimeError(f"Remote command failed ({rc}): {command}\n{stderr}")
+        finally:
+            if remove_after is not None:
+                self.__remove_remote(remove_after)
+
+    def __remove_remote(self, remote_path: PurePosixPath) -> None:
+        """Removes file on the server, if it exists."""
+        try:
+            self.__sftp.remove(str(remote_path))
+        except FileNotFoundError:
+            pass
+
+    def __make_remote_dir(self, remote_path: PurePosixPath) -> None:
+        """Creates directory on the server, with parents, if it doesn't exist."""
+        try:
+            self.__sftp.stat(str(remote_path))
+        except FileNotFoundError:
+            parent = PurePosixPath(posixpath.dirname(str(remote_path)))
+            if parent != remote_path:
+                self.__make_remote_dir(parent)
+            try:
+                self.__sftp.mkdir(str(remote_path))
+            except (IOError, paramiko.SFTPError):
+                # created in the meantime, by another worker
+                self.__sftp.stat(str(remote_path))
+
+    def __get_remote_tmp_path(self, name: str) -> PurePosixPath:
+        """Returns unique path for a temporary file on the server."""
+        return PurePosixPath(
+            self.__remote_tmp_dir, f"git_tests_{uuid.uuid4().hex}_{name}"
+        )
@@ -0,0 +1,57 @@
+import atexit
+import functools
+import os
+import shutil
+import stat
+import tempfile
+
+from pathlib import Path
+
+
+ASKPASS_PASSWORD_VARIABLE = "GIT_TESTS_ASKPASS_PASSWORD"
+
+ASKPASS_SCRIPT = f"""#!/bin/sh
+printf '%s\\n' "${ASKPASS_PASSWORD_VARIABLE}"
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def get_askpass_script() -> Path:
+    """Creates SSH_ASKPASS helper script, once per process.
+
+    Script does not contain the password, it prints the value
+    of GIT_TESTS_ASKPASS_PASSWORD variable from its environment.
+    Script directory is deleted when the process exits.
+    """
+    script_dir = tempfile.mkdtemp(prefix="git_tests_askpass_")
+    atexit.register(shutil.rmtree, script_dir, ignore_errors=True)
+    script_path = Path(script_dir, "askpass.sh")
+    script_path.write_text(ASKPASS_SCRIPT)
+    script_path.chmod(stat.S_IRWXU)
+    return script_path
+
+
+def get_askpass_env(password: str) -> dict[str, str]:
+    """Environment variables which make ssh (started by git) read the password
+    from the askpass helper, instead of a terminal prompt.
+    No pty is needed, so commands can run with LocalExecutor.
+
+    SSH_ASKPASS_REQUIRE needs OpenSSH 8.4 or newer.
+    Unknown host keys are added to known_hosts, but changed keys are still rejected
+    (StrictHostKeyChecking=accept-new), unless GIT_SSH_COMMAND is already set
+    in the environment.
+
+    Args:
+        password: password for the ssh user
+    """
+    askpass_env = {
+        "SSH_ASKPASS": str(get_askpass_script()),
+        "SSH_ASKPASS_REQUIRE": "force",
+        "DISPLAY": os.environ.get("DISPLAY", ":0"),
+        "GIT_SSH_COMMAND": os.environ.get(
+            "GIT_SSH_COMMAND", "ssh -o StrictHostKeyChecking=accept-new"
+        ),
+        "GIT_TERMINAL_PROMPT": "0",
+        ASKPASS_PASSWORD_VARIABLE: password,
+    }
+    return askpass_env
@@ -0,0 +1,126 @@
+import shutil
+import threading
+import time
+import uuid
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class WorkflowStep:
+    """One git operation, which moves working repository to the next state.
+
+    Args:
+        key: unique description of the operation, e.g. "checkout -b new_branch_01";
+            steps with the same key must do the same
+        apply: runs the operation in the given working repository, raises on failure
+    """
+
+    key: str
+    apply: Callable[[Path], None] = field(compare=False, repr=False)
+
+
+WorkflowState = tuple[WorkflowStep, ...]
+
+
+class WorkflowStateTree:
+    """Tree of working repository states, built from sequences of WorkflowSteps.
+
+    Root is a fresh clone of the server repository. Every distinct prefix
+    of steps is built once, from the snapshot of its parent state, and snapshotted.
+    Tests get their own copy (fork) of the snapshot, so setup cost depends
+    on the number of distinct states, not on the number of tests:
+        tree.fork((checkout_branch("b"), create_file("f")), destination)
+        tree.fork((checkout_branch("b"),), other_destination)  # no git command run
+    """
+
+    def __init__(
+        self,
+        snapshots_dir: Path,
+        create_root: Callable[[Path], Path],
+        copy_repository: Callable[[Path, Path], None],
+        record_fork: Callable[[str, float], None] | None = None,
+    ) -> None:
+        """Constructor method for WorkflowStateTree.
+
+        Args:
+            snapshots_dir: where to keep snapshots of the states
+            create_root: creates fresh clone of the server repository in the given path
+            copy_repository: copies working repository (source, destination)
+            record_fork: called with label and time of every fork,
+                e.g. RepositoryTemplateCache.record_timing
+        """
+        self.__snapshots_dir = snapshots_dir
+        self.__create_root = create_root
+        self.__copy_repository = copy_repository
+        self.__record_fork = record_fork
+        self.__snapshots: dict[tuple[str, ...], Path] = {}
+        self.__lock = threading.Lock()
+        self.built_states = 0
+        self.applied_steps = 0
+        self.forks = 0
+
+    def fork(self, state: WorkflowState, destination: Path, label: str = "") -> Path:
+        """Creates working repository in the given state.
+
+        Args:
+            state: steps applied to the fresh clone, in order
+            destination: path of the new working repository, must not exist
+            label: name to record the fork timing with, e.g. test class name
+
+        Returns:
+            destination path
+        """
+        with self.__lock:
+            snapshot = self.__get_snapshot(state)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        self.__copy_repository(snapshot, destination)
+        if self.__record_fork is not None:
+            self.__record_fork(label, time.perf_counter() - start)
+        self.forks += 1
+        return destination
+
+    def invalidate(self) -> None:
+        """Deletes all snapshots.
+        Should be called after the server repository is changed.
+        """
+        with self.__lock:
+            self.__snapshots.clear()
+            if self.__snapshots_dir.exists():
+                shutil.rmtree(self.__snapshots_dir)
+
+    def summary(self) -> list[str]:
+        """Human-readable lines: number of built states, applied steps and forks."""
+        if not self.forks:
+            return []
+        return [
+            f"Workflow states built: {self.built_states}, "
+            f"steps applied: {self.applied_steps}, forks: {self.forks}"
+        ]
+
+    def __get_snapshot(self, state: WorkflowState) -> Path:
+        """Returns snapshot of the state, building missing states of its prefixes."""
+        keys = tuple(step.key for step in state)
+        if keys in self.__snapshots:
+            return self.__snapshots[keys]
+
+        parent = self.__get_snapshot(state[:-1]) if state else None
+        # unique directory, so a failed build doesn't block the next one
+        snapshot = Path(self.__snapshots_dir, uuid.uuid4().hex, "repository")
+        snapshot.parent.mkdir(parents=True)
+        try:
+            if parent is None:
+                self.__create_root(snapshot)
+            else:
+                self.__copy_repository(parent, snapshot)
+                state[-1].apply(snapshot)
+                self.applied_steps += 1
+        except BaseException:
+            shutil.rmtree(snapshot.parent, ignore_errors=True)
+            raise
+        self.built_states += 1
+        self.__snapshots[keys] = snapshot
+        return snapshot